@@ -23,6 +23,7 @@ from muscad import (
     Volume,
     middle_of,
 )
+from muscad.export import export_many, print_progress, report_table
 from muscad.utils.tube import Tube
 from muscad.vitamins.bearings import (
     BushingLinearBearing,
@@ -3499,6 +3500,51 @@ z_rod_spacer = Volume(
     height=3,
 ).fillet_height()
 
+# the printed parts, exported by `muscad build examples/muscad_printer.py`, or with `--stl`
+# some parts share the same class, so they are named explicitly
+__stl__ = {
+    "xy_idler_left": xy_idler_left,
+    "xy_idler_right": xy_idler_right,
+    "xy_idler_clamp_left": xy_idler_clamp_left,
+    "xy_stepper_mount_right": xy_stepper_mount_right,
+    "xy_stepper_mount_left": xy_stepper_mount_left,
+    "y_endstop_attachement_back": y_endstop_attachement_back,
+    "cable_chain_frame_attachment": cable_chain_frame_attachment,
+    "cable_clamp_frame": cable_clamp_frame,
+    "extruder_stepper_mount": extruder_stepper_mount,
+    "y_endstop_front": y_endstop_front,
+    "feet_left_back": feet_left_back,
+    "spool_holder": spool_holder,
+    "power_supply_mount": power_supply_mount,
+    "screen_mount": screen_mount,
+    "mainboard_mount": mainboard_mount,
+    "raspberry_mount": raspberry_mount,
+    "endcap_left_back": endcap_left_back,
+    "power_plug_mount": power_plug_mount,
+    "z_bed_mount_left": z_bed_mount_left,
+    "z_bracket_bottom_left_back": z_bracket_bottom_left_back,
+    "z_bracket_bottom_left_front": z_bracket_bottom_left_front,
+    "z_bracket_top_left_front": z_bracket_top_left_front,
+    "z_bracket_top_left_back": z_bracket_top_left_back,
+    "z_stepper_mount_left": z_stepper_mount_left,
+    "z_top_endstop": z_top_endstop,
+    "x_carriage": x_carriage,
+    "x_axis_pulleys": x_axis_pulleys,
+    "cable_clamp_back": cable_clamp_back,
+    "extruder_clamp": extruder_clamp,
+    "tunnel": tunnel,
+    "cable_chain_carriage_attachment": cable_chain_carriage_attachment,
+    "cable_clamp_top": cable_clamp_top,
+    "y_carriage_left": y_carriage_left,
+    "y_carriage_right": y_carriage_right,
+    "y_belt_fix_left": y_belt_fix_left,
+    "y_belt_fix_back": y_belt_fix_back,
+    "y_belt_fix_front": y_belt_fix_front,
+    "y_clamp_left": y_clamp_left,
+    "bed_bracket_front": bed_bracket_front,
+    "thumbwheel_front": thumbwheel_front,
+}
+
 if __name__ == "__main__":
     (
         x_carriage
@@ -3625,46 +3671,5 @@ if __name__ == "__main__":
     motor_cable_guide.render_to_file()
 
     if "--stl" in sys.argv:
-        for part in (
-            xy_idler_left,
-            xy_idler_right,
-            xy_idler_clamp_left,
-            xy_stepper_mount_right,
-            xy_stepper_mount_left,
-            y_endstop_attachement_back,
-            cable_chain_frame_attachment,
-            cable_clamp_frame,
-            extruder_stepper_mount,
-            y_endstop_front,
-            feet_left_back,
-            spool_holder,
-            power_supply_mount,
-            screen_mount,
-            mainboard_mount,
-            raspberry_mount,
-            endcap_left_back,
-            power_plug_mount,
-            z_bed_mount_left,
-            z_bracket_bottom_left_back,
-            z_bracket_bottom_left_front,
-            z_bracket_top_left_front,
-            z_bracket_top_left_back,
-            z_stepper_mount_left,
-            z_top_endstop,
-            x_carriage,
-            x_axis_pulleys,
-            cable_clamp_back,
-            extruder_clamp,
-            tunnel,
-            cable_chain_carriage_attachment,
-            cable_clamp_top,
-            y_carriage_left,
-            y_carriage_right,
-            y_belt_fix_left,
-            y_belt_fix_back,
-            y_belt_fix_front,
-            y_clamp_left,
-            bed_bracket_front,
-            thumbwheel_front,
-        ):
-            part.export_stl()
+        results = export_many(__stl__, progress=print_progress)
+        print(report_table(results))  # noqa: T201
@@ -1,7 +1,13 @@
 from .base import *
 from .color import *
+from .cost import *
+from .export import *
+from .modules import *
+from .optimizer import *
 from .part import *
 from .point import *
 from .primitives import *
+from .renders import *
+from .resolution import *
 from .transformations import *
 from .utils import *
@@ -0,0 +1,5 @@
+import sys
+
+from muscad.cli import main
+
+sys.exit(main())
@@ -0,0 +1,5 @@
+"""Alternative backends, that evaluate object trees in-process instead of running OpenSCAD.
+
+Backends depend on optional packages, which they only import when they are used.
+
+"""
@@ -0,0 +1,313 @@
+"""Evaluate object trees in-process with the Manifold mesh kernel, instead of running OpenSCAD.
+
+This backend requires the optional `manifold3d` package (`pip install muscad[manifold]`). It tessellates primitives
+and extrusions, applies transformations, and evaluates boolean operations and hulls with Manifold, which is much faster
+than OpenSCAD's CGAL kernel. OpenSCAD stays the reference backend: objects which have no Manifold equivalent, like
+`Text`, `Import`, `Offset`, `Minkowski` or `Projection`, and parts with a custom rendering, are not supported.
+
+"""
+
+from __future__ import annotations
+
+import importlib
+import zipfile
+from functools import reduce
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Sequence
+
+from muscad.base import (
+    Composite,
+    Difference,
+    ImplicitUnion,
+    Intersection,
+    MuSCAD,
+    MuSCADError,
+    Object,
+    Transformation,
+    Union,
+)
+from muscad.matrix import Matrix
+from muscad.optimizer import Optimizer
+from muscad.part import Part
+from muscad.primitives import Circle, Cube, Cylinder, Polygon, Polyhedron, Sphere, Square
+from muscad.stl import write_binary_stl
+from muscad.transformations import Color, Hull, LinearExtrusion, Render, RotationalExtrusion, Slide
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+    from manifold3d import CrossSection, Manifold
+
+
+def _manifold3d() -> ModuleType:
+    try:
+        # manifold3d is optional: it is imported when the backend is used, so that this module imports without it
+        import manifold3d  # noqa: PLC0415
+    except ImportError as error:
+        msg = "the manifold backend requires the manifold3d package, install it with `pip install muscad[manifold]`"
+        raise ImportError(msg) from error
+    return manifold3d
+
+
+def evaluate(obj: MuSCAD) -> Manifold | CrossSection:
+    """Evaluates an object tree with Manifold.
+
+    :param obj: an object tree
+    :return: a `Manifold` for a 3D object, or a `CrossSection` for a 2D object
+
+    """
+    optimized = Optimizer().optimize(obj)
+    _check_supported(optimized)
+    return _Evaluator(_manifold3d()).evaluate(optimized)
+
+
+_SUPPORTED = (
+    Cube,
+    Cylinder,
+    Sphere,
+    Polyhedron,
+    Circle,
+    Square,
+    Polygon,
+    Union,
+    ImplicitUnion,
+    Difference,
+    Intersection,
+)
+_SUPPORTED_TRANSFORMATIONS = (Slide, Hull, Color, Render, LinearExtrusion, RotationalExtrusion)
+
+
+def _check_supported(obj: Object) -> None:
+    """Checks that an optimized object tree can be evaluated with Manifold, before evaluating any of it.
+
+    :param obj: an optimized object tree
+    :raise MuSCADError: if the tree contains objects which have no Manifold equivalent
+
+    """
+    if isinstance(obj, Part):
+        # the optimizer expands parts into their children, unless they have a custom rendering
+        msg = f"the manifold backend does not support {obj.object_name}, a part with a custom rendering"
+        raise MuSCADError(msg)
+    if isinstance(obj, Transformation) and (
+        isinstance(obj, _SUPPORTED_TRANSFORMATIONS) or obj.affine_matrix() is not None
+    ):
+        _check_supported(obj.child)
+    elif isinstance(obj, _SUPPORTED):
+        for child in obj.children if isinstance(obj, Composite) else ():
+            _check_supported(child)
+    else:
+        msg = f"the manifold backend does not support {obj.object_name}"
+        raise MuSCADError(msg)
+
+
+class _Evaluator:
+    """Turns an optimized object tree into a Manifold or a CrossSection."""
+
+    def __init__(self, manifold3d: ModuleType) -> None:
+        self.manifold3d = manifold3d
+        # numpy is installed with manifold3d, which takes its arrays as inputs
+        self.numpy = importlib.import_module("numpy")
+
+    def evaluate(self, obj: Object) -> Manifold | CrossSection:
+        if isinstance(obj, Cube):
+            return self.manifold3d.Manifold.cube((obj.width, obj.depth, obj.height), center=True)
+        if isinstance(obj, Cylinder):
+            top_diameter = obj.diameter if obj.top_diameter is None else obj.top_diameter
+            return self.manifold3d.Manifold.cylinder(
+                obj.height, obj.diameter / 2, top_diameter / 2, circular_segments=obj.segments, center=True
+            )
+        if isinstance(obj, Sphere):
+            return self.manifold3d.Manifold.sphere(obj.width / 2, circular_segments=obj.segments)
+        if isinstance(obj, Polyhedron):
+            return self._polyhedron(obj)
+        if isinstance(obj, Circle):
+            return self.manifold3d.CrossSection.circle(obj.width / 2, circular_segments=obj.segments)
+        if isinstance(obj, Square):
+            return self.manifold3d.CrossSection.square((obj.width, obj.depth), center=True)
+        if isinstance(obj, Polygon):
+            return self._polygon(obj)
+        if isinstance(obj, (Union, ImplicitUnion, Difference, Intersection)):
+            return self._composite(obj)
+        if isinstance(obj, Transformation):
+            return self._transformation(obj)
+        msg = f"the manifold backend does not support {obj.object_name}"
+        raise MuSCADError(msg)
+
+    def _polyhedron(self, polyhedron: Polyhedron) -> Manifold:
+        np = self.numpy
+        faces = polyhedron.faces
+        indexes = faces.indexes
+        # OpenSCAD faces are clockwise seen from outside, while Manifold triangles are counterclockwise
+        triangles = [
+            (indexes[start], indexes[position + 1], indexes[position])
+            for start, stop in zip(faces.offsets, faces.offsets[1:])
+            for position in range(start + 1, stop - 1)
+        ]
+        mesh = self.manifold3d.Mesh(
+            vert_properties=np.array(polyhedron.points.coordinates, dtype=np.float32).reshape(-1, 3),
+            tri_verts=np.array(triangles, dtype=np.uint32).reshape(-1, 3),
+        )
+        return self.manifold3d.Manifold(mesh)
+
+    def _polygon(self, polygon: Polygon) -> CrossSection:
+        points = list(zip(polygon.points.column(0), polygon.points.column(1)))
+        paths = polygon.paths or [list(range(len(points)))]
+        # holes are subtracted the same way as OpenSCAD does
+        return self.manifold3d.CrossSection(
+            [[points[index] for index in path] for path in paths], self.manifold3d.FillRule.EvenOdd
+        )
+
+    def _children(self, obj: Object) -> list[Manifold | CrossSection]:
+        # disabled and background objects are not part of the result
+        return [self.evaluate(child) for child in obj._iter_children() if child.modifier not in ("*", "%")]
+
+    def _composite(self, composite: Union | Difference | Intersection) -> Manifold | CrossSection:
+        children = self._children(composite)
+        if not children:
+            return self.manifold3d.Manifold()
+        if isinstance(composite, Difference):
+            first, *holes = children
+            return first - reduce(lambda left, right: left + right, holes) if holes else first
+        if isinstance(composite, Intersection):
+            return reduce(lambda left, right: left ^ right, children)
+        return reduce(lambda left, right: left + right, children)
+
+    def _transformation(self, transformation: Transformation) -> Manifold | CrossSection:
+        if isinstance(transformation, Slide):
+            child = transformation.child
+            return self.evaluate(
+                Union(
+                    Hull(part, part.translate(x=transformation.x, y=transformation.y, z=transformation.z))
+                    for part in child.walk()
+                )
+            )
+        if isinstance(transformation, Hull):
+            child = transformation.child
+            hulled = self._children(child) if isinstance(child, (Union, ImplicitUnion)) else [self.evaluate(child)]
+            return type(hulled[0]).batch_hull(hulled)
+        child = self.evaluate(transformation.child)
+        if isinstance(transformation, (Color, Render)):
+            return child
+        if isinstance(transformation, LinearExtrusion):
+            return self._linear_extrusion(transformation, child)
+        if isinstance(transformation, RotationalExtrusion):
+            return child.revolve(circular_segments=transformation.segments, revolve_degrees=transformation.angle)
+        matrix = transformation.affine_matrix()
+        if matrix is None:
+            msg = f"the manifold backend does not support {transformation.object_name}"
+            raise MuSCADError(msg)
+        return self._transformed(child, matrix)
+
+    def _transformed(self, shape: Manifold | CrossSection, matrix: Matrix) -> Manifold | CrossSection:
+        np = self.numpy
+        if isinstance(shape, self.manifold3d.CrossSection):
+            # 2D objects are transformed in the XY plane
+            (a, b, _, x), (c, d, _, y), _, _ = matrix
+            return shape.transform(np.array([[a, b, x], [c, d, y]], dtype=np.float64))
+        return shape.transform(np.array(matrix[:3], dtype=np.float64))
+
+    def _linear_extrusion(self, extrusion: LinearExtrusion, cross_section: CrossSection) -> Manifold:
+        slices = extrusion._slices
+        if slices is None:
+            slices = extrusion.segments if extrusion._twist else 0
+        manifold = cross_section.extrude(
+            extrusion._height,
+            n_divisions=slices,
+            # OpenSCAD twists clockwise, Manifold twists counterclockwise
+            twist_degrees=-extrusion._twist,
+            scale_top=(extrusion._scale, extrusion._scale),
+        )
+        if extrusion._center:
+            return manifold.translate((0, 0, -extrusion._height / 2))
+        return manifold
+
+
+def mesh_arrays(obj: MuSCAD) -> tuple[Any, Any]:
+    """Evaluates a 3D object tree with Manifold, and returns its mesh.
+
+    :param obj: an object tree
+    :return: a (vertices, triangles) tuple of arrays, with shapes (n, 3) and (m, 3), with triangles counterclockwise
+        seen from outside
+
+    """
+    manifold = evaluate(obj)
+    if isinstance(manifold, _manifold3d().CrossSection):
+        msg = "only 3D objects can be exported as meshes"
+        raise MuSCADError(msg)
+    mesh = manifold.to_mesh()
+    return mesh.vert_properties[:, :3], mesh.tri_verts
+
+
+def export_stl(obj: MuSCAD, stl_path: str | Path) -> Path:
+    """Evaluates an object tree with Manifold, and exports it as a binary STL file.
+
+    :param obj: an object tree
+    :param stl_path: the path of the STL file
+    :return: the path of the STL file
+
+    """
+    vertices, triangles = mesh_arrays(obj)
+    stl_path = Path(stl_path)
+    write_binary_stl(
+        stl_path, (tuple(value for index in triangle for value in vertices[index]) for triangle in triangles.tolist())
+    )
+    return stl_path
+
+
+def export_3mf(obj: MuSCAD, path: str | Path) -> Path:
+    """Evaluates an object tree with Manifold, and exports it as a 3MF file.
+
+    :param obj: an object tree
+    :param path: the path of the 3MF file
+    :return: the path of the 3MF file
+
+    """
+    vertices, triangles = mesh_arrays(obj)
+    path = Path(path)
+    write_3mf(path, vertices.tolist(), triangles.tolist())
+    return path
+
+
+_3MF_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>
+</Types>
+"""
+
+_3MF_RELATIONSHIPS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Target="/3D/3dmodel.model" Id="rel0" \
+Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>
+</Relationships>
+"""
+
+
+def write_3mf(
+    path: str | Path, vertices: Iterable[Sequence[float]], triangles: Iterable[Sequence[int]], unit: str = "millimeter"
+) -> None:
+    """Writes a mesh to a 3MF file, as a single object.
+
+    :param path: the path of the 3MF file
+    :param vertices: the vertices of the mesh, as (x, y, z) coordinates
+    :param triangles: the triangles of the mesh, as indexes of vertices, counterclockwise seen from outside
+    :param unit: the unit of coordinates
+
+    """
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _3MF_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _3MF_RELATIONSHIPS)
+        with archive.open("3D/3dmodel.model", "w") as model:
+            model.write(
+                f'<?xml version="1.0" encoding="UTF-8"?>\n<model unit="{unit}" xml:lang="en-US" '
+                'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">\n'
+                '<resources>\n<object id="1" type="model">\n<mesh>\n<vertices>\n'.encode()
+            )
+            for x, y, z in vertices:
+                model.write(f'<vertex x="{x}" y="{y}" z="{z}"/>\n'.encode())
+            model.write(b"</vertices>\n<triangles>\n")
+            for v1, v2, v3 in triangles:
+                model.write(f'<triangle v1="{v1}" v2="{v2}" v3="{v3}"/>\n'.encode())
+            model.write(
+                b'</triangles>\n</mesh>\n</object>\n</resources>\n<build>\n<item objectid="1"/>\n</build>\n</model>\n'
+            )
@@ -1,21 +1,60 @@
 from __future__ import annotations
 
+import io
+import locale
 import math
 import os
 import subprocess
+import weakref
 from functools import wraps
+from itertools import product
 from pathlib import Path
 from typing import (
     Any,
     Callable,
+    ClassVar,
     Iterable,
     Literal,
+    NamedTuple,
     Protocol,
     Self,
     TypeVar,
 )
 
+from muscad.cache import StlCache, create_temporary_file
 from muscad.helpers import camel_to_snake, normalize_angle
+from muscad.matrix import IDENTITY, Bounds, Matrix, merge_bounds, multiply, points_bounds
+from muscad.resolution import Resolution, current_resolution
+
+
+class Writer(Protocol):
+    """Anything that SCAD code can be written into, like an opened text file or an `io.StringIO`."""
+
+    def write(self, s: str, /) -> Any: ...  # pragma: no cover
+
+
+class SubtreeWriter:
+    """Base class for writers that may render some objects differently, instead of their usual SCAD code.
+
+    Objects rendered into such a writer call `substitute()` first, and skip their own rendering if it returns True.
+
+    """
+
+    def __init__(self, writer: Writer) -> None:
+        self.writer = writer
+
+    def write(self, s: str) -> None:
+        self.writer.write(s)
+
+    def substitute(self, obj: Object, depth: int) -> bool:
+        """Optionally writes some replacement code for `obj`.
+
+        :param obj: the object that is about to be rendered
+        :param depth: the indentation level of that object
+        :return: True if `obj` has been replaced, False if it must be rendered as usual
+
+        """
+        raise NotImplementedError()  # pragma: no cover
 
 
 class MuSCAD:
@@ -27,7 +66,37 @@ class MuSCAD:
         :return: the SCAD code for this object.
 
         """
-        raise NotImplementedError()  # pragma: no cover
+        buffer = io.StringIO()
+        self.render_into(buffer)
+        return buffer.getvalue()
+
+    def render_into(self, writer: Writer, depth: int = 0) -> None:
+        """Writes the SCAD code to render this object into `writer`.
+
+        The first line is written as is, since the caller is responsible for its indentation. All following lines are
+        indented by `depth` levels. Each token is written only once, so rendering is linear in the size of the output,
+        no matter how deep the object tree is.
+
+        :param writer: a file-like object to write the SCAD code into
+        :param depth: the indentation level of this object
+
+        """
+        self._render_into(writer, depth)
+
+    def _render_into(self, writer: Writer, depth: int) -> None:
+        """Actually writes the SCAD code for this object. This must be implemented by subclasses.
+
+        :param writer: a file-like object to write the SCAD code into
+        :param depth: the indentation level of this object
+
+        """
+        if type(self).render in (MuSCAD.render, Object.render):
+            raise NotImplementedError()  # pragma: no cover
+        # subclasses that only implement render() are still supported
+        write_lines(writer, self.render(), depth)
+
+    def _add_parent(self, parent: Object) -> None:
+        """Registers `parent` as an object that contains this one."""
 
     def __str__(self) -> str:
         return self.render()
@@ -41,7 +110,10 @@ class MuSCADError(Exception):
     """Base class for all MuSCAD exceptions."""
 
 
-def indent(s: str, token: str = "  ") -> str:
+INDENT = "  "
+
+
+def indent(s: str, token: str = INDENT) -> str:
     r"""Indents a given string, with characters from `token`. Each line will be prefixed by token.
 
     :param s: the string to indent (may contain multiple lines, separated by '\n'
@@ -52,6 +124,26 @@ def indent(s: str, token: str = "  ") -> str:
     return token + s.replace("\n", f"\n{token}")
 
 
+def newline(depth: int) -> str:
+    """Returns a line break, followed by the indentation for the given depth."""
+    return "\n" + INDENT * depth
+
+
+def write_lines(writer: Writer, text: str, depth: int) -> None:
+    """Writes `text` into `writer`, indenting all lines except the first one by `depth` levels."""
+    if depth and "\n" in text:
+        text = text.replace("\n", newline(depth))
+    writer.write(text)
+
+
+def write_comment(writer: Writer, comment: str | None, depth: int) -> None:
+    """Writes a comment into `writer`, as comment lines preceding the code of an object."""
+    if not comment:
+        return
+    for line in comment.split("\n"):
+        writer.write(f"// {line}{newline(depth)}")
+
+
 def add_comment(code: str, comment: str | None = None) -> str:
     """Adds comment to a rendered code."""
     if not comment:
@@ -74,6 +166,68 @@ def render_comment(f: Callable[[O], str]) -> Callable[[O], str]:
 O = TypeVar("O", contravariant=True)
 
 
+class BoundingBox(NamedTuple):
+    """An axis-aligned bounding box."""
+
+    left: float
+    right: float
+    back: float
+    front: float
+    bottom: float
+    top: float
+
+    @property
+    def width(self) -> float:
+        return self.right - self.left
+
+    @property
+    def depth(self) -> float:
+        return self.front - self.back
+
+    @property
+    def height(self) -> float:
+        return self.top - self.bottom
+
+    @property
+    def center_x(self) -> float:
+        return (self.right + self.left) / 2
+
+    @property
+    def center_y(self) -> float:
+        return (self.front + self.back) / 2
+
+    @property
+    def center_z(self) -> float:
+        return (self.top + self.bottom) / 2
+
+
+BOUNDS = BoundingBox._fields
+
+
+def cached_bound(fget: Callable[[Object], float]) -> Callable[[Object], float]:
+    """Caches the result of a bound property on the instance, until that instance is invalidated.
+
+    The cache is keyed by the getter itself, so that subclasses can still use the bounds from `super()`.
+
+    :param fget: the getter of a bound property, like `left`
+    :return: a getter that caches its result
+
+    """
+
+    @wraps(fget)
+    def wrapper(self: Object) -> float:
+        cache = self.__dict__.get("_bounds_cache")
+        if cache is None:
+            cache = self.__dict__["_bounds_cache"] = {}
+        value = cache.get(fget)
+        if value is None:
+            value = cache[fget] = fget(self)
+        return value
+
+    wrapper.cached = True  # type: ignore[attr-defined]
+    return wrapper
+
+
 class Object(MuSCAD):
     """Base class for all OpenSCAD geometry objects.
 
@@ -83,6 +237,18 @@ class Object(MuSCAD):
 
     object_name: str
 
+    # if True, the rendered code is cached even when this object is rendered as part of a larger object
+    cache_render: ClassVar[bool] = False
+    # the cached code, along with the resolution it was rendered with
+    _render_cache: tuple[Resolution, str] | None = None
+    # weak references to the objects that contain this one, by id: most objects have a single parent, and a dict of
+    # weak references is much cheaper to build than a WeakSet
+    _parents: dict[int, weakref.ref[Object]] | None = None
+    # the attributes that hold the objects contained in this one, which register this object as their parent when set
+    _child_attributes: ClassVar[frozenset[str]] = frozenset()
+    # the attributes that are set through a descriptor, like a property setter, instead of the instance dict
+    _descriptors: ClassVar[frozenset[str]] = frozenset()
+
     def __init_subclass__(cls, name: str | None = None):
         """Derive a name from the subclass name, if not explicitly declared.
 
@@ -96,6 +262,14 @@ class Object(MuSCAD):
             cls.object_name = camel_to_snake(cls.__name__)
         else:
             cls.object_name = name
+        # bounds are calculated recursively, so they are cached on each object
+        for bound in BOUNDS:
+            prop = cls.__dict__.get(bound)
+            if isinstance(prop, property) and prop.fget is not None and not hasattr(prop.fget, "cached"):
+                setattr(cls, bound, property(cached_bound(prop.fget), prop.fset, prop.fdel, prop.__doc__))
+        cls._descriptors = frozenset(
+            key for class_ in cls.__mro__ for key, value in vars(class_).items() if hasattr(value, "__set__")
+        )
 
     def __init__(self) -> None:
         """Base constructor for Objects.
@@ -106,6 +280,119 @@ class Object(MuSCAD):
         self.modifier: str = ""
         self.comment: str | None = None
 
+    def __setattr__(self, key: str, value: Any) -> None:
+        """Any change to an attribute invalidates the cached rendering of this object and its parents.
+
+        Attributes are set often while building objects, so this is kept as cheap as possible: only the attributes
+        that hold children register this object as their parent.
+
+        """
+        state = self.__dict__
+        if key in self._descriptors:
+            object.__setattr__(self, key, value)
+        else:
+            state[key] = value
+        if key in self._child_attributes:
+            self._adopt(value)
+        if "_parents" in state or "_render_cache" in state or "_bounds_cache" in state:
+            self.invalidate()
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Parents, cached renderings and cached bounds are not copied along with this object."""
+        state = self.__dict__.copy()
+        state.pop("_parents", None)
+        state.pop("_render_cache", None)
+        state.pop("_bounds_cache", None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Registers this copy as the parent of its children, so that changes to them invalidate it."""
+        self.__dict__.update(state)
+        for key in self._child_attributes:
+            self._adopt(state.get(key))
+
+    def _adopt(self, value: Any) -> None:
+        """Registers this object as the parent of an attribute value, or of the items of a list."""
+        if isinstance(value, MuSCAD):
+            value._add_parent(self)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, MuSCAD):
+                    item._add_parent(self)
+
+    def _add_parent(self, parent: Object) -> None:
+        """Registers `parent` as an object that contains this one, so that changes to this object invalidate it."""
+        parents = self.__dict__.get("_parents")
+        if parents is None:
+            parents = self.__dict__["_parents"] = {}
+        parents[id(parent)] = weakref.ref(parent)
+
+    def invalidate(self) -> None:
+        """Drops the cached rendering and bounds of this object and of all the objects that contain it.
+
+        This is done automatically when an attribute is set, or when children are added. Call it manually if you
+        modify an object in place by other means.
+
+        """
+        self.__dict__.pop("_render_cache", None)
+        self.__dict__.pop("_bounds_cache", None)
+        if not self._parents:
+            return
+        pending: list[Object] = [self]
+        seen: set[int] = {id(self)}
+        while pending:
+            parents = pending.pop()._parents
+            if not parents:
+                continue
+            for key, reference in list(parents.items()):
+                parent = reference()
+                if parent is None:
+                    # the parent was garbage collected
+                    del parents[key]
+                elif key not in seen:
+                    seen.add(key)
+                    parent.__dict__.pop("_render_cache", None)
+                    parent.__dict__.pop("_bounds_cache", None)
+                    pending.append(parent)
+
+    def render(self) -> str:
+        """Returns the SCAD code to render this object.
+
+        The code is cached until this object, or any object it contains, is modified, or until the current resolution
+        changes.
+
+        :return: the SCAD code for this object.
+
+        """
+        code = self._cached_render()
+        if code is None:
+            buffer = io.StringIO()
+            self._render_into(buffer, 0)
+            code = buffer.getvalue()
+            self.__dict__["_render_cache"] = (current_resolution(), code)
+        return code
+
+    def _cached_render(self) -> str | None:
+        """Returns the cached code of this object, if it was rendered with the current resolution."""
+        cache = self._render_cache
+        if cache is None or cache[0] != current_resolution():
+            return None
+        return cache[1]
+
+    def render_into(self, writer: Writer, depth: int = 0) -> None:
+        if isinstance(writer, SubtreeWriter):
+            # cached code can't be used, since some of the nested objects may be rendered differently
+            if not writer.substitute(self, depth):
+                self._render_into(writer, depth)
+            return
+        code = self._cached_render()
+        if code is None and self.cache_render:
+            code = self.render()
+        if code is None:
+            self._render_into(writer, depth)
+        else:
+            write_lines(writer, code, depth)
+
     def set_modifier(self, m: str | None) -> Object:
         """Set or remove a modifier for this object.
 
@@ -917,6 +1204,27 @@ class Object(MuSCAD):
     def center_z(self) -> float:
         return (self.top + self.bottom) / 2
 
+    def _bounds_under(self, matrix: Matrix) -> Bounds:
+        """Returns the bounds of this object, once transformed by an affine matrix.
+
+        By default, this transforms the 8 corners of the bounding box of this object. Subclasses may return tighter
+        bounds, based on their actual geometry.
+
+        :param matrix: a 4x4 affine matrix
+        :return: a (left, right, back, front, bottom, top) tuple
+
+        """
+        return points_bounds(matrix, product((self.left, self.right), (self.back, self.front), (self.bottom, self.top)))
+
+    @property
+    def bbox(self) -> BoundingBox:
+        """The axis-aligned bounding box of this object.
+
+        Bounds are cached until this object, or any object it contains, is modified.
+
+        """
+        return BoundingBox(self.left, self.right, self.back, self.front, self.bottom, self.top)
+
     def bounding_box(self) -> Object:
         return Cube(self.width, self.depth, self.height).translate(x=self.left, y=self.back, z=self.bottom)
 
@@ -1061,18 +1369,85 @@ class Object(MuSCAD):
         return camel_to_snake(self.__class__.__name__)  # pragma: no cover
 
     def render_to_file(
-        self, path: str | Path | None = None, *, mode: str = "wt", openscad: bool = False
+        self,
+        path: str | Path | None = None,
+        *,
+        mode: str = "wt",
+        openscad: bool = False,
+        modules: bool = False,
+        optimize: bool = False,
+        renders: bool = False,
     ) -> Path:  # pragma: no cover
         if path is None:
             path = self.file_name
-        return render_to_file(self, path, mode=mode, openscad=openscad)
+        return render_to_file(
+            self, path, mode=mode, openscad=openscad, modules=modules, optimize=optimize, renders=renders
+        )
+
+    def export_stl(
+        self,
+        path: str | Path | None = None,
+        *,
+        optimize: bool = False,
+        backend: str | None = None,
+        cache: StlCache | bool = False,
+    ) -> Path:  # pragma: no cover
+        """Exports this object to an STL file.
+
+        By default, objects made only of Polyhedrons, under affine transformations, are written directly as binary STL.
+        Other objects are rendered to a .scad file, which is then exported with OpenSCAD.
 
-    def export_stl(self, path: str | Path | None = None) -> Path:  # pragma: no cover
+        :param path: the path of the .scad file, the STL file is named after it
+        :param optimize: if True, the rendered .scad file is simplified with the Optimizer
+        :param backend: "openscad" to always export with OpenSCAD, or "manifold" to evaluate this object in-process
+            with the optional Manifold backend
+        :param cache: the cache of STL files used by OpenSCAD exports, True for the default one, or False to always run
+            OpenSCAD, which is the default
+        :return: the path of the STL file
+
+        """
         obj = self.__stl__()
         if path is None:
             path = self.file_name
-        scad_path = obj.render_to_file(path=path)
-        return export_stl(scad_path)
+        stl_path = Path(path).stem + ".stl"
+        if backend == "manifold":
+            return manifold.export_stl(obj, stl_path)
+        if backend is None:
+            mesh_path = export_mesh_stl(obj, stl_path)
+            if mesh_path is not None:
+                return mesh_path
+        elif backend != "openscad":
+            msg = f"unknown backend {backend!r}, must be 'openscad' or 'manifold'"
+            raise ValueError(msg)
+        scad_path = obj.render_to_file(path=path, optimize=optimize)
+        return export_stl(scad_path, cache=cache)
+
+    async def export_stl_async(
+        self, path: str | Path | None = None, *, optimize: bool = False, runner: OpenSCADRunner | None = None
+    ) -> Path:  # pragma: no cover
+        """Exports this object to an STL file, without blocking the running event loop while OpenSCAD runs.
+
+        Like `export_stl()`, objects made only of Polyhedrons are written directly as binary STL.
+
+        :param path: the path of the .scad file, the STL file is named after it
+        :param optimize: if True, the rendered .scad file is simplified with the Optimizer
+        :param runner: the OpenSCADRunner to use, which configures the OpenSCAD executable and flags, the timeout, the
+            concurrency and the cache. Defaults to a new runner with the default configuration.
+        :return: the path of the STL file
+
+        """
+        obj = self.__stl__()
+        if path is None:
+            path = self.file_name
+        stl_path = Path(path).stem + ".stl"
+        mesh_path = export_mesh_stl(obj, stl_path)
+        if mesh_path is not None:
+            return mesh_path
+        scad_path = obj.render_to_file(path=path, optimize=optimize)
+        if runner is None:
+            runner = OpenSCADRunner()
+        result = await runner.export_async(scad_path, stl_path)
+        return result.path
 
     def walk(self) -> Iterable[Object]:
         yield self
@@ -1085,6 +1460,17 @@ class Primitive(Object):
 
     """
 
+    # if True, this primitive renders as its `_code()`, which its parent writes along with its own code
+    _render_inline: ClassVar[bool] = False
+
+    def __init_subclass__(cls, name: str | None = None):
+        super().__init_subclass__(name)
+        cls._render_inline = (
+            cls._render_into is Primitive._render_into
+            and cls.render_into is Object.render_into
+            and not cls.cache_render
+        )
+
     def __init__(self, **kwargs: Any):
         super().__init__()
         self.arguments = kwargs
@@ -1135,14 +1521,23 @@ class Primitive(Object):
         """
         return ", ".join(f"{key}={val}" if key else f"{val}" for key, val in params)
 
-    @render_comment
-    def render(self) -> str:
+    def _code(self) -> str:
+        """Render this object as OpenSCAD code, preceded by its comment, without indentation.
+
+        :return: a str
+
+        """
+        arguments = self._render_arguments(self._iter_arguments())
+        return add_comment(f"{self.modifier}{self.object_name}({arguments});", self.comment)
+
+    def _render_into(self, writer: Writer, depth: int) -> None:
         """Render this object as OpenSCAD code.
 
-        :return: a str of OpenSCAD code
+        :param writer: a file-like object to write the SCAD code into
+        :param depth: the indentation level of this object
 
         """
-        return f"{self.modifier}{self.object_name}({self._render_arguments(self._iter_arguments())});"
+        write_lines(writer, self._code(), depth)
 
     def walk(self) -> Iterable[Object]:
         yield self
@@ -1151,6 +1546,8 @@ class Primitive(Object):
 class Composite(Object):
     """Base class for Boolean operations (Union, Difference, Intersection)."""
 
+    _child_attributes = frozenset({"children"})
+
     def __init__(self, *children: Object | Iterable[Object]):
         super().__init__()
         self.children: list[Object] = []
@@ -1168,8 +1565,12 @@ class Composite(Object):
             return self
         elif isinstance(child, MuSCAD):
             self.children.append(child)
+            child._add_parent(self)
         else:
-            self.children.extend(child)
+            for item in child:
+                self.children.append(item)
+                item._add_parent(self)
+        self.invalidate()
         return self
 
     def apply(self, *children: Object | Iterable[Object]) -> Object:
@@ -1193,22 +1594,40 @@ class Composite(Object):
                 yield child
 
     @classmethod
-    def _render_children(cls, children: Iterable[Object]) -> str:
+    def _render_children_into(cls, writer: Writer, children: Iterable[MuSCAD], depth: int) -> None:
         """Renders the children of this object as OpenSCAD code (anything between the brackets).
 
-        :return: a str
+        :param writer: a file-like object to write the SCAD code into
+        :param children: the children to render
+        :param depth: the indentation level of this object
 
         """
-        return "{" + "".join(f"\n{indent(child.render())}" for child in children) + "\n}"
+        child_newline = newline(depth + 1)
+        # objects rendered into a SubtreeWriter may be substituted, so they must all be rendered with render_into()
+        inline = not isinstance(writer, SubtreeWriter)
+        # the code of leaf primitives is joined with the code around it, so that it is written in a single call
+        chunks = ["{"]
+        for child in children:
+            chunks.append(child_newline)
+            if inline and isinstance(child, Primitive) and child._render_inline:
+                chunks.append(child._code().replace("\n", child_newline))
+            else:
+                writer.write("".join(chunks))
+                chunks.clear()
+                child.render_into(writer, depth + 1)
+        chunks.append(f"{newline(depth)}}}")
+        writer.write("".join(chunks))
 
-    @render_comment
-    def render(self) -> str:
+    def _render_into(self, writer: Writer, depth: int) -> None:
         """Render this composite as valid OpenSCAD code.
 
-        :return: a str
+        :param writer: a file-like object to write the SCAD code into
+        :param depth: the indentation level of this object
 
         """
-        return f"{self.modifier}{self.object_name}() " f"{self._render_children(self._iter_children())}"
+        write_comment(writer, self.comment, depth)
+        writer.write(f"{self.modifier}{self.object_name}() ")
+        self._render_children_into(writer, self._iter_children(), depth)
 
     def walk(self) -> Iterable[Object]:
         for child in self.children:
@@ -1275,16 +1694,22 @@ class Union(Composite):
     def top(self) -> float:
         return top(self.children)
 
-    def render(self) -> str:
-        """If the union has a single child, render it redirectly :return: a str."""
+    def _bounds_under(self, matrix: Matrix) -> Bounds:
+        return merge_bounds(child._bounds_under(matrix) for child in self.children)
+
+    def _render_into(self, writer: Writer, depth: int) -> None:
+        """If the union has a single child, render it directly."""
         if len(self.children) == 1:
-            return add_comment(self.children[0].render(), self.comment)
-        return super().render()
+            write_comment(writer, self.comment, depth)
+            self.children[0].render_into(writer, depth)
+            return
+        super()._render_into(writer, depth)
 
 
 class ImplicitUnion(Union):
-    def render(self) -> str:
-        return f"{self.modifier}{self._render_children(self._iter_children())}"
+    def _render_into(self, writer: Writer, depth: int) -> None:
+        writer.write(self.modifier)
+        self._render_children_into(writer, self._iter_children(), depth)
 
 
 class Difference(Composite):
@@ -1323,6 +1748,9 @@ class Difference(Composite):
     def top(self) -> float:
         return self.children[0].top
 
+    def _bounds_under(self, matrix: Matrix) -> Bounds:
+        return self.children[0]._bounds_under(matrix)
+
 
 class Intersection(Composite):
     """OpenSCAD `intersection()`."""
@@ -1368,6 +1796,8 @@ class Transformation(Primitive):
 
     """
 
+    _child_attributes = frozenset({"_child"})
+
     def __init__(self, *children: Object):
         super().__init__()
         self._child: Object | None = None
@@ -1404,11 +1834,18 @@ class Transformation(Primitive):
     def __call__(self, *children: Object) -> Object:
         return self.apply(*children)
 
-    @render_comment
-    def render(self) -> str:
-        return f"""\
-{self.modifier}{self.object_name}({self._render_arguments(self._iter_arguments())})
-{self._render_child()}"""
+    def _render_into(self, writer: Writer, depth: int) -> None:
+        write_comment(writer, self.comment, depth)
+        arguments = self._render_arguments(self._iter_arguments())
+        code = f"{self.modifier}{self.object_name}({arguments})"
+        child = self.child
+        if isinstance(child, Primitive) and child._render_inline and not isinstance(writer, SubtreeWriter):
+            # a leaf primitive is written along with this transformation
+            write_lines(writer, f"{code}\n{child._code()}", depth)
+            return
+        write_lines(writer, code, depth)
+        writer.write(newline(depth))
+        child.render_into(writer, depth)
 
     def childattr(self, item: str) -> Any:
         """Makes properties from the transformed object accessible through the Transformation.
@@ -1420,11 +1857,38 @@ class Transformation(Primitive):
         return self.copy()(getattr(self.child, item))
 
     def __getattr__(self, item: str) -> Any:
+        if item.startswith("__"):
+            # special attributes are looked up by copy and pickle, before the child is set
+            raise AttributeError(item)
         return self.childattr(item)
 
     def copy(self) -> Transformation:
         raise NotImplementedError()  # pragma: no cover
 
+    def affine_matrix(self) -> Matrix | None:
+        """Returns the 4x4 affine matrix that this transformation applies to its child.
+
+        :return: a matrix, or None if this transformation is not affine
+
+        """
+        return None
+
+    def _bounds_under(self, matrix: Matrix) -> Bounds:
+        own_matrix = self.affine_matrix()
+        if own_matrix is None:
+            return super()._bounds_under(matrix)
+        return self.child._bounds_under(multiply(matrix, own_matrix))
+
+    def _affine_bounds(self) -> Bounds:
+        """Returns the bounds of this transformation, computed by transforming the bounds of its child.
+
+        This works for any affine transformation, but is slower than the specific calculations done by subclasses.
+
+        :return: a (left, right, back, front, bottom, top) tuple
+
+        """
+        return self._bounds_under(IDENTITY)
+
     @property
     def file_name(self) -> str:
         return self.child.file_name
@@ -1439,9 +1903,6 @@ class Transformation(Primitive):
         self.child = child
         return self
 
-    def _render_child(self) -> str:
-        return self.child.render()
-
     @property
     def left(self) -> float:
         if self.child:
@@ -1527,8 +1988,11 @@ class Hole(MuSCAD):
             raise TypeError(msg)
         return Hole(self.object + other.object)
 
-    def render(self) -> str:
-        return self.object.render()
+    def render_into(self, writer: Writer, depth: int = 0) -> None:
+        self.object.render_into(writer, depth)
+
+    def _add_parent(self, parent: Object) -> None:
+        self.object._add_parent(parent)
 
     @property
     def comment(self) -> str | None:
@@ -1547,8 +2011,11 @@ class Misc(MuSCAD):
     def __getattr__(self, key: str) -> Any:
         return getattr(self.object, key)
 
-    def render(self) -> str:
-        return self.object.render()
+    def render_into(self, writer: Writer, depth: int = 0) -> None:
+        self.object.render_into(writer, depth)
+
+    def _add_parent(self, parent: Object) -> None:
+        self.object._add_parent(parent)
 
     @property
     def comment(self) -> str | None:
@@ -1579,7 +2046,64 @@ def middle_of(one: float, other: float) -> float:
     return one + (other - one) / 2
 
 
-def render_to_file(obj: Object, path: str | Path, *, mode: str, openscad: bool = False) -> Path:
+def render_to_file(
+    obj: Object,
+    path: str | Path,
+    *,
+    mode: str,
+    openscad: bool = False,
+    modules: bool = False,
+    optimize: bool = False,
+    renders: bool = False,
+) -> Path:
+    """Render an object to a .scad file.
+
+    The file is only written if its content changed, see `render_scad_file()`.
+
+    :param obj: the object to render
+    :param path: the path to the file. The `.scad` suffix is added if missing.
+    :param mode: the mode to open the file with
+    :param openscad: if True, opens the file in OpenSCAD
+    :param modules: if True, subtrees that appear multiple times are rendered once, as OpenSCAD modules
+    :param optimize: if True, the object tree is simplified before rendering, without changing its geometry
+    :param renders: if True, the object tree is simplified, and its expensive subtrees are wrapped in `render()`, so
+        that OpenSCAD previews stay interactive
+    :return: the path to the rendered file
+
+    """
+    path, _ = render_scad_file(obj, path, mode=mode, modules=modules, optimize=optimize, renders=renders)
+    if openscad and not os.environ.get("MUSCAD_NO_OPENSCAD"):
+        try:
+            os.startfile(path)  # type: ignore[attr-defined]
+        except AttributeError:
+            subprocess.call(["xdg-open", path])
+
+    return path
+
+
+def render_scad_file(
+    obj: Object,
+    path: str | Path,
+    *,
+    mode: str = "wt",
+    modules: bool = False,
+    optimize: bool = False,
+    renders: bool = False,
+) -> tuple[Path, bool]:
+    """Render an object to a .scad file, unless that file already has the rendered content.
+
+    Rewriting an identical file would change its modification time, which makes OpenSCAD reload it and build tools
+    export it again. Changed files are replaced atomically, see `write_if_changed()`.
+
+    :param obj: the object to render
+    :param path: the path to the file. The `.scad` suffix is added if missing.
+    :param mode: "wt" to replace the file, or "at" to append to it, in which case it is always written
+    :param modules: if True, subtrees that appear multiple times are rendered once, as OpenSCAD modules
+    :param optimize: if True, the object tree is simplified before rendering, without changing its geometry
+    :param renders: if True, the object tree is simplified, and its expensive subtrees are wrapped in `render()`
+    :return: a tuple of (the path to the rendered file, True if the file was written)
+
+    """
     if not isinstance(path, Path):
         path = Path(path)
 
@@ -1588,16 +2112,52 @@ def render_to_file(obj: Object, path: str | Path, *, mode: str, openscad: bool =
     if not path.is_absolute():
         path = Path.cwd() / path
 
-    render = obj.render()
-    with path.open(mode) as foutput:
-        foutput.write(render)
-    if openscad and not os.environ.get("MUSCAD_NO_OPENSCAD"):
-        try:
-            os.startfile(path)  # type: ignore[attr-defined]
-        except AttributeError:
-            subprocess.call(["xdg-open", path])
+    if renders:
+        obj = wrap_renders(obj)
+    elif optimize:
+        obj = Optimizer().optimize(obj)
 
-    return path
+    buffer = io.StringIO()
+    if modules:
+        render_with_modules_into(obj, buffer)
+    else:
+        obj.render_into(buffer)
+    if "a" in mode:
+        with path.open(mode) as foutput:
+            foutput.write(buffer.getvalue())
+        return path, True
+    return path, write_if_changed(path, buffer.getvalue())
+
+
+def write_if_changed(path: str | Path, content: str) -> bool:
+    """Writes a text file, unless it already has the given content.
+
+    The content is written to a temporary file first, which then replaces the file, so that programs watching that
+    file, like OpenSCAD, never read a partially written file.
+
+    :param path: the path to the file
+    :param content: the content of the file
+    :return: True if the file was written, False if it already had that content
+
+    """
+    path = Path(path)
+    # the same bytes as a file opened with `open(path, "wt")`
+    data = content.replace("\n", os.linesep).encode(locale.getpreferredencoding(do_setlocale=False))
+    try:
+        # comparing sizes first avoids reading files that obviously changed
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    fd, temporary = create_temporary_file(path)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        temporary.replace(path)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+    return True
 
 
 class Calc(Protocol):
@@ -1726,13 +2286,19 @@ def calc(
     raise ValueError(msg)
 
 
-def export_stl(scad_path: str | Path, stl_path: str | Path | None = None) -> Path:
+def export_stl(scad_path: str | Path, stl_path: str | Path | None = None, *, cache: StlCache | bool = False) -> Path:
+    """Exports a .scad file to an STL file with OpenSCAD.
+
+    :param scad_path: the path of the .scad file
+    :param stl_path: the path of the STL file, defaults to the name of the .scad file, in the current directory
+    :param cache: the cache of STL files to use, True for the default one, or False to always run OpenSCAD, which is
+        the default
+    :return: the path of the STL file
+
+    """
     if stl_path is None:
         stl_path = Path(scad_path).stem + ".stl"
-    if not isinstance(stl_path, Path):
-        stl_path = Path(stl_path)
-    subprocess.call(["openscad", "-o", stl_path, scad_path])
-    return stl_path
+    return OpenSCADRunner(cache=cache).export(scad_path, stl_path).path
 
 
 E = 0.02  # an EPSILON value. Use it when you want to make sure that 2 aligned planes do not overlap
@@ -1744,3 +2310,11 @@ TT = 0.2  # a large TOLERANCE value.
 TTT = 0.3  # a very large TOLERANCE value
 
 INFINITY = 999_999_999  # a seemingly infinite length
+
+# these modules use the classes defined above, so they are imported last
+from muscad.backends import manifold
+from muscad.modules import render_with_modules_into
+from muscad.optimizer import Optimizer
+from muscad.renders import wrap_renders
+from muscad.runner import OpenSCADRunner
+from muscad.stl import export_mesh_stl
@@ -0,0 +1,199 @@
+"""Incrementally export the parts of a module to STL files.
+
+A build imports a Python module, discovers the parts it defines, and exports only those whose rendered .scad code
+changed since the last build. The digest of the rendered code of each part is stored in a manifest file next to the
+exported files, so that editing a single part only exports that part again.
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import json
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Iterable, Mapping, NamedTuple
+
+from muscad.base import Object, write_if_changed
+from muscad.cache import StlCache
+from muscad.export import ExportError, ProgressCallback, _named, export_many
+from muscad.helpers import camel_to_snake
+from muscad.optimizer import Optimizer
+from muscad.part import Part
+from muscad.runner import ExportResult
+
+# the name of the manifest file, in the output directory
+MANIFEST_NAME = ".muscad-build.json"
+
+
+def load_module(target: str | Path) -> ModuleType:
+    """Imports a module, from its dotted name or from the path of a Python file.
+
+    The directory of a Python file is added to `sys.path`, so that it can import its sibling modules.
+
+    :param target: a module name like `mypackage.printer`, or a path like `printer.py`
+    :return: the imported module
+
+    """
+    path = Path(target)
+    if path.suffix != ".py":
+        return importlib.import_module(str(target))
+    path = path.resolve()
+    if not path.is_file():
+        msg = f"no such file: {path}"
+        raise FileNotFoundError(msg)
+    directory = str(path.parent)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[path.stem] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def discover_targets(module: ModuleType) -> dict[str, Object]:
+    """Finds the parts to export in a module.
+
+    If the module has a `__stl__` attribute, which is either a mapping of names to objects or an iterable of objects,
+    those objects are the targets. Otherwise, the targets are:
+    - the Part instances of the module whose class overrides `__stl__()`, named after their variable,
+    - the Part classes defined in the module that override `__stl__()`, can be instantiated without arguments, and
+      have no instance in the module, named after their `file_name`.
+
+    :param module: an imported module
+    :return: a dict of {name: object}
+
+    """
+    explicit = getattr(module, "__stl__", None)
+    if explicit is not None:
+        return dict(explicit) if isinstance(explicit, Mapping) else _named(explicit)
+
+    targets: dict[str, Object] = {}
+    classes: list[type[Part]] = []
+    for name, value in vars(module).items():
+        if name.startswith("_"):
+            continue
+        if isinstance(value, Part) and _overrides_stl(type(value)):
+            if all(value is not target for target in targets.values()):
+                targets[name] = value
+        elif isinstance(value, type) and issubclass(value, Part) and value.__module__ == module.__name__:
+            classes.append(value)
+
+    for cls in classes:
+        if not _overrides_stl(cls) or not _instantiable(cls):
+            continue
+        if any(isinstance(target, cls) for target in targets.values()):
+            continue
+        name = camel_to_snake(cls.__name__)
+        if name not in targets:
+            targets[name] = cls()
+    return targets
+
+
+def _overrides_stl(cls: type[Object]) -> bool:
+    return cls.__stl__ is not Object.__stl__
+
+
+def _instantiable(cls: type[Part]) -> bool:
+    """Checks if a Part class can be instantiated without arguments."""
+    parameters = list(inspect.signature(cls.init).parameters.values())[1:]
+    return all(
+        parameter.default is not inspect.Parameter.empty
+        or parameter.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+        for parameter in parameters
+    )
+
+
+def scad_digest(obj: Object, *, optimize: bool = False) -> str:
+    """Computes the digest of the .scad code that is exported for an object.
+
+    :param obj: an object
+    :param optimize: if True, the object is simplified with the Optimizer, like `export_many()` does
+    :return: an hexadecimal digest
+
+    """
+    stl = obj.__stl__()
+    if optimize:
+        stl = Optimizer().optimize(stl)
+    return hashlib.sha256(stl.render().encode()).hexdigest()
+
+
+class BuildResult(NamedTuple):
+    """The outcome of a build."""
+
+    # the names of the targets that did not need to be exported
+    up_to_date: list[str]
+    # the results of the exports of stale targets
+    results: list[ExportResult]
+    # the exceptions raised by failed exports, by target name
+    failures: dict[str, Exception]
+
+
+def read_manifest(out_dir: str | Path) -> dict[str, Any]:
+    """Reads the manifest of previous builds.
+
+    :param out_dir: the output directory of builds
+    :return: a dict of {target name: {"scad": digest of the exported .scad code}}
+
+    """
+    try:
+        manifest = json.loads((Path(out_dir) / MANIFEST_NAME).read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+    targets = manifest.get("targets")
+    return targets if isinstance(targets, dict) else {}
+
+
+def build(
+    targets: Mapping[str, Object] | Iterable[Object],
+    out_dir: str | Path | None = None,
+    *,
+    jobs: int | None = None,
+    optimize: bool = False,
+    force: bool = False,
+    cache: StlCache | bool = True,
+    progress: ProgressCallback | None = None,
+) -> BuildResult:
+    """Exports the targets whose .scad code changed since the last build, or whose STL file is missing.
+
+    :param targets: the objects to export, named after their `file_name`, or a mapping of names to objects
+    :param out_dir: the directory of the .scad and STL files, defaults to the current directory
+    :param jobs: the maximum number of concurrent OpenSCAD processes, defaults to the number of CPUs
+    :param optimize: if True, the rendered .scad files are simplified with the Optimizer
+    :param force: if True, all targets are exported, even those that are up to date
+    :param cache: the cache of STL files to use, True for the default one, or False to always run OpenSCAD
+    :param progress: a callback, called each time an export is finished, like `print_progress()`
+    :return: a BuildResult
+
+    """
+    named = dict(targets) if isinstance(targets, Mapping) else _named(targets)
+    out_dir = Path.cwd() if out_dir is None else Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    previous = read_manifest(out_dir)
+
+    digests = {name: scad_digest(obj, optimize=optimize) for name, obj in named.items()}
+    stale = {
+        name: obj
+        for name, obj in named.items()
+        if force or previous.get(name, {}).get("scad") != digests[name] or not (out_dir / f"{name}.stl").exists()
+    }
+    up_to_date = [name for name in named if name not in stale]
+
+    failures: dict[str, Exception] = {}
+    try:
+        results = export_many(stale, jobs=jobs, out_dir=out_dir, optimize=optimize, progress=progress, cache=cache)
+    except ExportError as error:
+        results = error.results
+        failures = error.failures
+
+    manifest = {name: {"scad": digests[name]} for name in up_to_date}
+    manifest.update({result.name: {"scad": digests[result.name]} for result in results})
+    write_if_changed(out_dir / MANIFEST_NAME, json.dumps({"targets": manifest}, indent=2, sort_keys=True))
+    return BuildResult(up_to_date, results, failures)
@@ -0,0 +1,227 @@
+"""A local cache of STL files exported by OpenSCAD, addressed by the content of their .scad file.
+
+Exporting a part with OpenSCAD can take minutes, even when its .scad file did not change since the last export. The
+`StlCache` keys exported STL files by a hash of the .scad file content, of the files it imports, includes or uses, of
+the OpenSCAD version and of the command line flags, so that exporting an unchanged part is a simple file copy. The
+least recently used files are evicted when the cache grows over its maximum size.
+
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import re
+import secrets
+import shutil
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+from typing import Sequence
+
+
+@lru_cache(maxsize=None)
+def openscad_version(openscad: str = "openscad") -> str:
+    """Returns the version of OpenSCAD, as printed by `openscad --version`.
+
+    :param openscad: the OpenSCAD executable
+    :return: the version, or an empty string if OpenSCAD is not installed
+
+    """
+    try:
+        process = subprocess.run([openscad, "--version"], capture_output=True, text=True, check=False)
+    except OSError:
+        return ""
+    # OpenSCAD prints its version on stderr
+    return (process.stdout + process.stderr).strip()
+
+
+# the files referenced by .scad code: `import("file.stl")`, `surface(file="file.dat")`, `include <file.scad>`...
+_REFERENCE = re.compile(rb'\b(?:import|surface)\s*\(\s*(?:file\s*=\s*)?"([^"]*)"|\b(?:include|use)\s*<([^>]*)>')
+
+
+def scad_dependencies(scad_path: str | Path) -> list[Path] | None:
+    """Lists the files that a .scad file depends on, which are the files it imports, includes or uses, recursively.
+
+    Relative paths are resolved like OpenSCAD does, from the directory of the .scad file, then for included and used
+    files, from the directories of the `OPENSCADPATH` environment variable.
+
+    :param scad_path: the path of the .scad file
+    :return: the paths of the files, or None if one of them does not exist
+
+    """
+    root = Path(scad_path).resolve()
+    libraries = [Path(directory) for directory in os.environ.get("OPENSCADPATH", "").split(os.pathsep) if directory]
+    dependencies: set[Path] = set()
+    pending = [root]
+    while pending:
+        path = pending.pop()
+        for match in _REFERENCE.finditer(path.read_bytes()):
+            imported, included = match.groups()
+            name = (imported if imported is not None else included).decode()
+            directories = [path.parent] if imported is not None else [path.parent, *libraries]
+            candidates = [directory / name for directory in directories]
+            dependency = next((candidate.resolve() for candidate in candidates if candidate.is_file()), None)
+            if dependency is None:
+                return None
+            if dependency not in dependencies and dependency != root:
+                dependencies.add(dependency)
+                if included is not None:
+                    pending.append(dependency)
+    return sorted(dependencies)
+
+
+def create_temporary_file(path: Path) -> tuple[int, Path]:
+    """Creates a temporary file next to a file, to replace that file once it is completely written.
+
+    Unlike `tempfile.mkstemp()`, which creates files that only their owner can read, the temporary file gets the
+    permissions of the file it replaces, or the permissions that the umask gives to new files.
+
+    :param path: the path to the file to replace
+    :return: an open file descriptor, and the path of the temporary file
+
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        temporary = path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp")
+        try:
+            # the umask applies to the requested permissions
+            fd = os.open(temporary, flags, 0o666)
+        except FileExistsError:
+            continue
+        with contextlib.suppress(FileNotFoundError):
+            temporary.chmod(path.stat().st_mode & 0o7777)
+        return fd, temporary
+
+
+class StlCache:
+    """A directory of STL files, named after the hash of the .scad file they were exported from."""
+
+    def __init__(self, directory: str | Path | None = None, max_size: int = 2 * 1024**3) -> None:
+        """Initializes a StlCache.
+
+        :param directory: the cache directory, defaults to `$MUSCAD_CACHE_DIR`, or to `muscad/stl` in the user cache
+            directory
+        :param max_size: the maximum total size of the cached files, in bytes
+
+        """
+        if directory is None:
+            directory = default_cache_directory()
+        self.directory = Path(directory)
+        self.max_size = max_size
+
+    @classmethod
+    def resolve(cls, cache: StlCache | bool) -> StlCache | None:  # noqa: FBT001
+        """Resolves the `cache` option of exports.
+
+        :param cache: a StlCache, True for the default one, or False for no cache
+        :return: a StlCache, or None
+
+        """
+        if cache is True:
+            return cls()
+        if cache is False:
+            return None
+        return cache
+
+    def key(
+        self,
+        scad: bytes,
+        flags: Sequence[str] = (),
+        openscad: str = "openscad",
+        dependencies: Sequence[str | Path] = (),
+    ) -> str:
+        """Computes the cache key of a .scad file.
+
+        :param scad: the content of the .scad file
+        :param flags: the OpenSCAD command line flags used for the export
+        :param openscad: the OpenSCAD executable
+        :param dependencies: the files the .scad file depends on, see `scad_dependencies()`
+        :return: an hexadecimal hash
+
+        """
+        digest = hashlib.sha256()
+        for part in (openscad_version(openscad), *flags):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        for dependency in dependencies:
+            digest.update(str(dependency).encode())
+            digest.update(b"\0")
+            digest.update(hashlib.sha256(Path(dependency).read_bytes()).digest())
+        digest.update(scad)
+        return digest.hexdigest()
+
+    def path(self, key: str) -> Path:
+        """Returns the path of a cached file, which may not exist.
+
+        :param key: a cache key
+        :return: the path of the cached STL file
+
+        """
+        return self.directory / key[:2] / f"{key}.stl"
+
+    def get(self, key: str, stl_path: str | Path) -> bool:
+        """Copies a cached STL file, if it exists.
+
+        :param key: a cache key
+        :param stl_path: the path to copy the cached file to
+        :return: True if the file was cached, False otherwise
+
+        """
+        cached = self.path(key)
+        try:
+            shutil.copyfile(cached, stl_path)
+        except FileNotFoundError:
+            return False
+        # the modification time is used to evict the least recently used files
+        cached.touch()
+        return True
+
+    def put(self, key: str, stl_path: str | Path) -> None:
+        """Adds an STL file to the cache, then evicts the least recently used files if the cache is too large.
+
+        :param key: a cache key
+        :param stl_path: the path of the exported STL file
+
+        """
+        cached = self.path(key)
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        # copy to a temporary file first, so that a partially copied file is never used
+        fd, temporary = create_temporary_file(cached)
+        os.close(fd)
+        try:
+            shutil.copyfile(stl_path, temporary)
+            temporary.replace(cached)
+        except BaseException:
+            temporary.unlink()
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used files, until the cache is not larger than its maximum size."""
+        files = []
+        for path in self.directory.glob("*/*.stl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        size = sum(file_size for _, file_size, _ in files)
+        for _, file_size, path in sorted(files):
+            if size <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            size -= file_size
+
+
+def default_cache_directory() -> Path:
+    """Returns the default cache directory.
+
+    :return: `$MUSCAD_CACHE_DIR` if set, or `muscad/stl` in `$XDG_CACHE_HOME`, or in `~/.cache`
+
+    """
+    directory = os.environ.get("MUSCAD_CACHE_DIR")
+    if directory:
+        return Path(directory)
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "muscad" / "stl"
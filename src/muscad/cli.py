@@ -0,0 +1,110 @@
+"""The `muscad` command line interface.
+
+`muscad build <module>` imports a module, or a Python file, and exports the parts it defines to STL files. Only the
+parts whose rendered .scad code changed since the previous build are exported again, in parallel.
+
+`muscad watch <module>` renders the .scad files of the parts of a module, and renders them again each time the source
+files of that module change, so that OpenSCAD previews are updated.
+
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import sys
+from typing import Sequence
+
+from muscad.build import build, discover_targets, load_module
+from muscad.export import print_progress, report_table
+from muscad.resolution import PROFILES, use_resolution
+from muscad.watch import print_watch_result, watch
+
+
+def build_command(args: argparse.Namespace) -> int:
+    """Runs `muscad build`.
+
+    :param args: the parsed command line arguments
+    :return: the exit code
+
+    """
+    with use_resolution(args.resolution):
+        targets = discover_targets(load_module(args.module))
+        if not targets:
+            print(f"no parts to export in {args.module}", file=sys.stderr)  # noqa: T201
+            return 1
+        result = build(
+            targets,
+            args.out_dir,
+            jobs=args.jobs,
+            optimize=args.optimize,
+            force=args.force,
+            cache=not args.no_cache,
+            progress=print_progress,
+        )
+    if result.results:
+        print(report_table(result.results))  # noqa: T201
+    print(  # noqa: T201
+        f"{len(targets)} parts: {len(result.results)} exported, {len(result.up_to_date)} up to date, "
+        f"{len(result.failures)} failed"
+    )
+    for name, error in result.failures.items():
+        print(f"{name}: {error}", file=sys.stderr)  # noqa: T201
+    return 1 if result.failures else 0
+
+
+def watch_command(args: argparse.Namespace) -> int:
+    """Runs `muscad watch`, until interrupted.
+
+    :param args: the parsed command line arguments
+    :return: the exit code
+
+    """
+    with contextlib.suppress(KeyboardInterrupt):
+        watch(args.module, args.out_dir, profile=args.resolution, interval=args.interval, callback=print_watch_result)
+    return 0
+
+
+def parser() -> argparse.ArgumentParser:
+    """Builds the parser of command line arguments.
+
+    :return: an ArgumentParser
+
+    """
+    main_parser = argparse.ArgumentParser(prog="muscad", description="MuSCAD command line tools")
+    commands = main_parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="export the parts of a module to STL files, when they changed")
+    build_parser.add_argument("module", help="a module name, like `package.printer`, or a Python file")
+    build_parser.add_argument("-o", "--out-dir", help="the directory of exported files, defaults to the current one")
+    build_parser.add_argument("-j", "--jobs", type=int, help="the maximum number of concurrent OpenSCAD processes")
+    build_parser.add_argument("--force", action="store_true", help="export all parts, even those that are up to date")
+    build_parser.add_argument("--optimize", action="store_true", help="simplify the .scad files before exporting them")
+    build_parser.add_argument("--no-cache", action="store_true", help="do not use the cache of exported STL files")
+    build_parser.add_argument(
+        "--resolution", choices=list(PROFILES), default="production", help="the resolution profile of round objects"
+    )
+    build_parser.set_defaults(handler=build_command)
+
+    watch_parser = commands.add_parser("watch", help="render the parts of a module each time its source files change")
+    watch_parser.add_argument("module", help="a module name, like `package.printer`, or a Python file")
+    watch_parser.add_argument("-o", "--out-dir", help="the directory of .scad files, defaults to the current one")
+    watch_parser.add_argument(
+        "--interval", type=float, default=0.2, help="the delay between 2 checks of the source files, in seconds"
+    )
+    watch_parser.add_argument(
+        "--resolution", choices=list(PROFILES), default="production", help="the resolution profile of round objects"
+    )
+    watch_parser.set_defaults(handler=watch_command)
+    return main_parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Runs the `muscad` command.
+
+    :param argv: the command line arguments, defaults to `sys.argv[1:]`
+    :return: the exit code
+
+    """
+    args = parser().parse_args(argv)
+    return args.handler(args)  # type: ignore[no-any-return]
@@ -0,0 +1,291 @@
+"""Estimate how expensive an object tree is to render with OpenSCAD, without running it.
+
+OpenSCAD export time mostly depends on the number of facets that go through boolean operations, hulls and Minkowski
+sums. `estimate_cost()` walks an object tree, estimates the number of facets of each subtree from the number of
+segments of its primitives, and derives a relative cost score from it. It also counts nodes by type, and measures the
+depth of nested boolean operations. Each subtree has its own estimate, so that the most expensive parts of a tree can be
+found.
+
+"""
+
+from __future__ import annotations
+
+import copy
+import math
+from collections import Counter
+from typing import Any
+
+from muscad.base import Composite, Hole, Misc, MuSCAD, Object, Transformation, Union
+from muscad.part import Part
+from muscad.primitives import Circle, Cube, Cylinder, Polygon, Polyhedron, Sphere, Square, Text
+from muscad.transformations import Hull, LinearExtrusion, Minkowski, RotationalExtrusion, Slide
+
+__all__ = ["CostEstimate", "CostEstimator", "estimate_cost"]
+
+# the estimated number of facets of each character of a Text
+TEXT_FACETS_PER_CHARACTER = 50
+
+
+class CostEstimate:
+    """The estimated cost of rendering an object tree, with the estimates of its subtrees."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        facets: int,
+        score: float,
+        nodes: Counter[str] | None = None,
+        boolean_depth: int = 0,
+        segments: int = 0,
+        vertices: int = 0,
+        faces: int = 0,
+        children: list[CostEstimate] | None = None,
+    ) -> None:
+        """Initializes a CostEstimate.
+
+        :param name: the name of the estimated object
+        :param facets: the estimated number of facets of the object
+        :param score: a relative cost score, that grows with the number of facets going through each operation
+        :param nodes: the number of nodes in the tree, by object name
+        :param boolean_depth: the maximum number of nested boolean operations
+        :param segments: the total number of circle segments, from `$fn` of cylinders, spheres and circles
+        :param vertices: the total number of vertices of polyhedrons
+        :param faces: the total number of faces of polyhedrons
+        :param children: the estimates of each child
+
+        """
+        self.name = name
+        self.facets = facets
+        self.score = score
+        self.nodes = nodes or Counter({name: 1})
+        self.boolean_depth = boolean_depth
+        self.segments = segments
+        self.vertices = vertices
+        self.faces = faces
+        self.children = children or []
+
+    @property
+    def minkowski(self) -> int:
+        """The number of Minkowski sums in the tree."""
+        return self.nodes["minkowski"]
+
+    @property
+    def hulls(self) -> int:
+        """The number of hulls in the tree."""
+        return self.nodes["hull"]
+
+    def to_dict(self, max_depth: int | None = None) -> dict[str, Any]:
+        """Converts this estimate to a dict, that can be serialized as JSON.
+
+        :param max_depth: the maximum depth of the subtrees to include, or None to include all of them
+        :return: a dict
+
+        """
+        result: dict[str, Any] = {
+            "name": self.name,
+            "score": round(self.score),
+            "facets": self.facets,
+            "nodes": dict(self.nodes),
+            "boolean_depth": self.boolean_depth,
+            "segments": self.segments,
+            "vertices": self.vertices,
+            "faces": self.faces,
+            "minkowski": self.minkowski,
+            "hulls": self.hulls,
+        }
+        if self.children and (max_depth is None or max_depth > 0):
+            depth = None if max_depth is None else max_depth - 1
+            result["children"] = [child.to_dict(depth) for child in self.children]
+        return result
+
+    def report(self, max_depth: int = 3, min_share: float = 0.01) -> str:
+        """Formats this estimate as an indented tree, with the share of the total score of each subtree.
+
+        :param max_depth: the maximum depth of the subtrees to show
+        :param min_share: subtrees with a smaller share of the total score are hidden
+        :return: a multiline string
+
+        """
+        lines: list[str] = []
+        total = self.score or 1
+
+        def add(estimate: CostEstimate, depth: int) -> None:
+            lines.append(
+                f"{'  ' * depth}{estimate.name}: score={estimate.score:.0f} ({estimate.score / total:.0%}), "
+                f"facets={estimate.facets}, boolean depth={estimate.boolean_depth}"
+            )
+            if depth < max_depth:
+                for child in estimate.children:
+                    if child.score / total >= min_share:
+                        add(child, depth + 1)
+
+        add(self, 0)
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"CostEstimate({self.name!r}, score={self.score:.0f}, facets={self.facets})"
+
+
+class CostEstimator:
+    """Estimates the cost of object trees, and remembers the estimate of each object.
+
+    Estimating a tree also estimates all of its subtrees, so the estimate of any subtree can then be looked up in
+    constant time. Objects must not be modified while their estimates are used.
+
+    """
+
+    def __init__(self) -> None:
+        # keeping a reference to each object makes sure that its id() is not reused by another object
+        self._estimates: dict[int, tuple[MuSCAD, CostEstimate]] = {}
+
+    def estimate(self, obj: MuSCAD) -> CostEstimate:
+        """Estimates the cost of rendering an object tree with OpenSCAD.
+
+        :param obj: an object tree
+        :return: a CostEstimate, with an estimate for each subtree
+
+        """
+        known = self._estimates.get(id(obj))
+        if known is not None:
+            return known[1]
+        estimate = self._estimate(obj)
+        self._estimates[id(obj)] = (obj, estimate)
+        return estimate
+
+    def _estimate(self, obj: MuSCAD) -> CostEstimate:
+        if isinstance(obj, (Hole, Misc)):
+            return self.estimate(obj.object)
+        assert isinstance(obj, Object)
+        if isinstance(obj, Part):
+            return _renamed(self.estimate(obj._renderable()), type(obj).__name__)
+        if isinstance(obj, Composite):
+            children = [self.estimate(child) for child in _rendered(obj._iter_children())]
+            return _operation(obj.object_name, children, boolean=True)
+        if isinstance(obj, Slide):
+            # a Slide renders as a Union of hulls
+            return _renamed(
+                self.estimate(
+                    Union(Hull(child, child.translate(x=obj.x, y=obj.y, z=obj.z)) for child in obj.child.walk())
+                ),
+                obj.object_name,
+            )
+        if isinstance(obj, Transformation):
+            children = [self.estimate(item) for item in _rendered(_union_children(obj.child))]
+            if isinstance(obj, Minkowski):
+                facets = math.prod(max(estimate.facets, 1) for estimate in children)
+                return _operation(obj.object_name, children, facets=facets, cost=facets)
+            if isinstance(obj, Hull):
+                return _operation(obj.object_name, children)
+            if isinstance(obj, LinearExtrusion):
+                slices = obj._slices or (obj.segments if obj._twist else 1)
+                facets = sum(estimate.facets for estimate in children) * max(slices, 1) + 2
+                return _operation(obj.object_name, children, facets=facets)
+            if isinstance(obj, RotationalExtrusion):
+                facets = sum(estimate.facets for estimate in children) * max(obj.segments, 1)
+                return _operation(obj.object_name, children, facets=facets)
+            # other transformations render their children as an implicit union
+            return _operation(obj.object_name, children, boolean=True)
+        return _primitive(obj)
+
+
+def estimate_cost(obj: MuSCAD) -> CostEstimate:
+    """Estimates the cost of rendering an object tree with OpenSCAD.
+
+    Parts are estimated as the objects they render as. Disabled (`*`) and background (`%`) objects are ignored, since
+    they are not part of exported objects.
+
+    :param obj: an object tree
+    :return: a CostEstimate, with an estimate for each subtree
+
+    """
+    return CostEstimator().estimate(obj)
+
+
+def _rendered(children: Any) -> list[Object]:
+    return [child for child in children if child.modifier not in ("*", "%")]
+
+
+def _union_children(obj: Object) -> list[Object]:
+    # transformations of multiple objects have an implicit union as child
+    if isinstance(obj, Union) and not obj.modifier:
+        return list(obj._iter_children())
+    return [obj]
+
+
+def _renamed(estimate: CostEstimate, name: str) -> CostEstimate:
+    # the renamed estimate is a copy, since the original one is remembered by the CostEstimator
+    renamed = copy.copy(estimate)
+    renamed.name = name
+    return renamed
+
+
+def _operation(
+    name: str,
+    children: list[CostEstimate],
+    *,
+    boolean: bool = False,
+    facets: int | None = None,
+    cost: float | None = None,
+) -> CostEstimate:
+    """Combines the estimates of the children of an operation.
+
+    :param name: the name of the operation
+    :param children: the estimates of its children
+    :param boolean: True if the operation is a boolean operation between its children
+    :param facets: the estimated number of facets of the result, defaults to the sum of the facets of the children
+    :param cost: the cost of the operation itself, defaults to an n*log(n) cost in the number of facets of the children
+        for boolean operations and hulls, or to 0 for other operations
+    :return: a CostEstimate
+
+    """
+    input_facets = sum(child.facets for child in children)
+    if facets is None:
+        facets = input_facets
+    # a boolean operation with a single child does nothing
+    is_boolean = boolean and len(children) > 1
+    if cost is None:
+        cost = input_facets * math.log2(input_facets + 1) if is_boolean or name == "hull" else 0
+    nodes: Counter[str] = Counter({name: 1})
+    for child in children:
+        nodes.update(child.nodes)
+    return CostEstimate(
+        name,
+        facets=facets,
+        score=cost + sum(child.score for child in children),
+        nodes=nodes,
+        boolean_depth=max((child.boolean_depth for child in children), default=0) + is_boolean,
+        segments=sum(child.segments for child in children),
+        vertices=sum(child.vertices for child in children),
+        faces=sum(child.faces for child in children),
+        children=children,
+    )
+
+
+def _primitive(obj: Object) -> CostEstimate:
+    """Estimates the cost of a primitive, which is its number of facets."""
+    name = obj.object_name
+    segments = vertices = faces = 0
+    if isinstance(obj, Cube):
+        facets = 6
+    elif isinstance(obj, Cylinder):
+        segments = obj.segments
+        facets = segments + 2
+    elif isinstance(obj, Sphere):
+        segments = obj.segments
+        # OpenSCAD spheres have a ring of `segments` facets every 2 segments
+        facets = segments * ((segments + 1) // 2)
+    elif isinstance(obj, Circle):
+        segments = facets = obj.segments
+    elif isinstance(obj, Square):
+        facets = 4
+    elif isinstance(obj, Polygon):
+        facets = len(obj.points)
+    elif isinstance(obj, Polyhedron):
+        vertices = len(obj.points)
+        faces = facets = len(obj.faces)
+    elif isinstance(obj, Text):
+        facets = len(obj.text) * TEXT_FACETS_PER_CHARACTER
+    else:
+        facets = 0
+    return CostEstimate(name, facets=facets, score=facets, segments=segments, vertices=vertices, faces=faces)
@@ -0,0 +1,283 @@
+"""Export many objects to STL files at once, running multiple OpenSCAD processes concurrently.
+
+Exporting a part with OpenSCAD is slow and single-threaded, so exporting a whole project one part at a time only
+uses one core. `export_many()` renders the .scad file of each part, then runs up to `jobs` OpenSCAD processes at the
+same time. `report_table()` and `report_json()` then show which parts take the most time to export.
+
+`render_project()` renders the .scad files of many objects at once, with the subtrees they share declared once as
+modules of a library file.
+
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Iterable, Mapping
+
+from muscad.base import MuSCADError, Object, write_if_changed
+from muscad.cache import StlCache
+from muscad.modules import ModuleWriter, SubtreeDigests, select_modules, write_modules
+from muscad.optimizer import Optimizer
+from muscad.runner import ExportResult, OpenSCADRunner
+from muscad.stl import export_mesh_stl
+
+__all__ = [
+    "ExportError",
+    "ProgressCallback",
+    "export_many",
+    "print_progress",
+    "render_project",
+    "report_json",
+    "report_table",
+]
+
+
+class ExportError(MuSCADError):
+    """Raised when some objects could not be exported."""
+
+    def __init__(self, failures: Mapping[str, Exception], results: Iterable[ExportResult] = ()) -> None:
+        self.failures = dict(failures)
+        # the results of successful exports
+        self.results = list(results)
+        names = ", ".join(self.failures)
+        super().__init__(f"{len(self.failures)} objects could not be exported: {names}")
+
+
+# called after each export with the number of finished exports, the total number of exports, the name of the exported
+# object, and the result of its export or the exception that made it fail
+ProgressCallback = Callable[[int, int, str, "ExportResult | Exception"], None]
+
+
+def print_progress(done: int, total: int, name: str, result: ExportResult | Exception) -> None:
+    """A progress callback for `export_many()`, that prints a line for each exported object."""
+    if isinstance(result, Exception):
+        status = f"failed: {result}"
+    else:
+        status = f"{result.path} ({result.source}, {result.wall_time:.2f}s)"
+    print(f"[{done}/{total}] {name}: {status}", file=sys.stderr)  # noqa: T201
+
+
+def export_many(
+    parts: Iterable[Object] | Mapping[str, Object],
+    *,
+    jobs: int | None = None,
+    out_dir: str | Path | None = None,
+    optimize: bool = False,
+    progress: ProgressCallback | None = None,
+    cache: StlCache | bool = True,
+    runner: OpenSCADRunner | None = None,
+) -> list[ExportResult]:
+    """Exports multiple objects to STL files, running up to `jobs` OpenSCAD processes concurrently.
+
+    The .scad files are rendered first, one by one. Objects made only of Polyhedrons are directly written as binary
+    STL, like `Object.export_stl()` does, and the others are exported by OpenSCAD. A failing export does not stop the
+    others.
+
+    :param parts: the objects to export, named after their `file_name`, or a mapping of names to objects
+    :param jobs: the maximum number of concurrent OpenSCAD processes, defaults to the number of CPUs
+    :param out_dir: the directory of the .scad and STL files, defaults to the current directory
+    :param optimize: if True, the rendered .scad files are simplified with the Optimizer
+    :param progress: a callback, called each time an export is finished, like `print_progress()`
+    :param cache: the cache of STL files to use, True for the default one, or False to always run OpenSCAD
+    :param runner: the OpenSCADRunner to use, instead of a default one using `cache`
+    :return: the results of the exports, in the same order as `parts`
+    :raises ExportError: once all exports are finished, if some of them failed
+
+    """
+    named = dict(parts) if isinstance(parts, Mapping) else _named(parts)
+    out_dir = Path.cwd() if out_dir is None else Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if runner is None:
+        runner = OpenSCADRunner(cache=cache)
+
+    total = len(named)
+    done = 0
+    results: dict[str, ExportResult] = {}
+    failures: dict[str, Exception] = {}
+
+    def finish(name: str, result: ExportResult | Exception) -> None:
+        nonlocal done
+        done += 1
+        if isinstance(result, Exception):
+            failures[name] = result
+        else:
+            results[name] = result
+        if progress is not None:
+            progress(done, total, name, result)
+
+    scad_paths: dict[str, Path] = {}
+    for name, part in named.items():
+        obj = part.__stl__()
+        stl_path = out_dir / f"{name}.stl"
+        try:
+            start = time.perf_counter()
+            if export_mesh_stl(obj, stl_path) is not None:
+                finish(name, ExportResult(stl_path, time.perf_counter() - start, source="mesh"))
+            else:
+                scad_paths[name] = obj.render_to_file(out_dir / name, optimize=optimize)
+        except Exception as error:
+            finish(name, error)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(runner.export, scad_path, out_dir / f"{name}.stl"): name
+            for name, scad_path in scad_paths.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                finish(name, future.result())
+            except Exception as error:
+                finish(name, error)
+
+    if failures:
+        raise ExportError(failures, (results[name] for name in named if name in results))
+    return [results[name] for name in named]
+
+
+def render_project(
+    parts: Iterable[Object] | Mapping[str, Object],
+    out_dir: str | Path | None = None,
+    *,
+    library: str = "library",
+    optimize: bool = False,
+) -> dict[Path, bool]:
+    """Renders the .scad files of multiple objects, with the subtrees they share declared once in a library file.
+
+    Subtrees used multiple times, like bolts, nuts or motors, are declared as OpenSCAD modules in `library.scad`, and
+    each object file imports them with `use <library.scad>`. Module names are derived from the content of subtrees, so
+    an object file only changes when the object itself changes. Files that already have the rendered content are not
+    rewritten, so that their modification time is kept.
+
+    :param parts: the objects to render, named after their `file_name`, or a mapping of names to objects
+    :param out_dir: the directory of the .scad files, defaults to the current directory
+    :param library: the name of the library file, without the .scad suffix
+    :param optimize: if True, objects are simplified with the Optimizer before rendering
+    :return: a dict of {path: True if that file was written, False if it was unchanged}, starting with the library
+
+    """
+    named = dict(parts) if isinstance(parts, Mapping) else _named(parts)
+    if library in named:
+        msg = f"an object is named like the library {library!r}"
+        raise ValueError(msg)
+    out_dir = Path.cwd() if out_dir is None else Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if optimize:
+        named = {name: Optimizer().optimize(part) for name, part in named.items()}
+
+    digests = SubtreeDigests()
+    for part in named.values():
+        digests.digest(part)
+    modules = select_modules(digests, digests.uses())
+
+    library_path = out_dir / f"{library}.scad"
+    buffer = io.StringIO()
+    write_modules(buffer, digests, modules)
+    written = {library_path: write_if_changed(library_path, buffer.getvalue())}
+    for name, part in named.items():
+        buffer = io.StringIO()
+        writer = ModuleWriter(buffer, digests, modules)
+        part.render_into(writer)
+        code = buffer.getvalue()
+        if writer.used:
+            code = f"use <{library_path.name}>\n\n{code}"
+        path = out_dir / f"{name}.scad"
+        written[path] = write_if_changed(path, code)
+    return written
+
+
+def _named(parts: Iterable[Object]) -> dict[str, Object]:
+    named: dict[str, Object] = {}
+    for part in parts:
+        name = part.file_name
+        if name in named:
+            msg = f"multiple objects are named {name!r}, pass a mapping of names to objects instead"
+            raise ValueError(msg)
+        named[name] = part
+    return named
+
+
+def _by_wall_time(results: Iterable[ExportResult]) -> list[ExportResult]:
+    return sorted(results, key=lambda result: result.wall_time, reverse=True)
+
+
+def report_json(results: Iterable[ExportResult]) -> str:
+    """Formats export results as JSON, slowest exports first.
+
+    :param results: export results, as returned by `export_many()`
+    :return: a JSON list, with an object for each export
+
+    """
+    return json.dumps(
+        [
+            {
+                "name": result.name,
+                "path": str(result.path),
+                "source": result.source,
+                "wall_time": result.wall_time,
+                "render_time": result.render_time,
+                "vertices": result.vertices,
+                "facets": result.facets,
+                "geometries_in_cache": result.geometries_in_cache,
+                "cgal_polyhedrons_in_cache": result.cgal_polyhedrons_in_cache,
+                "warnings": list(result.warnings),
+            }
+            for result in _by_wall_time(results)
+        ],
+        indent=2,
+    )
+
+
+def report_table(results: Iterable[ExportResult]) -> str:
+    """Formats export results as a table, slowest exports first, with a total line.
+
+    :param results: export results, as returned by `export_many()`
+    :return: a multiline string
+
+    """
+    results = _by_wall_time(results)
+
+    def cell(value: float | None, digits: int = 0) -> str:
+        return "-" if value is None else f"{value:.{digits}f}"
+
+    header = ("name", "source", "wall (s)", "render (s)", "vertices", "facets", "warnings")
+    rows = [
+        (
+            result.name,
+            result.source,
+            cell(result.wall_time, 2),
+            cell(result.render_time, 2),
+            cell(result.vertices),
+            cell(result.facets),
+            str(len(result.warnings)),
+        )
+        for result in results
+    ]
+    total = (
+        "total",
+        "",
+        cell(sum(result.wall_time for result in results), 2),
+        "",
+        "",
+        "",
+        str(sum(len(result.warnings) for result in results)),
+    )
+    widths = [max(len(row[column]) for row in (header, *rows, total)) for column in range(len(header))]
+
+    def line(row: tuple[str, ...]) -> str:
+        # names and sources are left aligned, numbers are right aligned
+        return "  ".join(
+            value.ljust(width) if column < 2 else value.rjust(width)
+            for column, (value, width) in enumerate(zip(row, widths))
+        ).rstrip()
+
+    separator = "  ".join("-" * width for width in widths)
+    return "\n".join((line(header), separator, *map(line, rows), separator, line(total)))
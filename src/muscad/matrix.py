@@ -0,0 +1,196 @@
+"""Helpers to work with 4x4 affine transformation matrices, as used by OpenSCAD `multmatrix()`."""
+
+from __future__ import annotations
+
+import math
+from typing import Iterable
+
+from muscad.helpers import normalize_angle
+
+Row = tuple[float, float, float, float]
+Matrix = tuple[Row, Row, Row, Row]
+# bounds of an object, as (left, right, back, front, bottom, top)
+Bounds = tuple[float, float, float, float, float, float]
+
+IDENTITY: Matrix = (
+    (1, 0, 0, 0),
+    (0, 1, 0, 0),
+    (0, 0, 1, 0),
+    (0, 0, 0, 1),
+)
+
+# exact cosines and sines of right angles, to avoid rounding errors like cos(90°) = 6.123233995736766e-17
+RIGHT_ANGLES = {0: (1, 0), 90: (0, 1), 180: (-1, 0), 270: (0, -1)}
+
+
+def cos_sin(angle: float) -> tuple[float, float]:
+    """Returns the cosine and sine of an angle, which are exact for multiples of 90°.
+
+    :param angle: an angle, in degrees
+    :return: a (cosine, sine) tuple
+
+    """
+    angle = normalize_angle(angle)
+    if angle in RIGHT_ANGLES:
+        return RIGHT_ANGLES[angle]  # type: ignore[index]
+    return math.cos(math.radians(angle)), math.sin(math.radians(angle))
+
+
+def translation_matrix(x: float = 0, y: float = 0, z: float = 0) -> Matrix:
+    """Returns the matrix for a translation.
+
+    :param x: x axis translation
+    :param y: y axis translation
+    :param z: z axis translation
+    :return: a 4x4 matrix
+
+    """
+    return (
+        (1, 0, 0, x),
+        (0, 1, 0, y),
+        (0, 0, 1, z),
+        (0, 0, 0, 1),
+    )
+
+
+def rotation_matrix(x: float = 0, y: float = 0, z: float = 0) -> Matrix:
+    """Returns the matrix for a rotation, as done by OpenSCAD `rotate()`: around X first, then Y, then Z.
+
+    :param x: rotation around the X axis, in degrees
+    :param y: rotation around the Y axis, in degrees
+    :param z: rotation around the Z axis, in degrees
+    :return: a 4x4 matrix
+
+    """
+    cx, sx = cos_sin(x)
+    cy, sy = cos_sin(y)
+    cz, sz = cos_sin(z)
+    return (
+        (cz * cy, cz * sy * sx - sz * cx, cz * sy * cx + sz * sx, 0),
+        (sz * cy, sz * sy * sx + cz * cx, sz * sy * cx - cz * sx, 0),
+        (-sy, cy * sx, cy * cx, 0),
+        (0, 0, 0, 1),
+    )
+
+
+def scaling_matrix(x: float = 1, y: float = 1, z: float = 1) -> Matrix:
+    """Returns the matrix for a scaling.
+
+    :param x: x axis scale factor
+    :param y: y axis scale factor
+    :param z: z axis scale factor
+    :return: a 4x4 matrix
+
+    """
+    return (
+        (x, 0, 0, 0),
+        (0, y, 0, 0),
+        (0, 0, z, 0),
+        (0, 0, 0, 1),
+    )
+
+
+def mirroring_matrix(x: float = 0, y: float = 0, z: float = 0) -> Matrix:
+    """Returns the matrix for a mirroring, as done by OpenSCAD `mirror()`.
+
+    The mirror plane goes through the origin, and is normal to the vector (x, y, z). A null vector does not mirror.
+
+    :param x: x coordinate of the normal vector
+    :param y: y coordinate of the normal vector
+    :param z: z coordinate of the normal vector
+    :return: a 4x4 matrix
+
+    """
+    length = x * x + y * y + z * z
+    if length == 0:
+        return IDENTITY
+    return (
+        (1 - 2 * x * x / length, -2 * x * y / length, -2 * x * z / length, 0),
+        (-2 * y * x / length, 1 - 2 * y * y / length, -2 * y * z / length, 0),
+        (-2 * z * x / length, -2 * z * y / length, 1 - 2 * z * z / length, 0),
+        (0, 0, 0, 1),
+    )
+
+
+def multiply(left: Matrix, right: Matrix) -> Matrix:
+    """Multiplies 2 matrices. The resulting matrix applies `right` first, then `left`.
+
+    :param left: a 4x4 matrix
+    :param right: another 4x4 matrix
+    :return: the product of both matrices
+
+    """
+    columns = tuple(zip(*right))
+    return tuple(  # type: ignore[return-value]
+        tuple(sum(a * b for a, b in zip(row, column)) for column in columns) for row in left
+    )
+
+
+def rounded(matrix: tuple[Row, ...]) -> list[list[float]]:
+    """Rounds the values of a matrix, to render it as OpenSCAD code.
+
+    Values are rounded with more precision than coordinates, since rotation values are multiplied by coordinates.
+
+    :param matrix: a matrix, with 3 or 4 rows
+    :return: a list of rows, with integer values as int
+
+    """
+    return [[int(value) if value == int(value) else round(value, 8) for value in row] for row in matrix]
+
+
+def transform_point(matrix: Matrix, x: float, y: float, z: float) -> tuple[float, float, float]:
+    """Applies an affine matrix to a point.
+
+    :param matrix: a 4x4 affine matrix
+    :param x: x coordinate of the point
+    :param y: y coordinate of the point
+    :param z: z coordinate of the point
+    :return: the transformed point, as a (x, y, z) tuple
+
+    """
+    first, second, third, _ = matrix
+    return (
+        first[0] * x + first[1] * y + first[2] * z + first[3],
+        second[0] * x + second[1] * y + second[2] * z + second[3],
+        third[0] * x + third[1] * y + third[2] * z + third[3],
+    )
+
+
+def points_bounds(matrix: Matrix, points: Iterable[tuple[float, float, float]]) -> Bounds:
+    """Returns the bounds of a set of points, once transformed by an affine matrix.
+
+    :param matrix: a 4x4 affine matrix
+    :param points: an iterable of (x, y, z) tuples
+    :return: a (left, right, back, front, bottom, top) tuple
+
+    """
+    xs, ys, zs = zip(*(transform_point(matrix, *point) for point in points))
+    return min(xs), max(xs), min(ys), max(ys), min(zs), max(zs)
+
+
+def disk_bounds(matrix: Matrix, radius: float, z: float = 0) -> Bounds:
+    """Returns the bounds of a disk, centered on the Z axis and parallel to the XY plane, once transformed.
+
+    :param matrix: a 4x4 affine matrix
+    :param radius: the radius of the disk
+    :param z: the height of the disk
+    :return: a (left, right, back, front, bottom, top) tuple
+
+    """
+    bounds: list[float] = []
+    for row in matrix[:3]:
+        center = row[2] * z + row[3]
+        half = radius * math.hypot(row[0], row[1])
+        bounds += (center - half, center + half)
+    return tuple(bounds)  # type: ignore[return-value]
+
+
+def merge_bounds(bounds: Iterable[Bounds]) -> Bounds:
+    """Returns the bounds that contain all the given bounds.
+
+    :param bounds: an iterable of (left, right, back, front, bottom, top) tuples
+    :return: a (left, right, back, front, bottom, top) tuple, or only zeros if no bounds are given
+
+    """
+    lefts, rights, backs, fronts, bottoms, tops = list(zip(*bounds)) or [(0,)] * 6
+    return min(lefts), max(rights), min(backs), max(fronts), min(bottoms), max(tops)
@@ -0,0 +1,187 @@
+"""Render repeated subtrees only once, as OpenSCAD modules.
+
+Assemblies often contain the same objects many times, like bolts, nuts or motors. Instead of rendering each copy in
+full, each distinct subtree that is used multiple times can be declared once as an OpenSCAD `module`, and called
+wherever it is used. This makes the generated code smaller, and faster to parse for OpenSCAD.
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+from collections import Counter
+
+from muscad.base import Object, SubtreeWriter, Writer, newline
+
+__all__ = [
+    "ModuleWriter",
+    "SubtreeDigests",
+    "module_name",
+    "render_with_modules",
+    "render_with_modules_into",
+    "select_modules",
+    "write_modules",
+]
+
+
+class SubtreeDigests:
+    """Computes structural digests for all subtrees of an object.
+
+    Two subtrees that render the same code have the same digest. Each object is rendered shallowly, with its children
+    replaced by their own digests, so computing the digests of a whole tree is linear in its size.
+
+    """
+
+    def __init__(self) -> None:
+        # keeping a reference to each object makes sure that its id() is not reused by another object
+        self._digests: dict[int, tuple[Object, str]] = {}
+        self.objects: dict[str, Object] = {}
+        self.children: dict[str, list[str]] = {}
+        self.sizes: dict[str, int] = {}
+
+    def digest(self, obj: Object) -> str:
+        """Returns the structural digest of an object.
+
+        :param obj: an object
+        :return: a digest, as a hex string
+
+        """
+        known = self._digests.get(id(obj))
+        if known is not None:
+            return known[1]
+        writer = _DigestWriter(self)
+        obj._render_into(writer, 0)
+        shallow = writer.getvalue()
+        if len(writer.children) == 1 and shallow == f"<{writer.children[0]}>":
+            # this object renders exactly like its only child, like a Part without holes
+            digest = writer.children[0]
+            self._digests[id(obj)] = (obj, digest)
+            return digest
+        digest = hashlib.blake2b(shallow.encode(), digest_size=8).hexdigest()
+        self._digests[id(obj)] = (obj, digest)
+        if digest not in self.objects:
+            self.objects[digest] = obj
+            self.children[digest] = writer.children
+            placeholders = len(writer.children) * (len(digest) + 2)
+            self.sizes[digest] = len(shallow) - placeholders + sum(self.sizes[child] for child in writer.children)
+        return digest
+
+    def uses(self) -> Counter[str]:
+        """Counts how many times each subtree is used, in all the distinct subtrees that contain it.
+
+        :return: a Counter of digests
+
+        """
+        return Counter(child for children in self.children.values() for child in children)
+
+
+class _DigestWriter(SubtreeWriter):
+    """Renders an object shallowly, with each of its children replaced by its digest."""
+
+    def __init__(self, digests: SubtreeDigests) -> None:
+        self.buffer = io.StringIO()
+        super().__init__(self.buffer)
+        self.digests = digests
+        self.children: list[str] = []
+
+    def substitute(self, obj: Object, depth: int) -> bool:
+        digest = self.digests.digest(obj)
+        self.children.append(digest)
+        self.write(f"<{digest}>")
+        return True
+
+    def getvalue(self) -> str:
+        return self.buffer.getvalue()
+
+
+class ModuleWriter(SubtreeWriter):
+    """Replaces all subtrees that are declared as modules by a call to that module."""
+
+    def __init__(self, writer: Writer, digests: SubtreeDigests, modules: dict[str, str]) -> None:
+        super().__init__(writer)
+        self.digests = digests
+        self.modules = modules
+        # the names of the modules that were called
+        self.used: set[str] = set()
+
+    def substitute(self, obj: Object, depth: int) -> bool:
+        name = self.modules.get(self.digests.digest(obj))
+        if name is None:
+            return False
+        self.write(f"{name}();")
+        self.used.add(name)
+        return True
+
+
+def module_name(digest: str) -> str:
+    """Returns the name of the OpenSCAD module for a subtree.
+
+    :param digest: the structural digest of the subtree
+    :return: a module name
+
+    """
+    return f"m_{digest}"
+
+
+def select_modules(digests: SubtreeDigests, uses: Counter[str]) -> dict[str, str]:
+    """Selects the subtrees that are worth declaring as modules.
+
+    A subtree becomes a module if it is used at least twice, and if declaring it makes the rendered code smaller.
+
+    :param digests: the digests of all subtrees
+    :param uses: the number of uses of each subtree
+    :return: a dict of {digest: module name}
+
+    """
+    modules = {}
+    for digest, count in uses.items():
+        name = module_name(digest)
+        size = digests.sizes[digest]
+        call = len(name) + 3
+        declaration = size + 2 * call + 10
+        if count >= 2 and count * size > declaration + count * call:
+            modules[digest] = name
+    return modules
+
+
+def write_modules(writer: Writer, digests: SubtreeDigests, modules: dict[str, str]) -> None:
+    """Writes the declarations of modules.
+
+    :param writer: a file-like object to write the SCAD code into
+    :param digests: the digests of all subtrees
+    :param modules: the modules to declare, as a dict of {digest: module name}
+
+    """
+    module_writer = ModuleWriter(writer, digests, modules)
+    for digest, name in modules.items():
+        writer.write(f"module {name}() {{{newline(1)}")
+        # the declared object itself must not be replaced by a call to its own module
+        digests.objects[digest]._render_into(module_writer, 1)
+        writer.write("\n}\n\n")
+
+
+def render_with_modules_into(obj: Object, writer: Writer) -> None:
+    """Writes the SCAD code for an object, declaring each subtree that is used multiple times as an OpenSCAD module.
+
+    :param obj: the object to render
+    :param writer: a file-like object to write the SCAD code into
+
+    """
+    digests = SubtreeDigests()
+    digests.digest(obj)
+    modules = select_modules(digests, digests.uses())
+    write_modules(writer, digests, modules)
+    obj.render_into(ModuleWriter(writer, digests, modules))
+
+
+def render_with_modules(obj: Object) -> str:
+    """Returns the SCAD code for an object, declaring each subtree that is used multiple times as an OpenSCAD module.
+
+    :param obj: the object to render
+    :return: the SCAD code
+
+    """
+    buffer = io.StringIO()
+    render_with_modules_into(obj, buffer)
+    return buffer.getvalue()
@@ -0,0 +1,321 @@
+"""Simplify object trees before rendering them, without changing their geometry.
+
+Trees built with the fluent API often contain redundant nodes: Unions nested in Unions, chains of Translations, identity
+transformations like `Rotation(0, 0, 0)`, or Differences without any hole. The `Optimizer` builds a simplified copy of
+a tree, which renders the same geometry with fewer nodes.
+
+"""
+
+from __future__ import annotations
+
+import copy
+from collections import Counter
+from typing import Iterable
+
+from muscad.base import (
+    Composite,
+    Difference,
+    Hole,
+    ImplicitUnion,
+    Intersection,
+    Misc,
+    MuSCAD,
+    Object,
+    Transformation,
+    Union,
+)
+from muscad.matrix import IDENTITY, multiply
+from muscad.part import Part
+from muscad.transformations import Mirroring, Multmatrix, Rotation, Scaling, Translation
+
+__all__ = ["Optimizer", "optimize"]
+
+
+class Optimizer:
+    """Builds simplified copies of object trees.
+
+    The following simplifications are applied:
+    - Parts are replaced by the objects they render as,
+    - nested Unions, nested Intersections, and Differences used as the first child of a Difference are flattened,
+    - Unions used as holes of a Difference are flattened into that Difference,
+    - empty Unions are removed from Unions and from the holes of Differences,
+    - Differences without holes and Intersections with a single child are replaced by that child,
+    - identity transformations are removed,
+    - consecutive Translations, Scalings, Rotations (when possible) and Mirrorings are folded into a single one,
+    - optionally, chains of mixed affine transformations are collapsed into a single Multmatrix.
+
+    Nodes with a modifier are never removed, only their children are simplified. Comments are kept, either on the
+    node that replaces a removed one, on the first child of a flattened boolean operation, or on a Union wrapping it.
+    The original objects are never modified: simplified nodes are new objects, and leaves are shared with the
+    original tree.
+
+    """
+
+    def __init__(self, *, multmatrix: bool = False) -> None:
+        """Initializes an Optimizer.
+
+        :param multmatrix: if True, chains of affine transformations are also collapsed into a single Multmatrix
+
+        """
+        self.multmatrix = multmatrix
+        # the number of nodes removed from the rendered code, by object name
+        self.removed: Counter[str] = Counter()
+
+    def optimize(self, obj: MuSCAD) -> Object:
+        """Returns a simplified copy of an object.
+
+        :param obj: the object to simplify
+        :return: an object which renders the same geometry
+
+        """
+        if isinstance(obj, (Hole, Misc)):
+            return self.optimize(obj.object)
+        if isinstance(obj, Part) and type(obj)._render_into is Part._render_into:
+            return self._commented(self.optimize(obj._renderable()), obj.comment)
+        if type(obj) is Union:
+            return self._optimize_union(obj)
+        if type(obj) is ImplicitUnion:
+            return self._optimize_implicit_union(obj)
+        if type(obj) is Difference:
+            return self._optimize_difference(obj)
+        if type(obj) is Intersection:
+            return self._optimize_intersection(obj)
+        if isinstance(obj, Transformation) and obj._child is not None:
+            return self._optimize_transformation(obj)
+        assert isinstance(obj, Object)
+        return obj
+
+    def _optimize_union(self, union: Union) -> Object:
+        if len(union.children) == 1:
+            # a Union with a single child renders as that child
+            return self._commented(self.optimize(union.children[0]), union.comment)
+        children = [self.optimize(child) for child in union.children]
+        if union.modifier:
+            return self._rebuild(union, children)
+        children = self._flatten(children, Union)
+        if len(children) == 1:
+            self.removed[union.object_name] += 1
+            return self._commented(children[0], union.comment)
+        return self._rebuild(union, children)
+
+    def _optimize_implicit_union(self, union: ImplicitUnion) -> Object:
+        # an ImplicitUnion does not render its comment
+        children = [self.optimize(child) for child in union._iter_children()]
+        if union.modifier:
+            return self._rebuild(union, children)
+        children = self._flatten(children, Union)
+        if len(children) == 1:
+            self.removed[union.object_name] += 1
+            return children[0]
+        return self._rebuild(union, children)
+
+    def _optimize_difference(self, difference: Difference) -> Object:
+        children = [self.optimize(child) for child in difference._iter_children()]
+        if difference.modifier or not children:
+            return self._rebuild(difference, children)
+        first, *holes = children
+        spliced = self._splice(first, Difference)
+        if spliced is not None:
+            first, *inner_holes = spliced
+            holes = inner_holes + holes
+        holes = self._flatten(holes, Union)
+        if not holes:
+            self.removed[difference.object_name] += 1
+            return self._commented(first, difference.comment)
+        return self._rebuild(difference, [first, *holes])
+
+    def _optimize_intersection(self, intersection: Intersection) -> Object:
+        children = [self.optimize(child) for child in intersection._iter_children()]
+        if intersection.modifier:
+            return self._rebuild(intersection, children)
+        children = self._flatten(children, Intersection)
+        if len(children) == 1:
+            self.removed[intersection.object_name] += 1
+            return self._commented(children[0], intersection.comment)
+        return self._rebuild(intersection, children)
+
+    def _optimize_transformation(self, transformation: Transformation) -> Object:
+        child = self.optimize(transformation.child)
+        if not transformation.modifier:
+            if _is_identity(transformation):
+                self.removed[transformation.object_name] += 1
+                return self._commented(child, transformation.comment)
+            if (
+                type(child) is type(transformation)
+                and not child.modifier
+                and (transformation.comment is None or child.comment is None)
+            ):
+                assert isinstance(child, Transformation)
+                folded = _fold(transformation, child)
+                if folded is not None:
+                    self.removed[transformation.object_name] += 1
+                    comment = transformation.comment if child.comment is None else child.comment
+                    if _is_identity(folded):
+                        self.removed[folded.object_name] += 1
+                        return self._commented(child.child, comment)
+                    folded.comment = comment
+                    folded.child = child.child
+                    return folded
+            if self.multmatrix:
+                collapsed = self._collapse(transformation, child)
+                if collapsed is not None:
+                    return collapsed
+        new = _copy(transformation)
+        assert isinstance(new, Transformation)
+        new.child = child
+        return new
+
+    def _collapse(self, outer: Transformation, inner: Object) -> Object | None:
+        """Collapses 2 consecutive affine transformations into a single Multmatrix.
+
+        :param outer: a transformation without modifier
+        :param inner: the optimized child of that transformation
+        :return: a Multmatrix, or None if those transformations can't be collapsed
+
+        """
+        if not isinstance(inner, Transformation) or inner.modifier or inner._child is None:
+            return None
+        if outer.comment is not None and inner.comment is not None:
+            return None
+        outer_matrix = outer.affine_matrix()
+        inner_matrix = inner.affine_matrix()
+        if outer_matrix is None or inner_matrix is None:
+            return None
+        matrix = multiply(outer_matrix, inner_matrix)
+        comment = outer.comment if inner.comment is None else inner.comment
+        self.removed[outer.object_name] += 1
+        if matrix == IDENTITY:
+            self.removed[inner.object_name] += 1
+            return self._commented(inner.child, comment)
+        first, second, third, _ = matrix
+        multmatrix = Multmatrix((first, second, third))
+        multmatrix.comment = comment
+        multmatrix.child = inner.child
+        return multmatrix
+
+    def _flatten(self, children: Iterable[Object], cls: type[Object]) -> list[Object]:
+        """Flattens the children of a boolean operation.
+
+        :param children: optimized children
+        :param cls: the boolean operation that can be flattened
+        :return: the list of flattened children
+
+        """
+        flattened: list[Object] = []
+        for child in children:
+            spliced = self._splice(child, cls)
+            if spliced is None:
+                flattened.append(child)
+            else:
+                flattened.extend(spliced)
+        return flattened
+
+    def _splice(self, obj: Object, cls: type[Object]) -> list[Object] | None:
+        """Returns the children of a boolean operation of type `cls`, so that they can replace that operation.
+
+        The comment of that operation is moved to its first child. Empty Unions have no children, so they are removed.
+
+        :param obj: an optimized object
+        :param cls: the boolean operation that can be spliced
+        :return: the children replacing that object, or None if that object can't be spliced
+
+        """
+        if not isinstance(obj, Composite) or obj.modifier:
+            return None
+        if type(obj) is not cls and not (cls is Union and type(obj) is ImplicitUnion):
+            return None
+        if not obj.children and cls is not Union:
+            # an empty Intersection or Difference is empty, not neutral
+            return None
+        # an ImplicitUnion does not render its comment
+        comment = None if type(obj) is ImplicitUnion else obj.comment
+        children = list(obj.children)
+        if comment is not None:
+            if not children or children[0].comment is not None:
+                return None
+            children[0] = self._commented(children[0], comment)
+        self.removed[obj.object_name] += 1
+        return children
+
+    def _rebuild(self, composite: Union | Difference | Intersection, children: list[Object]) -> Object:
+        new = type(composite)(children)
+        new.modifier = composite.modifier
+        new.comment = composite.comment
+        return new
+
+    def _commented(self, obj: Object, comment: str | None) -> Object:
+        """Adds a comment on an object, or on a Union wrapping it if that object already has a comment.
+
+        :param obj: an optimized object
+        :param comment: a comment, or None
+        :return: an object, with the comment applied
+
+        """
+        if comment is None:
+            return obj
+        obj = _copy(obj) if obj.comment is None else Union(obj)
+        obj.comment = comment
+        return obj
+
+
+def _copy(obj: Object) -> Object:
+    """Makes a shallow copy of an object, that does not share any list of children with the original one."""
+    new = copy.copy(obj)
+    for key, value in new.__dict__.items():
+        if isinstance(value, list):
+            new.__dict__[key] = list(value)
+    return new
+
+
+def _is_identity(transformation: Transformation) -> bool:
+    """Checks if a transformation has no effect on its child.
+
+    :param transformation: a transformation
+    :return: True if the transformation can be removed
+
+    """
+    if type(transformation) in (Translation, Rotation, Mirroring):
+        return transformation.x == transformation.y == transformation.z == 0
+    if type(transformation) is Scaling:
+        return transformation.x == transformation.y == transformation.z == 1
+    return False
+
+
+def _fold(outer: Transformation, inner: Transformation) -> Transformation | None:
+    """Folds 2 consecutive transformations of the same type into a single one.
+
+    :param outer: the outer transformation
+    :param inner: the inner transformation, child of `outer`
+    :return: a new transformation, without child, or None if those transformations can't be folded
+
+    """
+    if type(outer) is Translation and type(inner) is Translation:
+        return Translation(x=outer.x + inner.x, y=outer.y + inner.y, z=outer.z + inner.z)
+    if type(outer) is Scaling and type(inner) is Scaling:
+        return Scaling(x=outer.x * inner.x, y=outer.y * inner.y, z=outer.z * inner.z)
+    if type(outer) is Rotation and type(inner) is Rotation:
+        # Rotation.combine() only folds rotations that can be expressed as a single rotation
+        folded = outer.copy().combine(inner)
+        return folded if folded.child is not inner else None
+    if type(outer) is Mirroring and type(inner) is Mirroring:
+        if (outer.x, outer.y, outer.z) == (inner.x, inner.y, inner.z):
+            # mirroring twice on the same plane cancels out
+            return Mirroring()
+        return None
+    return None
+
+
+def optimize(obj: MuSCAD, report: Counter[str] | None = None, *, multmatrix: bool = False) -> Object:
+    """Returns a simplified copy of an object, which renders the same geometry with fewer nodes.
+
+    :param obj: the object to simplify
+    :param report: if provided, the number of removed nodes, by object name, is added to this Counter
+    :param multmatrix: if True, chains of affine transformations are also collapsed into a single Multmatrix
+    :return: the simplified object
+
+    """
+    optimizer = Optimizer(multmatrix=multmatrix)
+    optimized = optimizer.optimize(obj)
+    if report is not None:
+        report.update(optimizer.removed)
+    return optimized
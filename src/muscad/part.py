@@ -1,23 +1,26 @@
 from __future__ import annotations
 
+import io
 from itertools import chain
 from typing import Any, ClassVar, Iterable, Iterator, Literal
 
-from muscad import (
+from muscad.base import (
     EE,
     Composite,
     Hole,
     Misc,
     Object,
     Union,
+    Writer,
     back,
     bottom,
     front,
     left,
-    render_comment,
     right,
     top,
+    write_comment,
 )
+from muscad.matrix import Bounds, Matrix, merge_bounds
 
 
 def walk_mro_until(cls: type[Any], supercls: type[Any]) -> Iterator[type[Any]]:
@@ -44,6 +47,9 @@ class Part(Composite):
     class_misc: ClassVar[list[Object]]
     class_holes: ClassVar[list[Object]]
 
+    cache_render = True
+    _child_attributes = frozenset({"children", "holes", "miscellaneous"})
+
     def __init_subclass__(cls, **kwargs: Any) -> None:
         """Handle class level attributes.
 
@@ -140,6 +146,8 @@ class Part(Composite):
         if comment:
             obj.comment = comment
         self.holes.append(obj)
+        obj._add_parent(self)
+        self.invalidate()
         return self
 
     def add_misc(self, obj: Object | Misc | Hole, comment: str | None = None) -> Object:
@@ -148,6 +156,8 @@ class Part(Composite):
         if comment:
             obj.comment = comment
         self.miscellaneous.append(obj)
+        obj._add_parent(self)
+        self.invalidate()
         return self
 
     def revert(self) -> Part:
@@ -180,8 +190,30 @@ class Part(Composite):
                 self.children.remove(previous)
             self.add_child(value)
 
-    @render_comment
     def render(self, *, postprocess: bool = True) -> str:
+        if postprocess:
+            return super().render()
+        buffer = io.StringIO()
+        self._render_into(buffer, 0, postprocess=False)
+        return buffer.getvalue()
+
+    def render_into(self, writer: Writer, depth: int = 0, *, postprocess: bool = True) -> None:
+        if postprocess:
+            super().render_into(writer, depth)
+        else:
+            self._render_into(writer, depth, postprocess=False)
+
+    def _render_into(self, writer: Writer, depth: int, *, postprocess: bool = True) -> None:
+        write_comment(writer, self.comment, depth)
+        self._renderable(postprocess=postprocess).render_into(writer, depth)
+
+    def _renderable(self, *, postprocess: bool = True) -> Object:
+        """Builds the object that this part renders as, out of its children, holes and misc items.
+
+        :param postprocess: if True, applies postprocessing
+        :return: an object, with this part modifier applied
+
+        """
         if not self.children and not self.miscellaneous:
             if self.holes:
                 self.children, self.holes = self.holes, self.children
@@ -197,7 +229,7 @@ class Part(Composite):
         if postprocess:
             renderable = self.postprocess(renderable)
         # applies the modifier
-        return renderable.set_modifier(self.modifier).render()
+        return renderable.set_modifier(self.modifier)
 
     def postprocess(self, renderable: Object) -> Object:
         """Applies some postprocessing transformation to the part, at render time.
@@ -240,6 +272,9 @@ class Part(Composite):
     def top(self) -> float:
         return top(self.children)
 
+    def _bounds_under(self, matrix: Matrix) -> Bounds:
+        return merge_bounds(child._bounds_under(matrix) for child in self.children)
+
     def debug(self, *, include_misc: bool = False) -> Object:
         """Turn all children to debug, not the misc (Unless include_misc is set to True)."""
         if include_misc:
@@ -276,8 +311,7 @@ class MirroredPart(Part):
         cls._center_y = center_y
         cls._center_z = center_z
 
-    @render_comment
-    def render(self) -> str:
+    def _renderable(self, *, postprocess: bool = True) -> Object:
         if not self.children:
             msg = "This part has no children"
             raise RuntimeError(msg)
@@ -290,7 +324,7 @@ class MirroredPart(Part):
             children = children.y_mirror(center=self._center_y)
         if self.mirror_z:
             children = children.z_mirror(center=self._center_z)
-        return Union(children, self.miscellaneous).set_modifier(self.modifier).render()
+        return Union(children, self.miscellaneous).set_modifier(self.modifier)
 
     @property
     def left(self) -> float:
@@ -328,6 +362,10 @@ class MirroredPart(Part):
             return -bottom(self.children)
         return top(self.children)
 
+    def _bounds_under(self, matrix: Matrix) -> Bounds:
+        # mirrored children are only known through the bounding box of this part
+        return Object._bounds_under(self, matrix)
+
 
 class SymmetricPart(Part):
     mirror_x: bool
@@ -356,8 +394,7 @@ class SymmetricPart(Part):
         cls._center_y = center_y
         cls._center_z = center_z
 
-    @render_comment
-    def render(self) -> str:
+    def _renderable(self, *, postprocess: bool = True) -> Object:
         if not self.children:
             msg = "This part has no children"
             raise RuntimeError(msg)
@@ -370,7 +407,7 @@ class SymmetricPart(Part):
             children = children.y_symmetry(center=self._center_y)
         if self.mirror_z:
             children = children.z_symmetry(center=self._center_z)
-        return Union(children, self.miscellaneous).set_modifier(self.modifier).render()
+        return Union(children, self.miscellaneous).set_modifier(self.modifier)
 
     @property
     def left(self) -> float:
@@ -408,6 +445,10 @@ class SymmetricPart(Part):
             return max(abs(bottom(self.children)), abs(top(self.children)))
         return top(self.children)
 
+    def _bounds_under(self, matrix: Matrix) -> Bounds:
+        # mirrored children are only known through the bounding box of this part
+        return Object._bounds_under(self, matrix)
+
 
 from muscad.primitives import Square
 
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from array import array
+from typing import Any, Iterable, Iterator, Sequence
+
 from muscad.helpers import atan2, cos, radians, sin
 
 
@@ -61,3 +64,173 @@ class Point3D(Vector):
 
     def __init__(self, x: float, y: float, z: float):
         super().__init__(x=x, y=y, z=z)
+
+
+def _flat_array(values: Any, width: int) -> array[Any]:
+    """Turns a buffer of numbers, like a NumPy array, into a flat array, with a bulk copy.
+
+    :param values: an object supporting the buffer protocol
+    :param width: the number of values in each row
+    :return: a flat array of numbers, of floats if the buffer contains floats, or of integers otherwise
+
+    """
+    view = memoryview(values)
+    typecode = "d" if view.format in ("d", "f") else "q"
+    if view.itemsize == 8 and view.format in ("d", "q", "l"):
+        result = array(typecode)
+        result.frombytes(view.tobytes())
+    else:
+        result = array(typecode, memoryview(view.tobytes()).cast(view.format).tolist())
+    if len(result) % width:
+        msg = f"the number of values ({len(result)}) is not a multiple of {width}"
+        raise ValueError(msg)
+    return result
+
+
+def _format_number(value: float) -> str:
+    # same format as Vector.__str__()
+    return repr(round(value, 4)) if value != 0.0 else "0"
+
+
+class PointArray:
+    """A compact sequence of 2D or 3D points, stored as a flat array of coordinates.
+
+    Points are rendered in bulk, and are only turned into `Point2D` or `Point3D` objects when accessed one by one.
+    Coordinates are stored as integers if they are all integers, or as floats otherwise. When integers and floats are
+    mixed, `integers` flags the coordinates that were integers, so that they are rendered like `Vector` does.
+
+    """
+
+    def __init__(self, coordinates: array[Any], dimensions: int, integers: array[Any] | None = None) -> None:
+        if dimensions not in (2, 3):
+            msg = "points must have 2 or 3 dimensions"
+            raise ValueError(msg)
+        self.coordinates = coordinates
+        self.dimensions = dimensions
+        self.integers = integers
+
+    @classmethod
+    def from_points(cls, points: Any, dimensions: int) -> PointArray:
+        """Builds a PointArray from points.
+
+        :param points: an iterable of `Point2D`/`Point3D` or of tuples of coordinates, or a buffer of coordinates like a
+            NumPy array of shape (n, dimensions)
+        :param dimensions: 2 or 3
+        :return: a PointArray
+
+        """
+        if isinstance(points, PointArray):
+            return points
+        try:
+            return cls(_flat_array(points, dimensions), dimensions)
+        except TypeError:
+            pass
+        flat = [value for point in points for value in _coordinates(point, dimensions)]
+        integers = array("b", (type(value) is int for value in flat))
+        if all(integers):
+            return cls(array("q", flat), dimensions)
+        return cls(array("d", flat), dimensions, integers if any(integers) else None)
+
+    def column(self, axis: int) -> array[Any]:
+        """Returns the coordinates of all points along one axis.
+
+        :param axis: 0 for X, 1 for Y, 2 for Z
+        :return: an array of coordinates
+
+        """
+        return self.coordinates[axis :: self.dimensions]
+
+    def __len__(self) -> int:
+        return len(self.coordinates) // self.dimensions
+
+    def __getitem__(self, index: int) -> Point2D | Point3D:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        start = index * self.dimensions
+        values = [self._value(position) for position in range(start, start + self.dimensions)]
+        return Point2D(*values) if self.dimensions == 2 else Point3D(*values)
+
+    def _value(self, position: int) -> float:
+        value = self.coordinates[position]
+        return int(value) if self.integers is not None and self.integers[position] else value
+
+    def __iter__(self) -> Iterator[Point2D | Point3D]:
+        return (self[index] for index in range(len(self)))
+
+    def __str__(self) -> str:
+        values = list(map(_format_number, self.coordinates))
+        if self.integers is not None:
+            for position in (position for position, integer in enumerate(self.integers) if integer):
+                values[position] = str(int(self.coordinates[position]))
+        width = self.dimensions
+        rows = (", ".join(values[start : start + width]) for start in range(0, len(values), width))
+        return f"[{', '.join(f'[{row}]' for row in rows)}]"
+
+
+class FaceArray:
+    """A compact sequence of faces, each face being a list of point indexes."""
+
+    def __init__(self, indexes: array[Any], offsets: array[Any]) -> None:
+        self.indexes = indexes
+        # offsets[i] is the position of the first index of face i in `indexes`, with a final offset at the end
+        self.offsets = offsets
+
+    @classmethod
+    def from_faces(cls, faces: Any) -> FaceArray:
+        """Builds a FaceArray from faces.
+
+        :param faces: an iterable of faces, each face being an iterable of point indexes, or a buffer of indexes for
+            faces that all have the same number of points, like a NumPy array of shape (n, points per face)
+        :return: a FaceArray
+
+        """
+        if isinstance(faces, FaceArray):
+            return faces
+        try:
+            view = memoryview(faces)
+        except TypeError:
+            indexes = array("q")
+            offsets = array("q", [0])
+            for face in faces:
+                indexes.extend(face)
+                offsets.append(len(indexes))
+            return cls(indexes, offsets)
+        if view.ndim != 2:
+            msg = "a buffer of faces must have 2 dimensions"
+            raise ValueError(msg)
+        size = view.shape[1]
+        indexes = _flat_array(view, size)
+        if indexes.typecode != "q":
+            msg = "face indexes must be integers"
+            raise ValueError(msg)
+        return cls(indexes, array("q", range(0, len(indexes) + 1, size)))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> list[int]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.indexes[self.offsets[index] : self.offsets[index + 1]].tolist()
+
+    def __iter__(self) -> Iterator[list[int]]:
+        return (self[index] for index in range(len(self)))
+
+    def __str__(self) -> str:
+        values = list(map(str, self.indexes))
+        rows = (", ".join(values[start:stop]) for start, stop in zip(self.offsets, self.offsets[1:]))
+        return f"[{', '.join(f'[{row}]' for row in rows)}]"
+
+
+def _coordinates(point: Vector | Sequence[float], dimensions: int) -> Iterable[float]:
+    if isinstance(point, Vector):
+        if len(point.kwargs) == dimensions:
+            return point.kwargs.values()
+    elif isinstance(point, (tuple, list)) and len(point) == dimensions:
+        return point
+    msg = f"invalid point, must be a {dimensions} floats tuple or a Point{dimensions}D instance"
+    raise ValueError(msg, point)
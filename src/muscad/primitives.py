@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import math
 import sys
 from pathlib import Path
 from typing import Any, Iterable, Sequence
 
 from muscad.base import Object, Primitive
-from muscad.point import Point2D, Point3D
+from muscad.matrix import Bounds, Matrix, disk_bounds, merge_bounds, points_bounds
+from muscad.point import FaceArray, Point2D, Point3D, PointArray
+from muscad.resolution import current_resolution
 
 
 class Cube(Primitive):
@@ -74,23 +77,34 @@ class Cylinder(Primitive):
         self._height = h
         self.diameter = d
         self.top_diameter = d2
-        if segments is None:
-            segments = int(d * 3.14 / 0.4)
-        self.segments = segments
+        # None to use the current resolution
+        self._fixed_segments = segments
+
+    @property
+    def segments(self) -> int:
+        """The number of segments, as given explicitly or by the current resolution."""
+        if self._fixed_segments is None:
+            return current_resolution().circle_segments(self.diameter)
+        return self._fixed_segments
+
+    @segments.setter
+    def segments(self, segments: int | None) -> None:
+        self._fixed_segments = segments
 
     def _arguments(self) -> dict[str | None, Any]:
+        segments = current_resolution().arguments(self._fixed_segments, self.diameter)
         if self.top_diameter is None:
             return {
                 "h": self._height,
                 "d": self.diameter,
-                "$fn": self.segments,
+                **segments,
                 "center": True,
             }
         return {
             "h": self._height,
             "d1": self.diameter,
             "d2": self.top_diameter,
-            "$fn": self.segments,
+            **segments,
             "center": True,
         }
 
@@ -130,6 +144,15 @@ class Cylinder(Primitive):
     def top(self) -> float:
         return self.height / 2
 
+    def _bounds_under(self, matrix: Matrix) -> Bounds:
+        top_diameter = self.diameter if self.top_diameter is None else self.top_diameter
+        return merge_bounds(
+            (
+                disk_bounds(matrix, self.diameter / 2, self.bottom),
+                disk_bounds(matrix, top_diameter / 2, self.top),
+            )
+        )
+
     def half_down(self) -> Object:
         return self.down(self.height / 2)
 
@@ -141,12 +164,18 @@ class Sphere(Primitive):
     def __init__(self, d: float, segments: int | None = None) -> None:
         super().__init__()
         self._diameter = d
-        if segments is None:
-            segments = int(d * 3.14 / 0.4)
-        self._segments = segments
+        # None to use the current resolution
+        self._fixed_segments = segments
+
+    @property
+    def segments(self) -> int:
+        """The number of segments, as given explicitly or by the current resolution."""
+        if self._fixed_segments is None:
+            return current_resolution().circle_segments(self._diameter)
+        return self._fixed_segments
 
     def _arguments(self) -> dict[str | None, Any]:
-        return {"d": self._diameter, "$fn": self._segments}
+        return {"d": self._diameter, **current_resolution().arguments(self._fixed_segments, self._diameter)}
 
     @property
     def width(self) -> float:
@@ -184,6 +213,13 @@ class Sphere(Primitive):
     def top(self) -> float:
         return self._diameter / 2
 
+    def _bounds_under(self, matrix: Matrix) -> Bounds:
+        bounds: list[float] = []
+        for row in matrix[:3]:
+            half = self._diameter / 2 * math.hypot(row[0], row[1], row[2])
+            bounds += (row[3] - half, row[3] + half)
+        return tuple(bounds)  # type: ignore[return-value]
+
 
 class Polyhedron(Primitive):
     def __init__(
@@ -193,31 +229,30 @@ class Polyhedron(Primitive):
         convexity: int = 1,
     ) -> None:
         super().__init__()
-        self.points = list(self.unpack_points(points))
-        self.faces = [list(face) for face in faces]
+        self.points = PointArray.from_points(points, 3)
+        self.faces = FaceArray.from_faces(faces)
         self.convexity = convexity
 
-        self._left = min(p.x for p in self.points)
-        self._right = max(p.x for p in self.points)
-        self._back = min(p.y for p in self.points)
-        self._front = max(p.y for p in self.points)
-        self._bottom = min(p.z for p in self.points)
-        self._top = max(p.z for p in self.points)
-
-    @staticmethod
-    def unpack_points(points: Iterable[Point3D | Sequence[float]]) -> Iterable[Point3D]:
-        for point in points:
-            if isinstance(point, Point3D):
-                yield point
-            elif isinstance(point, (tuple, list)) and len(point) == 3:
-                x, y, z = point
-                yield Point3D(x, y, z)
-            else:
-                msg = "invalid point, must be a 3 floats tuple or a Point3D instance"
-                raise ValueError(
-                    msg,
-                    point,
-                )
+        xs, ys, zs = (self.points.column(axis) for axis in range(3))
+        self._left = min(xs)
+        self._right = max(xs)
+        self._back = min(ys)
+        self._front = max(ys)
+        self._bottom = min(zs)
+        self._top = max(zs)
+
+    @classmethod
+    def from_arrays(cls, points: Any, faces: Any, convexity: int = 1) -> Polyhedron:
+        """Builds a Polyhedron from arrays of points and faces, without creating a `Point3D` for each point.
+
+        :param points: a buffer of coordinates, like a NumPy array of shape (n, 3) or an `array("d")` of x, y, z values
+        :param faces: a buffer of point indexes, like a NumPy array of shape (n, 3) for triangular faces, or an iterable
+            of faces
+        :param convexity: the convexity of the polyhedron
+        :return: a Polyhedron
+
+        """
+        return cls(PointArray.from_points(points, 3), FaceArray.from_faces(faces), convexity)
 
     def _arguments(self) -> dict[str | None, Any]:
         return {
@@ -226,6 +261,33 @@ class Polyhedron(Primitive):
             "convexity": self.convexity,
         }
 
+    @property
+    def left(self) -> float:
+        return self._left
+
+    @property
+    def right(self) -> float:
+        return self._right
+
+    @property
+    def back(self) -> float:
+        return self._back
+
+    @property
+    def front(self) -> float:
+        return self._front
+
+    @property
+    def bottom(self) -> float:
+        return self._bottom
+
+    @property
+    def top(self) -> float:
+        return self._top
+
+    def _bounds_under(self, matrix: Matrix) -> Bounds:
+        return points_bounds(matrix, zip(*(self.points.column(axis) for axis in range(3))))
+
 
 # 2D Primitives
 class Primitive2D(Primitive):
@@ -246,12 +308,18 @@ class Circle(Primitive2D):
     def __init__(self, d: float, segments: int | None = None) -> None:
         super().__init__()
         self._diameter = d
-        if segments is None:
-            segments = int(d * 3.14 / 0.4)
-        self._segments = segments
+        # None to use the current resolution
+        self._fixed_segments = segments
+
+    @property
+    def segments(self) -> int:
+        """The number of segments, as given explicitly or by the current resolution."""
+        if self._fixed_segments is None:
+            return current_resolution().circle_segments(self._diameter)
+        return self._fixed_segments
 
     def _arguments(self) -> dict[str | None, Any]:
-        return {"d": self._diameter, "$fn": self._segments}
+        return {"d": self._diameter, **current_resolution().arguments(self._fixed_segments, self._diameter)}
 
     @property
     def left(self) -> float:
@@ -269,6 +337,9 @@ class Circle(Primitive2D):
     def front(self) -> float:
         return self._diameter / 2
 
+    def _bounds_under(self, matrix: Matrix) -> Bounds:
+        return disk_bounds(matrix, self._diameter / 2)
+
 
 class Square(Primitive2D):
     def __init__(self, width: float, depth: float) -> None:
@@ -396,29 +467,36 @@ class Polygon(Primitive2D):
         convexity: int | None = None,
     ) -> None:
         super().__init__()
-        self.points = list(self.unpack_points(points))
+        if len(points) == 1 and isinstance(points[0], PointArray):
+            self.points = points[0]
+        else:
+            self.points = PointArray.from_points(points, 2)
         if hole_paths and not path:
-            path = list(range(len(points)))
+            path = list(range(len(self.points)))
         self.paths: list[list[int]] | None = [list(path)] if path else None
         if hole_paths and self.paths:
             for hole_path in hole_paths:
                 self.paths.append(list(hole_path))
         self.convexity = convexity
 
-    @staticmethod
-    def unpack_points(points: Iterable[Point2D | tuple[float, float]]) -> Iterable[Point2D]:
-        for point in points:
-            if isinstance(point, Point2D):
-                yield point
-            elif isinstance(point, (tuple, list)) and len(point) == 2:
-                x, y = point
-                yield Point2D(x, y)
-            else:
-                msg = ("invalid point, must be a 2 floats tuple or a Point2D instance",)
-                raise ValueError(
-                    msg,
-                    point,
-                )
+    @classmethod
+    def from_arrays(
+        cls,
+        points: Any,
+        path: Iterable[int] | None = None,
+        hole_paths: Iterable[Iterable[int]] | None = None,
+        convexity: int | None = None,
+    ) -> Polygon:
+        """Builds a Polygon from an array of points, without creating a `Point2D` for each point.
+
+        :param points: a buffer of coordinates, like a NumPy array of shape (n, 2) or an `array("d")` of x, y values
+        :param path: the path of the polygon, as point indexes
+        :param hole_paths: the paths of holes in the polygon, as point indexes
+        :param convexity: the convexity of the polygon
+        :return: a Polygon
+
+        """
+        return cls(PointArray.from_points(points, 2), path=path, hole_paths=hole_paths, convexity=convexity)
 
     def _arguments(self) -> dict[str | None, Any]:
         return {
@@ -429,19 +507,22 @@ class Polygon(Primitive2D):
 
     @property
     def left(self) -> float:
-        return min([point.x for point in self.points])
+        return min(self.points.column(0))
 
     @property
     def right(self) -> float:
-        return max([point.x for point in self.points])
+        return max(self.points.column(0))
 
     @property
     def front(self) -> float:
-        return max([point.y for point in self.points])
+        return max(self.points.column(1))
 
     @property
     def back(self) -> float:
-        return min([point.y for point in self.points])
+        return min(self.points.column(1))
+
+    def _bounds_under(self, matrix: Matrix) -> Bounds:
+        return points_bounds(matrix, ((x, y, 0) for x, y in zip(self.points.column(0), self.points.column(1))))
 
 
 class Import(Primitive):
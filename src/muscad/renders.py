@@ -0,0 +1,164 @@
+"""Wrap expensive subtrees in `render()`, so that OpenSCAD previews stay interactive.
+
+OpenSCAD previews evaluate boolean operations with OpenCSG each time the view is redrawn, which gets very slow with
+deeply nested Differences, Minkowski sums, or hulls of many objects. A subtree wrapped in `render()` is evaluated once
+into a mesh, which OpenSCAD caches and draws quickly. `wrap_renders()` uses the estimates of `estimate_cost()` to find
+the expensive subtrees, and wraps them in a `Render` with a convexity computed from the subtree.
+
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import NamedTuple
+
+from muscad.base import Composite, Difference, ImplicitUnion, Intersection, MuSCAD, Object, Transformation, Union
+from muscad.cost import CostEstimator
+from muscad.optimizer import Optimizer, _copy
+from muscad.primitives import Import, Polygon, Polyhedron, Text
+from muscad.transformations import Hull, Render, RotationalExtrusion, Slide
+
+__all__ = ["RenderWrapper", "wrap_renders"]
+
+# the estimated cost from which a subtree is wrapped in render(), see `estimate_cost()`
+DEFAULT_MIN_SCORE = 5000
+# the maximum convexity of render() nodes, higher values make previews slower
+DEFAULT_MAX_CONVEXITY = 10
+
+
+class _Wrapped(NamedTuple):
+    obj: Object
+    # the estimated convexity of the object, 0 if it is not rendered
+    convexity: int
+    # the estimated cost of the parts of the subtree which are not wrapped in render()
+    uncached: float
+
+
+class RenderWrapper:
+    """Builds copies of object trees, with their expensive subtrees wrapped in `Render`.
+
+    Trees are simplified by the Optimizer first, so that Parts are replaced by the objects they render as. A boolean
+    operation, hull or Minkowski sum is wrapped when the estimated cost of its subtree reaches `min_score`, not counting
+    the subtrees that are already wrapped, since OpenSCAD caches them. Objects with a modifier are never wrapped, and
+    disabled or background objects are left unchanged.
+
+    """
+
+    def __init__(self, *, min_score: float = DEFAULT_MIN_SCORE, max_convexity: int = DEFAULT_MAX_CONVEXITY) -> None:
+        """Initializes a RenderWrapper.
+
+        :param min_score: the estimated cost from which a subtree is wrapped
+        :param max_convexity: the maximum convexity of render() nodes
+
+        """
+        self.min_score = min_score
+        self.max_convexity = max_convexity
+        self.estimator = CostEstimator()
+        # the number of wrapped nodes, by object name
+        self.wrapped: Counter[str] = Counter()
+
+    def wrap(self, obj: MuSCAD) -> Object:
+        """Returns a simplified copy of an object, with its expensive subtrees wrapped in `Render`.
+
+        :param obj: the object to wrap
+        :return: an object which renders the same geometry
+
+        """
+        return self._wrap(Optimizer().optimize(obj)).obj
+
+    def _wrap(self, obj: Object) -> _Wrapped:
+        if obj.modifier in ("*", "%"):
+            return _Wrapped(obj, 0, 0)
+        if type(obj) in (Union, ImplicitUnion, Difference, Intersection):
+            assert isinstance(obj, Composite)
+            children = list(obj._iter_children())
+            results = [self._wrap(child) for child in children]
+            new: Object = _rebuild(obj, [result.obj for result in results])
+            convexities = [result.convexity for result in results if result.convexity]
+            # an intersection is inside each of its children, so it is not more concave than any of them
+            convexity = min(convexities, default=1) if isinstance(obj, Intersection) else sum(convexities)
+        elif isinstance(obj, Transformation) and obj._child is not None and not isinstance(obj, Slide):
+            # like the CostEstimator, the children of a Union are considered as children of the transformation
+            child = obj.child
+            if isinstance(child, Union) and not child.modifier:
+                children = list(child._iter_children())
+                results = [self._wrap(item) for item in children]
+                new_child: Object = _rebuild(child, [result.obj for result in results])
+            else:
+                children = [child]
+                results = [self._wrap(child)]
+                new_child = results[0].obj
+            new = _copy(obj)
+            assert isinstance(new, Transformation)
+            new.child = new_child
+            convexity = sum(result.convexity for result in results)
+            if isinstance(obj, Hull):
+                convexity = 1
+            elif isinstance(obj, RotationalExtrusion):
+                # each ray crosses the extruded shape on both sides of the axis
+                convexity *= 2
+        elif isinstance(obj, Slide):
+            # a Slide renders as a Union of hulls, which is wrapped as a whole
+            children, results, new, convexity = [], [], obj, 1
+        else:
+            estimate = self.estimator.estimate(obj)
+            return _Wrapped(obj, _primitive_convexity(obj), estimate.score)
+
+        # the cost of the operation itself, without the cost of its children
+        own = self.estimator.estimate(obj).score - sum(
+            self.estimator.estimate(child).score for child, result in zip(children, results) if result.convexity
+        )
+        uncached = own + sum(result.uncached for result in results)
+        if own <= 0 or obj.modifier or uncached < self.min_score:
+            return _Wrapped(new, convexity, uncached)
+        render = Render(max(1, min(convexity, self.max_convexity)))
+        if new.comment is not None:
+            # the comment is moved to the render() node
+            render.comment = new.comment
+            new = _copy(new)
+            new.comment = None
+        render.child = new
+        self.wrapped[obj.object_name] += 1
+        return _Wrapped(render, convexity, 0)
+
+
+def _rebuild(composite: Composite, children: list[Object]) -> Composite:
+    new = type(composite)(children)
+    new.modifier = composite.modifier
+    new.comment = composite.comment
+    return new
+
+
+def _primitive_convexity(obj: Object) -> int:
+    """Estimates the convexity of a primitive, which is the maximum number of times a ray can enter it."""
+    if isinstance(obj, (Polyhedron, Polygon)):
+        return obj.convexity or 2
+    if isinstance(obj, Import):
+        return obj.arguments.get("convexity") or 2
+    if isinstance(obj, (Text, Composite)):
+        # Parts with a custom rendering are considered as a single object
+        return 2
+    return 1
+
+
+def wrap_renders(
+    obj: MuSCAD,
+    report: Counter[str] | None = None,
+    *,
+    min_score: float = DEFAULT_MIN_SCORE,
+    max_convexity: int = DEFAULT_MAX_CONVEXITY,
+) -> Object:
+    """Returns a simplified copy of an object, with its expensive subtrees wrapped in `render()`.
+
+    :param obj: the object to wrap
+    :param report: if provided, the number of wrapped nodes, by object name, is added to this Counter
+    :param min_score: the estimated cost from which a subtree is wrapped, see `estimate_cost()`
+    :param max_convexity: the maximum convexity of render() nodes
+    :return: an object which renders the same geometry
+
+    """
+    wrapper = RenderWrapper(min_score=min_score, max_convexity=max_convexity)
+    wrapped = wrapper.wrap(obj)
+    if report is not None:
+        report.update(wrapper.wrapped)
+    return wrapped
@@ -0,0 +1,231 @@
+"""Run OpenSCAD to export .scad files, synchronously or from an asyncio event loop.
+
+An `OpenSCADRunner` holds the OpenSCAD configuration: the executable to run, extra command line flags like
+`--backend=manifold` or `--export-format=binstl`, a timeout, the maximum number of concurrent processes for
+asynchronous exports, and the STL cache to use. OpenSCAD output is captured: statistics like the rendering time and the
+number of vertices are parsed into an `ExportResult`, and the output is part of the error raised when an export fails.
+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import subprocess
+import time
+from pathlib import Path
+from typing import NamedTuple, Sequence
+
+from muscad.base import MuSCADError
+from muscad.cache import StlCache, scad_dependencies
+
+
+class OpenSCADError(MuSCADError):
+    """Raised when OpenSCAD fails to export a file, or does not finish in time."""
+
+    def __init__(self, message: str, *, returncode: int | None = None, stderr: str = "") -> None:
+        super().__init__(message)
+        self.returncode = returncode
+        self.stderr = stderr
+
+
+class ExportResult(NamedTuple):
+    """The result of an export, with statistics parsed from OpenSCAD output."""
+
+    path: Path
+    # the duration of the export, in seconds
+    wall_time: float = 0.0
+    # "openscad" when exported by OpenSCAD, "cache" when copied from the STL cache, or "mesh" when written directly
+    source: str = "openscad"
+    # the rendering time reported by OpenSCAD, in seconds
+    render_time: float | None = None
+    vertices: int | None = None
+    facets: int | None = None
+    # the number of entries in OpenSCAD geometry and CGAL caches
+    geometries_in_cache: int | None = None
+    cgal_polyhedrons_in_cache: int | None = None
+    warnings: tuple[str, ...] = ()
+    output: str = ""
+
+    @property
+    def name(self) -> str:
+        return self.path.stem
+
+    @classmethod
+    def from_output(cls, path: str | Path, output: str, wall_time: float) -> ExportResult:
+        """Parses the output of an OpenSCAD export.
+
+        :param path: the path of the exported file
+        :param output: what OpenSCAD printed on stdout and stderr
+        :param wall_time: the duration of the export, in seconds
+        :return: an ExportResult
+
+        """
+        return cls(
+            Path(path),
+            wall_time=wall_time,
+            render_time=_render_time(output),
+            vertices=_count(r"^\s*Vertices:\s*(\d+)", output),
+            facets=_count(r"^\s*Facets:\s*(\d+)", output),
+            geometries_in_cache=_count(r"^Geometries in cache:\s*(\d+)", output),
+            cgal_polyhedrons_in_cache=_count(r"^CGAL Polyhedrons in cache:\s*(\d+)", output),
+            warnings=tuple(
+                line.strip() for line in output.splitlines() if line.lstrip().startswith(("WARNING:", "DEPRECATED:"))
+            ),
+            output=output,
+        )
+
+
+def _count(pattern: str, output: str) -> int | None:
+    match = re.search(pattern, output, re.MULTILINE)
+    return int(match.group(1)) if match else None
+
+
+def _render_time(output: str) -> float | None:
+    # "Total rendering time: 0:00:01.234" since OpenSCAD 2021, "0 hours, 0 minutes, 1 seconds" before
+    match = re.search(r"Total rendering time: (\d+):(\d+):(\d+(?:\.\d+)?)", output) or re.search(
+        r"Total rendering time: (\d+) hours?, (\d+) minutes?, (\d+(?:\.\d+)?) seconds?", output
+    )
+    if match is None:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+class OpenSCADRunner:
+    """Runs OpenSCAD with a given configuration."""
+
+    def __init__(
+        self,
+        openscad: str = "openscad",
+        flags: Sequence[str] = (),
+        *,
+        timeout: float | None = None,
+        jobs: int | None = None,
+        cache: StlCache | bool = True,
+    ) -> None:
+        """Initializes an OpenSCADRunner.
+
+        Asynchronous exports share a semaphore, which is bound to the event loop running the first export. A runner
+        must not be used from multiple event loops.
+
+        :param openscad: the OpenSCAD executable
+        :param flags: extra command line flags, like `["--backend=manifold"]`
+        :param timeout: the maximum duration of an export, in seconds, or None to wait forever
+        :param jobs: the maximum number of concurrent asynchronous exports, defaults to the number of CPUs
+        :param cache: the cache of STL files to use, True for the default one, or False to always run OpenSCAD
+
+        """
+        self.openscad = openscad
+        self.flags = list(flags)
+        self.timeout = timeout
+        self.jobs = jobs or os.cpu_count() or 1
+        self.cache = StlCache.resolve(cache)
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def command(self, scad_path: str | Path, stl_path: str | Path) -> list[str]:
+        """Returns the command line that exports a .scad file.
+
+        :param scad_path: the path of the .scad file
+        :param stl_path: the path of the exported file
+        :return: a list of arguments
+
+        """
+        return [self.openscad, *self.flags, "-o", str(stl_path), str(scad_path)]
+
+    def _cache_key(self, scad_path: str | Path) -> str | None:
+        if self.cache is None:
+            return None
+        dependencies = scad_dependencies(scad_path)
+        if dependencies is None:
+            # a referenced file is missing, so OpenSCAD is run to report it
+            return None
+        return self.cache.key(Path(scad_path).read_bytes(), self.flags, self.openscad, dependencies)
+
+    def _from_cache(self, key: str | None, stl_path: str | Path) -> bool:
+        return self.cache is not None and key is not None and self.cache.get(key, stl_path)
+
+    def _to_cache(self, key: str | None, stl_path: str | Path) -> None:
+        if self.cache is not None and key is not None:
+            self.cache.put(key, stl_path)
+
+    def _check(self, returncode: int | None, stderr: str) -> None:
+        if returncode != 0:
+            msg = f"OpenSCAD exited with code {returncode}: {stderr.strip()}"
+            raise OpenSCADError(msg, returncode=returncode, stderr=stderr)
+
+    def export(self, scad_path: str | Path, stl_path: str | Path) -> ExportResult:
+        """Exports a .scad file with OpenSCAD, and waits for it to finish.
+
+        :param scad_path: the path of the .scad file
+        :param stl_path: the path of the exported file
+        :return: the result of the export
+        :raises OpenSCADError: if OpenSCAD fails, or does not finish in time
+
+        """
+        start = time.perf_counter()
+        key = self._cache_key(scad_path)
+        if self._from_cache(key, stl_path):
+            return ExportResult(Path(stl_path), time.perf_counter() - start, source="cache")
+        try:
+            process = subprocess.run(
+                self.command(scad_path, stl_path), capture_output=True, text=True, timeout=self.timeout, check=False
+            )
+        except subprocess.TimeoutExpired as error:
+            msg = f"OpenSCAD did not finish within {self.timeout} seconds"
+            raise OpenSCADError(msg) from error
+        self._check(process.returncode, process.stderr)
+        self._to_cache(key, stl_path)
+        return ExportResult.from_output(stl_path, process.stdout + process.stderr, time.perf_counter() - start)
+
+    async def export_async(
+        self, scad_path: str | Path, stl_path: str | Path, *, timeout: float | None = None
+    ) -> ExportResult:
+        """Exports a .scad file with OpenSCAD, without blocking the event loop.
+
+        At most `jobs` OpenSCAD processes run at the same time, other exports wait for their turn. If the export is
+        cancelled, or times out, the OpenSCAD process is killed.
+
+        :param scad_path: the path of the .scad file
+        :param stl_path: the path of the exported file
+        :param timeout: the maximum duration of this export, in seconds, overriding the runner timeout
+        :return: the result of the export
+        :raises OpenSCADError: if OpenSCAD fails, or does not finish in time
+
+        """
+        if timeout is None:
+            timeout = self.timeout
+        start = time.perf_counter()
+        key = self._cache_key(scad_path)
+        if self._from_cache(key, stl_path):
+            return ExportResult(Path(stl_path), time.perf_counter() - start, source="cache")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.jobs)
+        async with self._semaphore:
+            # the time spent waiting for the semaphore is not part of the export duration
+            start = time.perf_counter()
+            process = await asyncio.create_subprocess_exec(
+                *self.command(scad_path, stl_path), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+            except asyncio.TimeoutError:
+                await _kill(process)
+                msg = f"OpenSCAD did not finish within {timeout} seconds"
+                raise OpenSCADError(msg) from None
+            except BaseException:
+                # the export was cancelled
+                await _kill(process)
+                raise
+        wall_time = time.perf_counter() - start
+        self._check(process.returncode, stderr.decode(errors="replace"))
+        self._to_cache(key, stl_path)
+        output = (stdout + stderr).decode(errors="replace")
+        return ExportResult.from_output(stl_path, output, wall_time)
+
+
+async def _kill(process: asyncio.subprocess.Process) -> None:
+    if process.returncode is None:
+        process.kill()
+        await process.wait()
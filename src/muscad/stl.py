@@ -0,0 +1,196 @@
+"""Export meshes to binary STL files, without going through OpenSCAD.
+
+OpenSCAD has to parse the rendered code and evaluate the whole tree with CGAL or Manifold to produce an STL, which is
+slow for objects that are already meshes. When an object tree only contains Polyhedrons, under affine
+transformations, its triangles are known in advance: `mesh_triangles()` bakes the transformations into the vertices,
+and `write_binary_stl()` streams them to a binary STL file.
+
+Trees which contain a CSG operation, like a Difference or a Union of overlapping objects, or primitives which are not
+meshes, like a Cube or a Cylinder, are not supported and must be exported with OpenSCAD.
+
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from muscad.base import ImplicitUnion, MuSCAD, Object, Transformation, Union
+from muscad.matrix import IDENTITY, Bounds, Matrix, multiply
+from muscad.optimizer import Optimizer
+from muscad.primitives import Polyhedron
+from muscad.transformations import Color, Render
+
+# a triangle, as its 3 vertices, each vertex being 3 coordinates
+Triangle = tuple[float, float, float, float, float, float, float, float, float]
+
+# normal, 3 vertices and attribute byte count, for each triangle
+_TRIANGLE = struct.Struct("<12fH")
+# the number of triangles packed together before being written to the file
+_CHUNK_SIZE = 4096
+
+
+def mesh_parts(obj: MuSCAD) -> list[tuple[Polyhedron, Matrix]] | None:
+    """Lists the Polyhedrons of an object tree, along with the affine matrix that applies to each of them.
+
+    Parts are replaced by the objects they render as, and redundant nodes are removed, before the tree is walked.
+    Unions are supported only when their children have disjoint bounds, since their meshes can then be concatenated
+    without any boolean operation.
+
+    :param obj: an object tree
+    :return: a list of (Polyhedron, matrix) tuples, or None if the tree contains anything else than Polyhedrons, affine
+        transformations and Unions of disjoint objects
+
+    """
+    return _mesh_parts(Optimizer().optimize(obj), IDENTITY)
+
+
+def _mesh_parts(obj: Object, matrix: Matrix) -> list[tuple[Polyhedron, Matrix]] | None:
+    if obj.modifier:
+        return None
+    if isinstance(obj, Polyhedron):
+        return [(obj, matrix)]
+    if isinstance(obj, (Color, Render)):
+        return _mesh_parts(obj.child, matrix)
+    if isinstance(obj, Transformation):
+        own_matrix = obj.affine_matrix()
+        if own_matrix is None:
+            return None
+        return _mesh_parts(obj.child, multiply(matrix, own_matrix))
+    if type(obj) in (Union, ImplicitUnion):
+        parts: list[tuple[Polyhedron, Matrix]] = []
+        bounds: list[Bounds] = []
+        for child in obj._iter_children():
+            child_parts = _mesh_parts(child, matrix)
+            if child_parts is None:
+                return None
+            parts.extend(child_parts)
+            bounds.append(child._bounds_under(matrix))
+        if not _disjoint(bounds):
+            return None
+        return parts
+    return None
+
+
+def _disjoint(bounds: list[Bounds]) -> bool:
+    """Checks that bounding boxes do not overlap, nor touch each other.
+
+    :param bounds: a list of (left, right, back, front, bottom, top) tuples
+    :return: True if no 2 bounding boxes overlap
+
+    """
+    ordered = sorted(bounds)
+    for index, (_, right, back, front, bottom, top) in enumerate(ordered):
+        for other in ordered[index + 1 :]:
+            if other[0] > right:
+                break
+            if other[2] <= front and back <= other[3] and other[4] <= top and bottom <= other[5]:
+                return False
+    return True
+
+
+def mesh_triangles(parts: Iterable[tuple[Polyhedron, Matrix]]) -> Iterator[Triangle]:
+    """Generates the triangles of transformed Polyhedrons, with vertices in counterclockwise order seen from outside.
+
+    Faces with more than 3 points are split into triangle fans, which assumes that they are convex.
+
+    :param parts: an iterable of (Polyhedron, matrix) tuples, as returned by `mesh_parts()`
+    :return: an iterator of triangles
+
+    """
+    for polyhedron, matrix in parts:
+        vertices = _transformed(polyhedron, matrix)
+        (a, b, c, _), (d, e, f, _), (g, h, i, _), _ = matrix
+        # OpenSCAD faces are clockwise seen from outside, while STL faces are counterclockwise,
+        # unless the transformation mirrors the mesh
+        mirrored = a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g) < 0
+        faces = polyhedron.faces
+        indexes = faces.indexes
+        for start, stop in zip(faces.offsets, faces.offsets[1:]):
+            first = 3 * indexes[start]
+            for position in range(start + 1, stop - 1):
+                second, third = 3 * indexes[position], 3 * indexes[position + 1]
+                if not mirrored:
+                    second, third = third, second
+                yield (
+                    *vertices[first : first + 3],
+                    *vertices[second : second + 3],
+                    *vertices[third : third + 3],
+                )  # type: ignore[misc]
+
+
+def _transformed(polyhedron: Polyhedron, matrix: Matrix) -> array[float]:
+    """Returns the coordinates of the points of a Polyhedron, transformed by an affine matrix."""
+    (a, b, c, x), (d, e, f, y), (g, h, i, z), _ = matrix
+    coordinates = polyhedron.points.coordinates
+    vertices = array("d", bytes(8 * len(coordinates)))
+    for position in range(0, len(coordinates), 3):
+        px, py, pz = coordinates[position : position + 3]
+        vertices[position] = a * px + b * py + c * pz + x
+        vertices[position + 1] = d * px + e * py + f * pz + y
+        vertices[position + 2] = g * px + h * py + i * pz + z
+    return vertices
+
+
+def _normal(triangle: Triangle) -> tuple[float, float, float]:
+    ax, ay, az, bx, by, bz, cx, cy, cz = triangle
+    ux, uy, uz = bx - ax, by - ay, bz - az
+    vx, vy, vz = cx - ax, cy - ay, cz - az
+    nx, ny, nz = uy * vz - uz * vy, uz * vx - ux * vz, ux * vy - uy * vx
+    length = math.sqrt(nx * nx + ny * ny + nz * nz)
+    if length == 0:
+        return 0, 0, 0
+    return nx / length, ny / length, nz / length
+
+
+def write_binary_stl(path: str | Path, triangles: Iterable[Triangle], header: bytes = b"MuSCAD") -> int:
+    """Streams triangles to a binary STL file.
+
+    Triangles are packed and written by chunks, and the triangle count is written at the end, so the whole mesh is
+    never held in memory.
+
+    :param path: the path of the STL file
+    :param triangles: an iterable of triangles, with vertices in counterclockwise order seen from outside
+    :param header: the content of the 80 bytes header, which must not start with `solid`
+    :return: the number of written triangles
+
+    """
+    if len(header) > 80 or header.lower().startswith(b"solid"):
+        msg = "the header must be at most 80 bytes long, and must not start with 'solid'"
+        raise ValueError(msg)
+    count = 0
+    with Path(path).open("wb") as stl_file:
+        stl_file.write(header.ljust(80, b"\0"))
+        stl_file.write(struct.pack("<I", 0))
+        chunk = []
+        for triangle in triangles:
+            chunk.append(_TRIANGLE.pack(*_normal(triangle), *triangle, 0))
+            if len(chunk) == _CHUNK_SIZE:
+                stl_file.write(b"".join(chunk))
+                count += len(chunk)
+                chunk.clear()
+        stl_file.write(b"".join(chunk))
+        count += len(chunk)
+        stl_file.seek(80)
+        stl_file.write(struct.pack("<I", count))
+    return count
+
+
+def export_mesh_stl(obj: MuSCAD, stl_path: str | Path) -> Path | None:
+    """Exports an object tree made of Polyhedrons to a binary STL file, without OpenSCAD.
+
+    :param obj: an object tree
+    :param stl_path: the path of the STL file
+    :return: the path of the STL file, or None if the tree is not only made of Polyhedrons and must be exported with
+        OpenSCAD, in which case no file is written
+
+    """
+    parts = mesh_parts(obj)
+    if parts is None:
+        return None
+    stl_path = Path(stl_path)
+    write_binary_stl(stl_path, mesh_triangles(parts))
+    return stl_path
@@ -3,9 +3,20 @@ from __future__ import annotations
 from typing import Any
 
 from muscad.helpers import normalize_angle
-
-from .base import Object, Transformation, Union
+from muscad.matrix import (
+    Bounds,
+    Matrix,
+    Row,
+    mirroring_matrix,
+    rotation_matrix,
+    rounded,
+    scaling_matrix,
+    translation_matrix,
+)
+
+from .base import Object, Transformation, Union, Writer
 from .point import Point3D
+from .resolution import current_resolution
 
 
 class Translation(Transformation, name="translate"):
@@ -30,6 +41,9 @@ class Translation(Transformation, name="translate"):
     def copy(self) -> Transformation:
         return self.__class__(x=self.x, y=self.y, z=self.z)
 
+    def affine_matrix(self) -> Matrix:
+        return translation_matrix(self.x, self.y, self.z)
+
     @property
     def left(self) -> float:
         return self.child.left + self.x
@@ -55,9 +69,6 @@ class Translation(Transformation, name="translate"):
         return self.child.top + self.z
 
 
-RIGHT_ANGLE_ROTATIONS_ONLY = NotImplementedError("Only simple 90° rotations are supported")
-
-
 class Rotation(Transformation, name="rotate"):
     """OpenSCAD rotate()."""
 
@@ -86,6 +97,9 @@ class Rotation(Transformation, name="rotate"):
     def copy(self) -> Transformation:
         return self.__class__(x=self.x, y=self.y, z=self.z)
 
+    def affine_matrix(self) -> Matrix:
+        return rotation_matrix(self.x, self.y, self.z)
+
     # TODO: make it work for all cases
     @property
     def center_x(self) -> float:
@@ -149,7 +163,7 @@ class Rotation(Transformation, name="rotate"):
         ]:
             return -self.child.top
 
-        raise RIGHT_ANGLE_ROTATIONS_ONLY
+        return self._affine_bounds()[0]
 
     @property
     def right(self) -> float:
@@ -195,7 +209,7 @@ class Rotation(Transformation, name="rotate"):
         ]:
             return -self.child.bottom
 
-        raise RIGHT_ANGLE_ROTATIONS_ONLY
+        return self._affine_bounds()[1]
 
     @property
     def back(self) -> float:
@@ -241,7 +255,7 @@ class Rotation(Transformation, name="rotate"):
         ]:
             return -self.child.top
 
-        raise RIGHT_ANGLE_ROTATIONS_ONLY
+        return self._affine_bounds()[2]
 
     @property
     def front(self) -> float:
@@ -287,7 +301,7 @@ class Rotation(Transformation, name="rotate"):
         ]:
             return -self.child.bottom
 
-        raise RIGHT_ANGLE_ROTATIONS_ONLY
+        return self._affine_bounds()[3]
 
     @property
     def bottom(self) -> float:
@@ -304,7 +318,7 @@ class Rotation(Transformation, name="rotate"):
         if (self.x == 90 and self.y == 180) or (self.x == 270 and self.y == 0):
             return -self.child.front
 
-        raise RIGHT_ANGLE_ROTATIONS_ONLY
+        return self._affine_bounds()[4]
 
     @property
     def top(self) -> float:
@@ -321,7 +335,7 @@ class Rotation(Transformation, name="rotate"):
         if (self.x == 90 and self.y == 180) or (self.x == 270 and self.y == 0):
             return -self.child.back
 
-        raise RIGHT_ANGLE_ROTATIONS_ONLY
+        return self._affine_bounds()[5]
 
 
 class Scaling(Transformation, name="scale"):
@@ -334,6 +348,12 @@ class Scaling(Transformation, name="scale"):
     def _arguments(self) -> dict[str | None, Any]:
         return {"v": Point3D(self.x, self.y, self.z)}
 
+    def copy(self) -> Transformation:
+        return self.__class__(x=self.x, y=self.y, z=self.z)
+
+    def affine_matrix(self) -> Matrix:
+        return scaling_matrix(self.x, self.y, self.z)
+
     @property
     def left(self) -> float:
         return self.child.left * self.x
@@ -359,9 +379,6 @@ class Scaling(Transformation, name="scale"):
         return self.child.top * self.z
 
 
-MULTI_AXIS_MIRROR_VECTOR_NOT_SUPPORTED = NotImplementedError("Only single axis mirror vectors are supported")
-
-
 class Mirroring(Transformation, name="mirror"):
     def __init__(self, *, x: float = 0, y: float = 0, z: float = 0):
         super().__init__()
@@ -377,7 +394,7 @@ class Mirroring(Transformation, name="mirror"):
         if self.x:
             if not self.y and not self.z:
                 return -self.child.right
-            raise MULTI_AXIS_MIRROR_VECTOR_NOT_SUPPORTED  # pragma: no cover
+            return self._affine_bounds()[0]
         return self.child.left
 
     @property
@@ -385,7 +402,7 @@ class Mirroring(Transformation, name="mirror"):
         if self.x:
             if not self.y and not self.z:
                 return -self.child.left
-            raise MULTI_AXIS_MIRROR_VECTOR_NOT_SUPPORTED  # pragma: no cover
+            return self._affine_bounds()[1]
         return self.child.right
 
     @property
@@ -393,7 +410,7 @@ class Mirroring(Transformation, name="mirror"):
         if self.y:
             if not self.x and not self.z:
                 return -self.child.back
-            raise MULTI_AXIS_MIRROR_VECTOR_NOT_SUPPORTED  # pragma: no cover
+            return self._affine_bounds()[3]
         return self.child.front
 
     @property
@@ -401,7 +418,7 @@ class Mirroring(Transformation, name="mirror"):
         if self.y:
             if not self.x and not self.z:
                 return -self.child.front
-            raise MULTI_AXIS_MIRROR_VECTOR_NOT_SUPPORTED  # pragma: no cover
+            return self._affine_bounds()[2]
         return self.child.back
 
     @property
@@ -409,7 +426,7 @@ class Mirroring(Transformation, name="mirror"):
         if self.z:
             if not self.x and not self.y:
                 return -self.child.bottom
-            raise MULTI_AXIS_MIRROR_VECTOR_NOT_SUPPORTED  # pragma: no cover
+            return self._affine_bounds()[5]
         return self.child.top
 
     @property
@@ -417,27 +434,54 @@ class Mirroring(Transformation, name="mirror"):
         if self.z:
             if not self.x and not self.y:
                 return -self.child.top
-            raise MULTI_AXIS_MIRROR_VECTOR_NOT_SUPPORTED  # pragma: no cover
+            return self._affine_bounds()[4]
         return self.child.bottom
 
     def copy(self) -> Transformation:
         return self.__class__(x=self.x, y=self.y, z=self.z)
 
+    def affine_matrix(self) -> Matrix:
+        return mirroring_matrix(self.x, self.y, self.z)
+
 
 class Multmatrix(Transformation):
-    def __init__(
-        self,
-        matrix: tuple[
-            tuple[float, float, float, float],
-            tuple[float, float, float, float],
-            tuple[float, float, float, float],
-        ],
-    ):
+    def __init__(self, matrix: tuple[Row, Row, Row] | Matrix):
         super().__init__()
         self.matrix = matrix
 
     def _arguments(self) -> dict[str | None, Any]:
-        return {"m": self.matrix}
+        return {"m": rounded(self.matrix)}
+
+    def copy(self) -> Transformation:
+        return self.__class__(self.matrix)
+
+    def affine_matrix(self) -> Matrix:
+        first, second, third, *_ = self.matrix
+        return first, second, third, (0, 0, 0, 1)
+
+    @property
+    def left(self) -> float:
+        return self._affine_bounds()[0]
+
+    @property
+    def right(self) -> float:
+        return self._affine_bounds()[1]
+
+    @property
+    def back(self) -> float:
+        return self._affine_bounds()[2]
+
+    @property
+    def front(self) -> float:
+        return self._affine_bounds()[3]
+
+    @property
+    def bottom(self) -> float:
+        return self._affine_bounds()[4]
+
+    @property
+    def top(self) -> float:
+        return self._affine_bounds()[5]
 
 
 class Color(Transformation):
@@ -452,6 +496,9 @@ class Color(Transformation):
     def copy(self) -> Transformation:
         return self.__class__(self.colorname, self.alpha)
 
+    def _bounds_under(self, matrix: Matrix) -> Bounds:
+        return self.child._bounds_under(matrix)
+
 
 class Offset(Transformation):
     def __init__(
@@ -554,9 +601,15 @@ class LinearExtrusion(Transformation, name="linear_extrude"):
         self._twist = twist
         self._slices = slices
         self._scale = scale
-        if segments is None:
-            segments = int(twist * 3.14 / 0.4)
-        self._segments = segments
+        # None to use the current resolution
+        self._fixed_segments = segments
+
+    @property
+    def segments(self) -> int:
+        """The number of segments of a twisted extrusion, as given explicitly or by the current resolution."""
+        if self._fixed_segments is None:
+            return current_resolution().twist_slices(self._twist)
+        return self._fixed_segments
 
     def _arguments(self) -> dict[str | None, Any]:
         return {
@@ -611,15 +664,30 @@ class RotationalExtrusion(Transformation, name="rotate_extrude"):
         super().__init__()
         self.angle = angle
         self.convexity = convexity
-        if segments is None:
-            segments = int(angle / 3.14 * 0.4)
-        self.segments = segments
+        # None to use the current resolution
+        self._fixed_segments = segments
+
+    @property
+    def segments(self) -> int:
+        """The number of segments, as given explicitly or by the current resolution."""
+        if self._fixed_segments is None:
+            return current_resolution().rotation_segments(self.angle)
+        return self._fixed_segments
+
+    @segments.setter
+    def segments(self, segments: int | None) -> None:
+        self._fixed_segments = segments
 
     def _arguments(self) -> dict[str | None, Any]:
+        resolution = current_resolution()
+        if self._fixed_segments is None and resolution.fa_fs:
+            segments = {"$fa": resolution.segment_angle, "$fs": resolution.segment_length}
+        else:
+            segments = {"$fn": self.segments}
         return {
             "angle": self.angle,
             "convexity": self.convexity,
-            "$fn": self.segments,
+            **segments,
         }
 
     @property
@@ -669,5 +737,6 @@ class Slide(Transformation):
         self.y = y
         self.z = z
 
-    def render(self) -> str:
-        return Union(Hull(child, child.translate(x=self.x, y=self.y, z=self.z)) for child in self.child.walk()).render()
+    def _render_into(self, writer: Writer, depth: int) -> None:
+        hulls = Union(Hull(child, child.translate(x=self.x, y=self.y, z=self.z)) for child in self.child.walk())
+        hulls.render_into(writer, depth)
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from muscad import Circle, Hull, Object, Point2D, Polygon, Square, calc
+from array import array
+from math import pi
+from typing import Sequence
+
+from muscad import Circle, Hull, Object, Point2D, Polygon, Square, calc, cos, sin
 
 
 class Surface:
@@ -210,3 +214,90 @@ class Surface:
         return Square(radius, radius).align(back=0, left=0) - Square(chamfer_width, chamfer_width).z_rotate(45).align(
             center_x=radius, center_y=radius
         )
+
+    @classmethod
+    def tooth_strip(
+        cls,
+        path: Sequence[tuple[float, float]],
+        count: int,
+        pitch: float,
+        bottom: float,
+        start: float = 0,
+    ) -> Polygon:
+        """Repeats a tooth `count` times along the X axis, as a single Polygon.
+
+        The toothed side of the strip is made of the tooth path, repeated every `pitch`. Each tooth is cut at half a
+        pitch from its center, so that consecutive teeth join without overlapping. The other side of the strip is a
+        straight line at Y=`bottom`. Without any tooth, the strip is a rectangle as long as the tooth path.
+
+        :param path: the toothed side of one tooth, centered on X=0, as (x, y) points in increasing X order
+        :param count: the number of teeth
+        :param pitch: the distance between the centers of 2 consecutive teeth
+        :param bottom: the Y coordinate of the straight side
+        :param start: the X coordinate of the center of the first tooth
+        :return: a Polygon
+
+        """
+        coordinates = array("d")
+        if count == 0:
+            # the toothed side is flat
+            coordinates.extend((start + path[0][0], path[0][1], start + path[-1][0], path[-1][1]))
+        joined = False
+        for i in range(count):
+            tooth = _clip_path(path, -pitch / 2 if i > 0 else None, pitch / 2 if i < count - 1 else None)
+            if joined and tooth[0][0] == -pitch / 2:
+                # the first point of this tooth is the last point of the previous one
+                tooth = tooth[1:]
+            joined = tooth[-1][0] == pitch / 2
+            for x, y in tooth:
+                coordinates.extend((start + i * pitch + x, y))
+        coordinates.extend((coordinates[-2], bottom, coordinates[0], bottom))
+        return Polygon.from_arrays(coordinates)
+
+    @classmethod
+    def tooth_ring(cls, path: Sequence[tuple[float, float]], count: int, radius: float) -> Polygon:
+        """Repeats a tooth `count` times around a circle, as a single Polygon.
+
+        The tooth path is wrapped around the circle: X coordinates are lengths along the circle, and Y coordinates
+        are radial offsets from the circle, positive outwards. Each tooth is cut at half a pitch from its center.
+
+        :param path: one tooth, centered on X=0, as (x, y) points in increasing X order
+        :param count: the number of teeth
+        :param radius: the radius of the circle
+        :return: a Polygon
+
+        """
+        pitch = 2 * pi * radius / count
+        tooth = _clip_path(path, -pitch / 2, pitch / 2)
+        if tooth[0][0] == -pitch / 2 and tooth[-1][0] == pitch / 2:
+            # the last point of each tooth is the first point of the next one
+            tooth = tooth[:-1]
+        coordinates = array("d")
+        for i in range(count):
+            for x, y in tooth:
+                angle = (x + i * pitch) / radius * 180 / pi
+                coordinates.extend(((radius + y) * cos(angle), (radius + y) * sin(angle)))
+        return Polygon.from_arrays(coordinates)
+
+
+def _clip_path(path: Sequence[tuple[float, float]], low: float | None, high: float | None) -> list[tuple[float, float]]:
+    """Keeps the part of a path between 2 X coordinates, cutting the segments that cross them.
+
+    :param path: a path, as (x, y) points in increasing X order
+    :param low: the minimum X coordinate, or None for no minimum
+    :param high: the maximum X coordinate, or None for no maximum
+    :return: the clipped path
+
+    """
+    clipped: list[tuple[float, float]] = []
+    for (x1, y1), (x2, y2) in zip(path, path[1:]):
+        for bound in (low, high):
+            if bound is not None and min(x1, x2) < bound < max(x1, x2):
+                # this segment crosses the bound: cut it there
+                clipped.append((bound, y1 + (y2 - y1) * (bound - x1) / (x2 - x1)))
+        if (low is None or low <= x2) and (high is None or x2 <= high):
+            clipped.append((x2, y2))
+    x, y = path[0]
+    if (low is None or low <= x) and (high is None or x <= high):
+        clipped.insert(0, (x, y))
+    return clipped
@@ -2,35 +2,43 @@
 
 from __future__ import annotations
 
-from muscad import E, Part, Polygon, Union
+from typing import Sequence
+
+from muscad import E, Object, Part, Polygon, Union
+from muscad.utils.surface import Surface
 from muscad.utils.volume import Volume
 
+# the toothed side of a GT2 belt, for a single tooth
+GT2_2mm_tooth_path = [
+    (-1.017, 0),
+    (-0.747_183, 0),
+    (-0.648_009, 0.037_218),
+    (-0.598_311, 0.130_528),
+    (-0.578_605, 0.238_423),
+    (-0.547_291, 0.343_077),
+    (-0.504_797, 0.443_762),
+    (-0.451_556, 0.53975),
+    (-0.358_229, 0.636_924),
+    (-0.2484, 0.707_276),
+    (-0.127_259, 0.750_044),
+    (0, 0.76447),
+    (0.127_259, 0.750_044),
+    (0.2484, 0.707_276),
+    (0.358_229, 0.636_924),
+    (0.451_556, 0.53975),
+    (0.504_649, 0.443_762),
+    (0.547_158, 0.343_077),
+    (0.578_556, 0.238_423),
+    (0.598_311, 0.130_528),
+    (0.647_876, 0.037_218),
+    (0.747_183, 0),
+    (1.017, 0),
+]
+
 GT2_2mm_profile = Polygon(
     (0.747_183, -0.5),
     (1.017, -0.5),
-    (1.017, 0),
-    (0.747_183, 0),
-    (0.647_876, 0.037_218),
-    (0.598_311, 0.130_528),
-    (0.578_556, 0.238_423),
-    (0.547_158, 0.343_077),
-    (0.504_649, 0.443_762),
-    (0.451_556, 0.53975),
-    (0.358_229, 0.636_924),
-    (0.2484, 0.707_276),
-    (0.127_259, 0.750_044),
-    (0, 0.76447),
-    (-0.127_259, 0.750_044),
-    (-0.2484, 0.707_276),
-    (-0.358_229, 0.636_924),
-    (-0.451_556, 0.53975),
-    (-0.504_797, 0.443_762),
-    (-0.547_291, 0.343_077),
-    (-0.578_605, 0.238_423),
-    (-0.598_311, 0.130_528),
-    (-0.648_009, 0.037_218),
-    (-0.747_183, 0),
-    (-1.017, 0),
+    *reversed(GT2_2mm_tooth_path),
     (-1.017, -0.5),
     (-0.747_183, -0.5),
 )
@@ -39,14 +47,31 @@ GT2_2mm_profile = Polygon(
 class Belt(Part):
     def init(  # type: ignore[override]
         self,
-        profile: Polygon,
+        profile: Polygon | Sequence[tuple[float, float]],
         length: float,
         pitch: float,
         width: float = 6,
         T: float = 0.3,
+        bottom: float = -0.5,
     ) -> None:
+        """Builds a belt, with its teeth from right to left.
+
+        :param profile: either a Polygon, that is repeated for each tooth, or the path of the toothed side of a tooth,
+            that is repeated into a single Polygon with a flat back at Y=`bottom`
+        :param length: the length of the belt
+        :param pitch: the distance between 2 teeth
+        :param width: the width of the belt
+        :param T: the thickness of the tolerance behind the belt
+        :param bottom: the Y coordinate of the back of the belt, when `profile` is a path
+
+        """
         nb_tooth = int(length / pitch)
-        self.tooth = Union(profile.leftward(i * pitch) for i in range(nb_tooth)).z_linear_extrude(width, center_z=0)
+        teeth: Object
+        if isinstance(profile, Polygon):
+            teeth = Union(profile.leftward(i * pitch) for i in range(nb_tooth))
+        else:
+            teeth = Surface.tooth_strip(profile, nb_tooth, pitch, bottom, start=-max(nb_tooth - 1, 0) * pitch)
+        self.tooth = teeth.z_linear_extrude(width, center_z=0)
         self.tolerance = Volume(
             left=self.tooth.left,
             right=self.tooth.right,
@@ -59,7 +84,7 @@ class Belt(Part):
     @classmethod
     def GT2(cls, length: float, width: float = 6, T: float = 0.2) -> Belt:
         return cls(
-            profile=GT2_2mm_profile,
+            profile=GT2_2mm_tooth_path,
             length=length,
             pitch=2.032,
             width=width,
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from array import array
 from typing import Iterable, Literal
 
 from muscad import (
@@ -16,7 +17,8 @@ from muscad import (
     Polyhedron,
     Union,
 )
-from muscad.helpers import asin, atan, catheti, cos, degrees, hypotenuse, pi, sin, tan
+from muscad.helpers import asin, atan, atan2, catheti, cos, degrees, hypotenuse, pi, sin, tan
+from muscad.matrix import rotation_matrix, transform_point
 from muscad.point import Point2D, Point3D
 
 
@@ -38,6 +40,8 @@ class Gear(Part):
         backlash: float = 0,
         twist: float = 0,
         involute_facets: int | Literal["auto"] = "auto",
+        *,
+        single_polygon: bool = False,
     ) -> None:
         if diametral_pitch and not circular_pitch:
             circular_pitch = 180 / diametral_pitch
@@ -75,6 +79,7 @@ class Gear(Part):
             outer_radius=outer_radius,
             half_thick_angle=half_thick_angle,
             involute_facets=involute_facets,
+            single_polygon=single_polygon,
         ).linear_extrude(rim_thickness, convexity=10, twist=twist)
         if gear_thickness < rim_thickness:
             gear -= Cylinder(d=rim_radius * 2, h=rim_thickness - gear_thickness + E).align(bottom=gear_thickness)
@@ -125,7 +130,19 @@ class Gear(Part):
         outer_radius: float,
         half_thick_angle: float,
         involute_facets: int | Literal["auto"] = "auto",
+        *,
+        single_polygon: bool = False,
     ) -> Object:
+        if single_polygon:
+            return cls.gear_outline(
+                nb_teeth,
+                pitch_radius=pitch_radius,
+                root_radius=root_radius,
+                base_radius=base_radius,
+                outer_radius=outer_radius,
+                half_thick_angle=half_thick_angle,
+                involute_facets=involute_facets,
+            )
         return Circle(segments=nb_teeth * 2, d=root_radius * 2) + Union(
             cls.involute_gear_tooth(
                 pitch_radius=pitch_radius,
@@ -138,6 +155,56 @@ class Gear(Part):
             for i in range(1, nb_teeth + 1)
         )
 
+    @staticmethod
+    def gear_outline(
+        nb_teeth: int,
+        pitch_radius: float,
+        root_radius: float,
+        base_radius: float,
+        outer_radius: float,
+        half_thick_angle: float,
+        involute_facets: int | Literal["auto"] = "auto",
+    ) -> Polygon:
+        """Computes the outline of a gear as a single Polygon, without any 2D boolean operation.
+
+        The outline goes around the gear, following both involute flanks of each tooth, and the root circle between
+        teeth. It covers the same surface as the union of the root circle and the teeth built by `involute_gear_tooth`.
+
+        """
+        min_radius = max(base_radius, root_radius)
+        pitch_angle = Point2D.involute(base_radius, involute_intersect_angle(base_radius, pitch_radius)).angle()
+        center_angle = pitch_angle + half_thick_angle
+
+        start_angle = involute_intersect_angle(base_radius, min_radius)
+        stop_angle = involute_intersect_angle(base_radius, outer_radius)
+
+        if involute_facets == "auto":
+            involute_facets = int(base_radius * pi / 200) or 5
+
+        # polar coordinates of a tooth centered on the X axis, from the base of one flank to the base of the other
+        flank = [
+            Point2D.involute(
+                base_radius,
+                start_angle + (stop_angle - start_angle) * i / involute_facets,
+            ).z_rotate(center_angle)
+            for i in range(involute_facets + 1)
+        ]
+        radii = [hypotenuse(point.x, point.y) for point in flank]
+        angles = [abs(point.angle()) for point in flank]
+        tooth = [(radius, -angle) for radius, angle in zip(radii, angles)]
+        tooth += [(radius, angle) for radius, angle in zip(reversed(radii), reversed(angles))]
+        # between 2 teeth, the outline goes down to the root circle
+        gap = [(root_radius, 180 / nb_teeth)]
+        if min_radius > root_radius:
+            gap = [(root_radius, angles[0]), *gap, (root_radius, 360 / nb_teeth - angles[0])]
+
+        coordinates = array("d")
+        for i in range(nb_teeth):
+            offset = i * 360 / nb_teeth
+            for radius, angle in tooth + gap:
+                coordinates.extend((radius * cos(offset + angle), radius * sin(offset + angle)))
+        return Polygon.from_arrays(coordinates)
+
     @staticmethod
     def involute_gear_tooth(
         pitch_radius: float,
@@ -193,6 +260,8 @@ class BevelGear(Part):
         involute_facets: int | Literal["auto"] = "auto",
         finish: Literal["bevel_gear_flat", "bevel_gear_back_cone"] | None = None,
         nb_holes: int = 0,
+        *,
+        single_polyhedron: bool = False,
     ) -> None:
         outside_pitch_diameter = nb_teeth * outside_circular_pitch / 180
         outside_pitch_radius = outside_pitch_diameter / 2
@@ -245,45 +314,65 @@ class BevelGear(Part):
         # to select the portion of the gear that includes the full pitch face.
         bevel_gear_flat_height = pitch_apex - (cone_distance - face_width) * cos(pitch_angle)
 
-        base = Cylinder(
-            d=root_cone_full_radius * 2,
-            d2=0,
-            h=apex_to_apex,
-            segments=nb_teeth * 2,
-        ).align(bottom=pitch_apex - apex_to_apex).z_rotate(half_thick_angle) + Union(
-            self.involute_bevel_gear_tooth(
-                back_cone_radius=back_cone_radius,
-                root_radius=root_radius,
-                base_radius=base_radius,
-                outer_radius=outer_radius,
-                pitch_apex=pitch_apex,
-                cone_distance=cone_distance,
-                half_thick_angle=half_thick_angle,
-                involute_facets=involute_facets,
-            ).z_rotate(i * 360 / nb_teeth)
-            for i in range(1, nb_teeth + 1)
-        )
-        if finish == "bevel_gear_back_cone":
+        if single_polyhedron:
             self.add_child(
-                base
-                & Cylinder(
-                    d=back_cone_end_radius * 2,
-                    d2=back_cone_full_radius * 4,
-                    h=apex_to_apex + back_cone_descent,
-                    segments=nb_teeth * 2,
-                ).align(bottom=-back_cone_descent),
+                self.toothed_cone(
+                    nb_teeth,
+                    back_cone_radius=back_cone_radius,
+                    root_radius=root_radius,
+                    base_radius=base_radius,
+                    outer_radius=outer_radius,
+                    pitch_apex=pitch_apex,
+                    cone_distance=cone_distance,
+                    half_thick_angle=half_thick_angle,
+                    root_angle=root_angle,
+                    involute_facets=involute_facets,
+                    flat_height=bevel_gear_flat_height if finish == "bevel_gear_flat" else None,
+                    back_cone=(-back_cone_descent, back_cone_end_radius, apex_to_apex, back_cone_full_radius * 2),
+                    root_bottom=pitch_apex - apex_to_apex,
+                ),
                 comment="base",
             )
         else:
-            self.add_child(
-                base
-                & Cube(
-                    3 * outside_pitch_radius,
-                    3 * outside_pitch_radius,
-                    bevel_gear_flat_height,
-                ).align(center_x=0, center_y=0, bottom=0),
-                comment="base",
+            base = Cylinder(
+                d=root_cone_full_radius * 2,
+                d2=0,
+                h=apex_to_apex,
+                segments=nb_teeth * 2,
+            ).align(bottom=pitch_apex - apex_to_apex).z_rotate(half_thick_angle) + Union(
+                self.involute_bevel_gear_tooth(
+                    back_cone_radius=back_cone_radius,
+                    root_radius=root_radius,
+                    base_radius=base_radius,
+                    outer_radius=outer_radius,
+                    pitch_apex=pitch_apex,
+                    cone_distance=cone_distance,
+                    half_thick_angle=half_thick_angle,
+                    involute_facets=involute_facets,
+                ).z_rotate(i * 360 / nb_teeth)
+                for i in range(1, nb_teeth + 1)
             )
+            if finish == "bevel_gear_back_cone":
+                self.add_child(
+                    base
+                    & Cylinder(
+                        d=back_cone_end_radius * 2,
+                        d2=back_cone_full_radius * 4,
+                        h=apex_to_apex + back_cone_descent,
+                        segments=nb_teeth * 2,
+                    ).align(bottom=-back_cone_descent),
+                    comment="base",
+                )
+            else:
+                self.add_child(
+                    base
+                    & Cube(
+                        3 * outside_pitch_radius,
+                        3 * outside_pitch_radius,
+                        bevel_gear_flat_height,
+                    ).align(center_x=0, center_y=0, bottom=0),
+                    comment="base",
+                )
         if finish == "bevel_gear_back_cone":
             self.add_hole(
                 Cylinder(
@@ -330,6 +419,8 @@ class BevelGear(Part):
         outside_circular_pitch: float = 1000,
         nb_holes1: int = 0,
         nb_holes2: int = 0,
+        *,
+        single_polyhedron: bool = False,
     ) -> tuple[Object, Object]:
         outside_pitch_radius1 = nb_tooth1 * outside_circular_pitch / 360
         outside_pitch_radius2 = nb_tooth2 * outside_circular_pitch / 360
@@ -350,6 +441,7 @@ class BevelGear(Part):
                 pressure_angle=30,
                 outside_circular_pitch=outside_circular_pitch,
                 nb_holes=nb_holes1,
+                single_polyhedron=single_polyhedron,
             )
             .up(20)
             .z_rotate(90),
@@ -359,6 +451,7 @@ class BevelGear(Part):
                 pressure_angle=30,
                 outside_circular_pitch=outside_circular_pitch,
                 nb_holes=nb_holes2,
+                single_polyhedron=single_polyhedron,
             )
             .down(pitch_apex2)
             .y_rotate(-pitch_angle1 - pitch_angle2)
@@ -366,6 +459,170 @@ class BevelGear(Part):
             .z_rotate(90),
         )
 
+    @staticmethod
+    def toothed_cone(
+        nb_teeth: int,
+        back_cone_radius: float,
+        root_radius: float,
+        base_radius: float,
+        outer_radius: float,
+        pitch_apex: float,
+        cone_distance: float,
+        half_thick_angle: float,
+        root_angle: float,
+        involute_facets: int | Literal["auto"] = "auto",
+        *,
+        flat_height: float | None = None,
+        back_cone: tuple[float, float, float, float] | None = None,
+        root_bottom: float | None = None,
+    ) -> Polyhedron:
+        """Computes the toothed part of a bevel gear as a single Polyhedron, without any boolean operation.
+
+        The teeth and the root cone are a cone whose apex is the pitch apex. Its outline follows both involute flanks of
+        each tooth, as built by `involute_bevel_gear_tooth`, and the root cone between teeth. Each generator line of
+        that cone is cut by the finish: either between z=0 and `flat_height`, or by the back cone.
+
+        :param flat_height: for the flat finish, the height of the gear
+        :param back_cone: for the back cone finish, the back cone as (bottom z, bottom radius, top z, top radius)
+        :param root_bottom: for the back cone finish, the height where the root cone ends, between teeth
+        :return: a Polyhedron
+
+        """
+        min_radius = max(base_radius * 2, root_radius * 2)
+        pitch_angle = Point2D.involute(
+            base_radius * 2,
+            involute_intersect_angle(base_radius * 2, back_cone_radius * 2),
+        ).angle()
+        center_angle = pitch_angle + half_thick_angle
+        start_angle = involute_intersect_angle(base_radius * 2, min_radius)
+        stop_angle = involute_intersect_angle(base_radius * 2, outer_radius * 2)
+
+        if involute_facets == "auto":
+            involute_facets = int(base_radius * pi / 200) or 5
+
+        # directions of the generator lines of a tooth centered on the X axis, from the pitch apex
+        rotation = rotation_matrix(y=-atan(back_cone_radius / cone_distance))
+        flank = []
+        for i in range(involute_facets + 1):
+            point = Point2D.involute(
+                base_radius * 2,
+                start_angle + (stop_angle - start_angle) * i / involute_facets,
+            ).z_rotate(center_angle)
+            flank.append(transform_point(rotation, point.x - back_cone_radius * 2, abs(point.y), -cone_distance * 2))
+        tooth = [(x, -y, z) for x, y, z in flank] + [(x, y, z) for x, y, z in reversed(flank)]
+
+        def root(angle: float) -> tuple[float, float, float]:
+            return sin(root_angle) * cos(angle), sin(root_angle) * sin(angle), -cos(root_angle)
+
+        def rotated(directions: list[tuple[float, float, float]], angle: float) -> list[tuple[float, float, float]]:
+            return [(x * cos(angle) - y * sin(angle), x * sin(angle) + y * cos(angle), z) for x, y, z in directions]
+
+        # between 2 teeth, the outline goes down to the root cone
+        base_angle = atan2(flank[0][1], flank[0][0])
+        gap = [root(180 / nb_teeth)]
+        if min_radius > root_radius * 2:
+            gap = [root(base_angle), *gap, root(360 / nb_teeth - base_angle)]
+
+        teeth = [rotated(tooth, i * 360 / nb_teeth) for i in range(nb_teeth)]
+        # the directions of the outline, and for each of them, True if it is on a tooth, or False if it is between 2
+        # teeth, where the root cone ends at `root_bottom` while the teeth go on
+        outline: list[tuple[tuple[float, float, float], bool]] = []
+        for i in range(nb_teeth):
+            gap_directions = rotated(gap, i * 360 / nb_teeth)
+            if min_radius <= root_radius * 2:
+                # the teeth start on the root cone, so the gap starts and ends with the directions of the teeth
+                gap_directions = [teeth[i][-1], *gap_directions, teeth[(i + 1) % nb_teeth][0]]
+            outline += [(direction, True) for direction in teeth[i]]
+            outline += [(direction, False) for direction in gap_directions]
+        directions = [direction for direction, _ in outline]
+
+        vertices = array("d")
+        indexes: dict[tuple[float, float, float], int] = {}
+        faces: list[list[int]] = []
+
+        def add_vertex(x: float, y: float, z: float) -> int:
+            # the same point is used once, so that faces between identical points can be dropped
+            index = indexes.get((x, y, z))
+            if index is None:
+                index = indexes[(x, y, z)] = len(vertices) // 3
+                vertices.extend((x, y, z))
+            return index
+
+        def add_face(*face: int) -> None:
+            if len(set(face)) == len(face):
+                faces.append(list(face))
+
+        def ring(factors: Iterable[float]) -> list[int]:
+            return [
+                add_vertex(x * factor, y * factor, pitch_apex + z * factor)
+                for (x, y, z), factor in zip(directions, factors)
+            ]
+
+        def add_band(upper: list[int], lower: list[int]) -> None:
+            for index in range(len(upper)):
+                following = (index + 1) % len(upper)
+                add_face(upper[index], upper[following], lower[following])
+                add_face(upper[index], lower[following], lower[index])
+
+        def add_cap(center: int, outline: list[int]) -> None:
+            for index in range(len(outline)):
+                add_face(center, outline[(index + 1) % len(outline)], outline[index])
+
+        if flat_height is not None:
+            top = ring((pitch_apex - flat_height) / -z for _, _, z in directions)
+            bottom = ring(pitch_apex / -z for _, _, z in directions)
+            add_cap(add_vertex(0, 0, flat_height), top)
+            add_band(top, bottom)
+            add_cap(add_vertex(0, 0, 0), list(reversed(bottom)))
+        elif back_cone is not None:
+            bottom_z, bottom_radius, top_z, top_radius = back_cone
+            slope = (top_radius - bottom_radius) / (top_z - bottom_z)
+            # the back cone ends either with a disk, or with a tip
+            floor = max(bottom_z, bottom_z - bottom_radius / slope)
+            # for shallow gears, the root cone ends above the back cone, and only the teeth go further down, until 0.1
+            # from the axis, like the teeth built by `involute_bevel_gear_tooth`
+            root_floor = floor if root_bottom is None else max(floor, root_bottom)
+            core = 0.1
+
+            def cut(direction: tuple[float, float, float], on_tooth: bool) -> list[tuple[float, float, float]]:  # noqa: FBT001
+                """Cuts the gear by the half plane containing the axis and a generator line.
+
+                :return: the points of the cut, from the point where the generator line goes out of the gear to the
+                    axis: where the cut turns from the side of the back cone to its bottom, then around the core
+
+                """
+                x, y, z = direction
+                angle = atan2(y, x)
+
+                def at(radius: float, height: float) -> tuple[float, float, float]:
+                    return radius * cos(angle), radius * sin(angle), height
+
+                height = floor if on_tooth else root_floor
+                floor_radius = bottom_radius + slope * (height - bottom_z)
+                side = (bottom_radius + slope * (pitch_apex - bottom_z)) / (hypotenuse(x, y) - slope * z)
+                down = (pitch_apex - height) / -z
+                if down <= side:
+                    # the generator line goes out through the bottom
+                    points = [(x * down, y * down, height)] * 2
+                else:
+                    points = [(x * side, y * side, pitch_apex + z * side), at(floor_radius, height)]
+                if root_floor == floor:
+                    return [*points, (0.0, 0.0, height)]
+                if on_tooth:
+                    core_height = max(bottom_z, bottom_z + (core - bottom_radius) / slope)
+                    return [*points, at(core, core_height), at(core, root_floor), (0.0, 0.0, root_floor)]
+                return [*points, at(core, root_floor), at(core, root_floor), (0.0, 0.0, root_floor)]
+
+            cuts = [cut(direction, on_tooth) for direction, on_tooth in outline]
+            rings = [[add_vertex(*points[level]) for points in cuts] for level in range(len(cuts[0]))]
+            add_cap(add_vertex(0, 0, pitch_apex), rings[0])
+            for upper, lower in zip(rings, rings[1:]):
+                add_band(upper, lower)
+        else:
+            msg = "either a flat_height or a back_cone is required"
+            raise ValueError(msg)
+        return Polyhedron.from_arrays(vertices, faces)
+
     @staticmethod
     def involute_bevel_gear_tooth(
         back_cone_radius: float,
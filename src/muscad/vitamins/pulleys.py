@@ -1,8 +1,13 @@
 """A port of https://www.thingiverse.com/thing:16627 in MuSCAD."""
 
+from __future__ import annotations
+
+from typing import Sequence
+
 from typing_extensions import Self
 
 from muscad import EE, Cube, Cylinder, Object, Part, Polygon, Union
+from muscad.utils.surface import Surface
 
 
 class Pulley(Part):
@@ -13,7 +18,20 @@ class Pulley(Part):
     ) -> None:
         self.body = Cylinder(d=outer_dia, h=height)
 
-    def tooth(self, profile: Polygon, count: int) -> Self:
+    def tooth(self, profile: Polygon | Sequence[tuple[float, float]], count: int) -> Self:
+        """Adds teeth around the body.
+
+        :param profile: either a Polygon, that is extruded and removed from the body for each tooth, or the path of
+            a tooth, as radial offsets from the body surface, that is repeated around the body into a single Polygon
+        :param count: the number of teeth
+        :return: this pulley, with teeth
+
+        """
+        if not isinstance(profile, Polygon):
+            self.body = Surface.tooth_ring(profile, count, self.body.width / 2).z_linear_extrude(
+                self.body.height, center_z=self.body.center_z
+            )
+            return self
         self._tooth = ~Union(
             profile.linear_extrude(height=self.body.height - EE)
             .align(back=self.body.back, center_z=self.body.center_z)
@@ -1,7 +1,8 @@
 # based on NUT JOB by Mike Mattala: https://www.thingiverse.com/thing:193647
 from __future__ import annotations
 
-from math import floor, pi
+from array import array
+from math import ceil, floor, pi
 
 from muscad import (
     Cylinder,
@@ -10,59 +11,18 @@ from muscad import (
     Polygon,
     Polyhedron,
     Tube,
-    Union,
     cos,
     sin,
 )
 
 
-class ThreadShape(Part):
-    def init(  # type: ignore[override]
-        self,
-        *,
-        length: float,
-        outer_diameter: float,
-        inner_diameter: float,
-        segments: int,
-        step: float,
-        top_countersink: bool = False,
-        bottom_countersink: bool = False,
-    ) -> None:
-        if not top_countersink and not bottom_countersink:
-            self.shape = Tube(height=length, diameter=outer_diameter, bottom=0, segments=segments)
-        else:
-            self.shape = Tube(bottom=step / 2, height=length - step + 0.005, diameter=outer_diameter, segments=segments)
-            self.top_countersink = (
-                Tube(
-                    bottom=self.shape.top,
-                    height=step / 2,
-                    diameter=outer_diameter,
-                    top_diameter=inner_diameter,
-                    segments=segments,
-                )
-                if top_countersink
-                else Tube(bottom=self.shape.top, height=step / 2, diameter=outer_diameter, segments=segments)
-            )
-            self.bottom_countersink = (
-                Tube(
-                    height=step / 2,
-                    top=self.shape.bottom,
-                    diameter=inner_diameter,
-                    top_diameter=outer_diameter,
-                    segments=segments,
-                )
-                if bottom_countersink
-                else Tube(height=step / 2, top=self.shape.bottom, diameter=outer_diameter, segments=segments)
-            )
-
-
 class ScrewThread(Part):
     def init(  # type: ignore[override]
         self,
         *,
         diameter: float,
         length: float,
-        step: int,
+        step: float,
         top_countersink: bool = False,
         bottom_countersink: bool = False,
         shape_degrees: float = 45,
@@ -70,76 +30,102 @@ class ScrewThread(Part):
     ) -> None:
         inner_diameter = diameter - step * cos(shape_degrees) / sin(shape_degrees)
         segments = floor(pi * diameter / resolution)
-        ttn = round(length / step + 1)
-        lfxy = 360 / segments
-        zt = step / segments
-        self.thread = ThreadShape(
-            length=length,
-            outer_diameter=diameter,
+        self.thread = thread_polyhedron(
+            diameter=diameter,
             inner_diameter=inner_diameter,
-            segments=segments,
+            length=length,
             step=step,
+            segments=segments,
             top_countersink=top_countersink,
             bottom_countersink=bottom_countersink,
-        ) & Union(
-            Polyhedron(
-                points=[
-                    [0, 0, (i - 1) * step],
-                    [
-                        inner_diameter / 2 * cos(j * lfxy),
-                        inner_diameter / 2 * sin(j * lfxy),
-                        i * step + j * zt - step,
-                    ],
-                    [
-                        inner_diameter / 2 * cos((j + 1) * lfxy),
-                        inner_diameter / 2 * sin((j + 1) * lfxy),
-                        i * step + (j + 1) * zt - step,
-                    ],
-                    [0, 0, i * step],
-                    [
-                        diameter / 2 * cos(j * lfxy),
-                        diameter / 2 * sin(j * lfxy),
-                        i * step + j * zt - step / 2,
-                    ],
-                    [
-                        diameter / 2 * cos((j + 1) * lfxy),
-                        diameter / 2 * sin((j + 1) * lfxy),
-                        i * step + (j + 1) * zt - step / 2,
-                    ],
-                    [
-                        inner_diameter / 2 * cos(j * lfxy),
-                        inner_diameter / 2 * sin(j * lfxy),
-                        i * step + j * zt,
-                    ],
-                    [
-                        inner_diameter / 2 * cos((j + 1) * lfxy),
-                        inner_diameter / 2 * sin((j + 1) * lfxy),
-                        i * step + (j + 1) * zt,
-                    ],
-                    [0, 0, (i + 1) * step],
-                ],
-                faces=[
-                    [1, 0, 3],
-                    [1, 3, 6],
-                    [6, 3, 8],
-                    [1, 6, 4],
-                    [0, 1, 2],
-                    [1, 4, 2],
-                    [2, 4, 5],
-                    [5, 4, 6],
-                    [5, 6, 7],
-                    [7, 6, 8],
-                    [7, 8, 3],
-                    [0, 2, 3],
-                    [3, 2, 7],
-                    [7, 2, 5],
-                ],
-            )
-            for i in range(ttn)
-            for j in range(segments)
         )
 
 
+def thread_polyhedron(
+    *,
+    diameter: float,
+    inner_diameter: float,
+    length: float,
+    step: float,
+    segments: int,
+    top_countersink: bool = False,
+    bottom_countersink: bool = False,
+) -> Polyhedron:
+    """Builds a threaded rod, from z=0 to z=length, as a single closed Polyhedron.
+
+    The thread surface is made of 2 helixes, one on the inner diameter and one on the outer diameter, with `segments`
+    points per turn. Both helixes start below z=0 and end above `length`: their points outside of that range are moved
+    on the bottom and top planes, where they merge into the outlines of the bottom and top faces. Countersinks limit the
+    radius of the thread close to the ends, so that they are part of the same mesh.
+
+    :param diameter: the outer diameter of the thread
+    :param inner_diameter: the inner diameter of the thread
+    :param length: the length of the thread
+    :param step: the thread step, as the height of a full turn
+    :param segments: the number of points per turn
+    :param top_countersink: if True, the top end of the thread is countersunk
+    :param bottom_countersink: if True, the bottom end of the thread is countersunk
+    :return: a Polyhedron
+
+    """
+    outer_radius = diameter / 2
+    inner_radius = inner_diameter / 2
+    depth = outer_radius - inner_radius
+    half_step = step / 2
+    cosines = [cos(index * 360 / segments) for index in range(segments)]
+    sines = [sin(index * 360 / segments) for index in range(segments)]
+    vertices = array("d")
+
+    def add_vertex(index: int, z: float) -> int:
+        # the thread profile goes from the inner radius to the outer radius and back on each step
+        phase = (z - index * step / segments) % step
+        radius = outer_radius - depth * abs(phase - half_step) / half_step
+        if bottom_countersink:
+            radius = min(radius, inner_radius + depth * z / half_step)
+        if top_countersink:
+            radius = min(radius, inner_radius + depth * (length - z) / half_step)
+        vertices.extend((radius * cosines[index], radius * sines[index], z))
+        return len(vertices) // 3 - 1
+
+    bottom = [add_vertex(index, 0) for index in range(segments)]
+    top = [add_vertex(index, length) for index in range(segments)]
+    bottom_center = len(vertices) // 3
+    top_center = bottom_center + 1
+    vertices.extend((0, 0, 0, 0, 0, length))
+
+    def helix(z: float, count: int) -> list[int]:
+        points = []
+        for position in range(count):
+            index = position % segments
+            height = z + position * step / segments
+            if height <= 0:
+                points.append(bottom[index])
+            elif height >= length:
+                points.append(top[index])
+            else:
+                points.append(add_vertex(index, height))
+        return points
+
+    # the first turn of the inner helix is below 0, and the last turn of the outer helix is above length
+    count = segments + 1 + ceil((length + half_step) * segments / step)
+    inner = helix(-step, count)
+    outer = helix(-half_step, count)
+
+    faces = []
+    quads = [(inner[i], inner[i + 1], outer[i + 1], outer[i]) for i in range(count - 1)]
+    quads += [
+        (outer[i], outer[i + 1], inner[i + segments + 1], inner[i + segments]) for i in range(count - segments - 1)
+    ]
+    for a, b, c, d in quads:
+        # points moved on the bottom or top planes make some triangles flat
+        faces += [triangle for triangle in ((a, c, b), (a, d, c)) if len(set(triangle)) == 3]
+    for index in range(segments):
+        following = (index + 1) % segments
+        faces.append([bottom_center, bottom[index], bottom[following]])
+        faces.append([top_center, top[following], top[index]])
+    return Polyhedron.from_arrays(vertices, faces)
+
+
 class HexScrew(Part):
     def init(  # type: ignore[override]
         self,
@@ -174,7 +160,7 @@ class HexScrew(Part):
 
         self.non_thread = non_thread.align(bottom=self.head.top)
         self.screw = ScrewThread(
-            outer_diameter=thread_outer_diameter,
+            diameter=thread_outer_diameter,
             step=thread_step,
             shape_degrees=step_shape_degrees,
             length=thread_length,
@@ -194,7 +180,7 @@ class HexHead(Part):
         y1 = height / 2
         y2 = height
 
-        self.head = Tube(bottom=0, height=height, d=d0, segments=6) & Polygon(
+        self.head = Tube(bottom=0, height=height, diameter=d0, segments=6) & Polygon(
             (x0, y0), (x1, y0), (x2, y1), (x1, y2), (x0, y2)
         ).z_rotational_extrude(bottom=0)
 
@@ -214,8 +200,9 @@ class HexNut(Part):
         self.countersinks = ~Tube(
             bottom=self.nut.bottom - 0.1,
             height=thread_step / 2,
-            d=thread_outer_diameter,
-            d2=thread_outer_diameter - (diameter / 2 + 0.1) * cos(step_shape_degrees) / sin(step_shape_degrees),
+            diameter=thread_outer_diameter,
+            top_diameter=thread_outer_diameter
+            - (diameter / 2 + 0.1) * cos(step_shape_degrees) / sin(step_shape_degrees),
         ).z_mirror(center=self.nut.center_z)
         self.bore = ~ScrewThread(
             diameter=thread_outer_diameter, length=height, step=thread_step, shape_degrees=step_shape_degrees
@@ -0,0 +1,211 @@
+"""Render the parts of a module again each time its source files change.
+
+`watch()` polls the source files of a module, and each time one of them changes, imports that module again in a fresh
+worker process, and renders the .scad files of its parts. Files are only written when their content changed, and they
+are replaced atomically, so OpenSCAD only reloads the parts that actually changed. The next worker process is started
+in advance, with MuSCAD already imported, so that a render starts as soon as a change is detected.
+
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import multiprocessing
+import signal
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from muscad.base import render_scad_file
+from muscad.build import discover_targets, load_module
+from muscad.resolution import use_resolution
+
+
+class WatchResult(NamedTuple):
+    """The outcome of rendering the parts of a module."""
+
+    # the .scad files that were written, because their content changed
+    written: list[Path]
+    # the number of .scad files that were already up to date
+    unchanged: int
+    # the source files to watch: the module, and the modules it imports from the same directory
+    sources: list[Path]
+    # the traceback of the error raised while importing or rendering the module, if any
+    error: str | None = None
+    # the duration of the render, in seconds
+    duration: float = 0.0
+
+
+def render_module(target: str, out_dir: str | Path, profile: str = "production") -> WatchResult:
+    """Imports a module, and renders the .scad file of each of its parts, when its content changed.
+
+    The parts are discovered like `muscad build` does, and rendered like `render_to_file()` does.
+
+    :param target: a module name, or the path to a Python file
+    :param out_dir: the directory of the .scad files
+    :param profile: the resolution profile
+    :return: a WatchResult
+
+    """
+    start = time.perf_counter()
+    out_dir = Path(out_dir)
+    written = []
+    unchanged = 0
+    error = None
+    origin = None
+    failed: list[Path] = []
+    try:
+        origin = _origin(target)
+        with use_resolution(profile):
+            module = load_module(target)
+            out_dir.mkdir(parents=True, exist_ok=True)
+            for name, obj in discover_targets(module).items():
+                path, changed = render_scad_file(obj, out_dir / name)
+                if changed:
+                    written.append(path)
+                else:
+                    unchanged += 1
+    except Exception as exception:
+        error = traceback.format_exc()
+        # a module that failed to import is not in sys.modules, but its file is in the traceback
+        failed = [Path(frame.filename) for frame in traceback.extract_tb(exception.__traceback__)]
+        if isinstance(exception, SyntaxError) and exception.filename:
+            failed.append(Path(exception.filename))
+    sources = [] if origin is None else _sources(origin, failed)
+    return WatchResult(written, unchanged, sources, error, time.perf_counter() - start)
+
+
+def _origin(target: str) -> Path | None:
+    """Finds the file of a module, without importing it."""
+    if target.endswith(".py"):
+        return Path(target).resolve()
+    spec = importlib.util.find_spec(target)
+    if spec is None or spec.origin is None:
+        return None
+    return Path(spec.origin).resolve()
+
+
+def _sources(origin: Path, failed: list[Path]) -> list[Path]:
+    """Lists the file of a module, and the files of its directory that were imported, or that failed to import."""
+    root = origin.parent
+    files = list(failed)
+    for name, module in list(sys.modules.items()):
+        file = getattr(module, "__file__", None)
+        # the main script of the watching process is also imported by worker processes
+        if file is not None and name not in ("__main__", "__mp_main__"):
+            files.append(Path(file))
+    sources = {origin}
+    for file in files:
+        path = file.resolve()
+        if root in path.parents and path.is_file():
+            sources.add(path)
+    return sorted(sources)
+
+
+def _warm_up() -> None:
+    """Initializes a new worker process, which imports this module, and so MuSCAD, before any render.
+
+    Interrupts are left to the watching process, which stops its workers.
+
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class Watcher:
+    """Renders the parts of a module in fresh worker processes, each time its source files change."""
+
+    def __init__(self, target: str, out_dir: str | Path | None = None, *, profile: str = "production") -> None:
+        """Initializes a Watcher.
+
+        :param target: a module name, or the path to a Python file
+        :param out_dir: the directory of the .scad files, defaults to the current directory
+        :param profile: the resolution profile
+
+        """
+        self.target = target
+        self.out_dir = Path.cwd() if out_dir is None else Path(out_dir)
+        self.profile = profile
+        self.sources: list[Path] = [Path(target).resolve()] if target.endswith(".py") else []
+        self._mtimes: dict[Path, int | None] = {}
+        # each worker process renders once, then a new one is started, so that modules are always imported again
+        self._pool = multiprocessing.get_context("spawn").Pool(1, initializer=_warm_up, maxtasksperchild=1)
+
+    def render(self) -> WatchResult:
+        """Renders the parts of the module in a fresh worker process.
+
+        :return: a WatchResult
+
+        """
+        result = self._pool.apply(render_module, (self.target, self.out_dir, self.profile))
+        if result.error is not None:
+            # the modules that failed to import are not listed, so the files watched so far are still watched
+            self.sources = sorted({*self.sources, *result.sources})
+        elif result.sources:
+            self.sources = result.sources
+        self._mtimes = self._stat()
+        return result
+
+    def changed(self) -> bool:
+        """Checks if a source file changed since the last render.
+
+        :return: True if a source file was modified, created or removed
+
+        """
+        return self._stat() != self._mtimes
+
+    def _stat(self) -> dict[Path, int | None]:
+        mtimes: dict[Path, int | None] = {}
+        for source in self.sources:
+            try:
+                mtimes[source] = source.stat().st_mtime_ns
+            except FileNotFoundError:
+                mtimes[source] = None
+        return mtimes
+
+    def close(self) -> None:
+        """Stops the worker process."""
+        self._pool.terminate()
+        self._pool.join()
+
+
+def watch(
+    target: str,
+    out_dir: str | Path | None = None,
+    *,
+    profile: str = "production",
+    interval: float = 0.2,
+    callback: Callable[[WatchResult], None] | None = None,
+) -> None:
+    """Renders the parts of a module, then renders them again each time its source files change, until interrupted.
+
+    :param target: a module name, or the path to a Python file
+    :param out_dir: the directory of the .scad files, defaults to the current directory
+    :param profile: the resolution profile
+    :param interval: the delay between 2 checks of the source files, in seconds
+    :param callback: called after each render, like `print_watch_result()`
+
+    """
+    watcher = Watcher(target, out_dir, profile=profile)
+    try:
+        while True:
+            result = watcher.render()
+            if callback is not None:
+                callback(result)
+            while not watcher.changed():
+                time.sleep(interval)
+    finally:
+        watcher.close()
+
+
+def print_watch_result(result: WatchResult) -> None:
+    """A callback for `watch()`, that prints a line for each render, and the errors."""
+    clock = time.strftime("%H:%M:%S")
+    if result.error is not None:
+        print(f"[{clock}] render failed:\n{result.error}", file=sys.stderr)  # noqa: T201
+        return
+    names = ", ".join(path.name for path in result.written) or "nothing"
+    print(  # noqa: T201
+        f"[{clock}] wrote {names}, {result.unchanged} unchanged, in {result.duration:.2f}s", file=sys.stderr
+    )
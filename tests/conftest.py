@@ -0,0 +1,63 @@
+"""Contains fixtures shared by all test cases."""
+
+from __future__ import annotations
+
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+# a stand-in for OpenSCAD, that logs its arguments, copies the .scad file to the output file, fails on .scad files
+# containing "sphere", hangs on .scad files containing "sleep", and prints statistics like OpenSCAD 2021
+FAKE_OPENSCAD = f"""#!{sys.executable}
+import sys
+import time
+from pathlib import Path
+
+with open(Path(__file__).with_suffix(".log"), "a") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+if sys.argv[1] == "--version":
+    sys.exit("OpenSCAD version 2021.01")
+output, source = sys.argv[-2], sys.argv[-1]
+scad = open(source).read()
+if "sphere" in scad:
+    sys.exit("ERROR: spheres are not supported")
+if "sleep" in scad:
+    time.sleep(10)
+open(output, "w").write(scad)
+print(\"\"\"Geometries in cache: 2
+Geometry cache size in bytes: 1024
+CGAL Polyhedrons in cache: 1
+CGAL cache size in bytes: 4096
+Total rendering time: 0:00:01.250
+Top level object is a 3D object:
+Simple:        yes
+Vertices:        8
+Halfedges:      24
+Edges:          12
+Halffacets:     12
+Facets:          6
+Volumes:         2
+\"\"\", file=sys.stderr)
+if "warning" in scad:
+    print("WARNING: Object may not be a valid 2-manifold", file=sys.stderr)
+"""
+
+
+@pytest.fixture
+def fake_openscad(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Puts a fake `openscad` executable in the PATH, and uses a temporary STL cache directory.
+
+    :return: the path of the fake executable, which logs its calls in `openscad.log` next to it
+
+    """
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    openscad = bin_dir / "openscad"
+    openscad.write_text(FAKE_OPENSCAD)
+    openscad.chmod(openscad.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", str(bin_dir), prepend=os.pathsep)
+    monkeypatch.setenv("MUSCAD_CACHE_DIR", str(tmp_path / "cache"))
+    return openscad
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import importlib.util
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from muscad import Cube, Cylinder, Part, Polyhedron, Text, Writer
+from muscad.backends import manifold
+from muscad.base import MuSCADError
+from muscad.part import MirroredPart, SymmetricPart
+
+requires_manifold3d = pytest.mark.skipif(
+    importlib.util.find_spec("manifold3d") is None, reason="manifold3d is not installed"
+)
+
+
+def test_write_3mf(tmp_path: Path) -> None:
+    path = tmp_path / "tetrahedron.3mf"
+    manifold.write_3mf(
+        path, [(0, 0, 0), (10, 0, 0), (0, 10, 0), (0, 0, 10)], [(0, 2, 1), (0, 1, 3), (0, 3, 2), (1, 2, 3)]
+    )
+    with zipfile.ZipFile(path) as archive:
+        assert set(archive.namelist()) == {"[Content_Types].xml", "_rels/.rels", "3D/3dmodel.model"}
+        model = archive.read("3D/3dmodel.model").decode()
+    assert '<vertex x="10" y="0" z="0"/>' in model
+    assert '<triangle v1="1" v2="2" v3="3"/>' in model
+    assert model.count("<triangle ") == 4
+
+
+@pytest.mark.skipif(importlib.util.find_spec("manifold3d") is not None, reason="manifold3d is installed")
+def test_missing_manifold3d() -> None:
+    with pytest.raises(ImportError, match="pip install muscad"):
+        manifold.evaluate(Cube(1, 1, 1))
+
+
+@requires_manifold3d
+def test_evaluate() -> None:
+    obj = (Cube(10, 10, 10) - Cylinder(h=12, d=4, segments=32)).up(5)
+    result = manifold.evaluate(obj)
+    assert result.volume() == pytest.approx(1000 - 10 * 4 * 3.1416, rel=0.01)
+    assert tuple(result.bounding_box()) == pytest.approx((-5, -5, 0, 5, 5, 10))
+
+    extruded = manifold.evaluate(Cube(4, 4, 4).x_mirror().scale(x=2) & Cube(2, 2, 2))
+    assert extruded.volume() == pytest.approx(8)
+
+    tetrahedron = Polyhedron(
+        [(0, 0, 0), (10, 0, 0), (0, 10, 0), (0, 0, 10)], [[0, 1, 2], [0, 3, 1], [0, 2, 3], [1, 3, 2]]
+    )
+    assert manifold.evaluate(tetrahedron).volume() == pytest.approx(1000 / 6)
+
+
+class Bracket(MirroredPart, x=True):
+    arm = Cube(2, 4, 6).align(left=1)
+
+
+class Plate(SymmetricPart, y=True):
+    side = Cube(4, 2, 1).align(back=1)
+
+
+@requires_manifold3d
+def test_evaluate_mirrored_parts() -> None:
+    # the optimizer expands those parts into their mirrored children, like they are rendered for OpenSCAD
+    assert tuple(manifold.evaluate(Bracket()).bounding_box()) == pytest.approx((-3, -2, -3, -1, 2, 3))
+    plate = manifold.evaluate(Plate())
+    assert plate.volume() == pytest.approx(16)
+    assert tuple(plate.bounding_box()) == pytest.approx((-2, -3, -0.5, 2, 3, 0.5))
+
+
+class Engraved(Part):
+    body = Cube(4, 4, 4)
+
+    def _render_into(self, writer: Writer, depth: int, *, postprocess: bool = True) -> None:
+        writer.write("engraved();\n")
+
+
+def test_unsupported_objects() -> None:
+    # unsupported objects are reported before manifold3d is needed
+    with pytest.raises(MuSCADError, match="does not support text"):
+        manifold.evaluate(Text("muscad").z_linear_extrude(1))
+    with pytest.raises(MuSCADError, match="does not support engraved, a part with a custom rendering"):
+        manifold.evaluate(Cube(1, 1, 1) + Engraved().up(5))
+
+
+@requires_manifold3d
+def test_export(tmp_path: Path) -> None:
+    obj = Cube(10, 10, 10) + Cube(10, 10, 10).rightward(5)
+    stl_path = manifold.export_stl(obj, tmp_path / "cubes.stl")
+    assert stl_path.stat().st_size > 84
+    path = manifold.export_3mf(obj, tmp_path / "cubes.3mf")
+    assert zipfile.is_zipfile(path)
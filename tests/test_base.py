@@ -1,8 +1,14 @@
 """Tests for all MuSCAD primitives."""
 
+import io
+import os
+from pathlib import Path
+
 import pytest
 
-from muscad import Circle, Cube, E, Echo, Object, Sphere, Square, Text, Union, calc
+import muscad
+from muscad import BoundingBox, Circle, Cube, E, Echo, Object, Sphere, Square, Text, Union, calc, render_scad_file
+from muscad.base import Writer
 from tests.utils import compare_str
 
 
@@ -269,3 +275,132 @@ def test_rotation() -> None:
     cube = Cube(10, 8, 6)
 
     assert cube.rotate(x=90, z=25, center_y=10)
+
+
+def test_render_into() -> None:
+    """Test for Object.render_into(), which streams the indented code into a file-like object."""
+    cube = Cube(10, 10, 10).debug()
+    cube.comment = "a cube\nwith 2 lines of comments"
+    obj = (cube + Sphere(d=4).up(5)) - Text("a\nb").linear_extrude(1)
+
+    expected = """\
+difference() {
+  union() {
+    // a cube
+    // with 2 lines of comments
+    #cube(size=[10, 10, 10], center=true);
+    translate(v=[0, 0, 5])
+    sphere(d=4, $fn=31);
+  }
+  linear_extrude(height=1, center=false, convexity=10, twist=0, scale=1.0)
+  text(text="a
+  b", size=10);
+}"""
+    buffer = io.StringIO()
+    obj.render_into(buffer)
+    assert buffer.getvalue() == expected
+    assert obj.render() == expected
+
+    buffer = io.StringIO()
+    obj.render_into(buffer, depth=1)
+    assert buffer.getvalue() == expected.replace("\n", "\n  ")
+
+
+def test_render_only_subclass() -> None:
+    """Objects that only implement render() can still be nested in other objects."""
+
+    class Legacy(Object):
+        def render(self) -> str:
+            return "legacy() {\n  cube(1);\n}"
+
+    assert Union(Legacy(), Cube(1, 1, 1)).render() == """\
+union() {
+  legacy() {
+    cube(1);
+  }
+  cube(size=[1, 1, 1], center=true);
+}"""
+
+
+def test_render_primitive_subclass() -> None:
+    """Primitives with a custom rendering are not written by their parent, like other leaf primitives."""
+
+    class Marker(Cube):
+        def _render_into(self, writer: Writer, depth: int) -> None:
+            writer.write("marker();")
+
+    assert Cube._render_inline
+    assert not Marker._render_inline
+    expected = """\
+union() {
+  marker();
+  cube(size=[1, 1, 1], center=true);
+}"""
+    assert Union(Marker(1, 1, 1), Cube(1, 1, 1)).render() == expected
+    assert Marker(1, 1, 1).rotate(x=90).render() == "rotate(a=[90, 0, 0])\nmarker();"
+
+
+def test_bbox() -> None:
+    """Bounds are cached, and the cache is invalidated when the object or any of its children is modified."""
+    cube = Cube(2, 4, 6)
+    union = Union(cube.translate(x=1), Sphere(d=2))
+    assert union.bbox == BoundingBox(left=-1, right=2, back=-2, front=2, bottom=-3, top=3)
+    assert union.bbox.width == union.width == 3
+    assert union.bbox.center_x == union.center_x == 0.5
+    assert "_bounds_cache" in union.__dict__
+
+    cube._width = 4
+    assert union.bbox == BoundingBox(left=-1, right=3, back=-2, front=2, bottom=-3, top=3)
+    union.add_child(Cube(1, 1, 10))
+    assert (union.bottom, union.top) == (-5, 5)
+
+    class Shifted(Cube):
+        @property
+        def left(self) -> float:
+            return super().left - 1
+
+        @property
+        def right(self) -> float:
+            return super().left + self.width
+
+    shifted = Shifted(2, 2, 2)
+    assert (shifted.left, shifted.right) == (-2, 1)
+
+
+def test_render_scad_file(tmp_path: Path) -> None:
+    """Files are only written when their content changes."""
+    path, changed = render_scad_file(Cube(1, 1, 1), tmp_path / "cube")
+    assert (path, changed) == (tmp_path / "cube.scad", True)
+    assert path.read_text() == "cube(size=[1, 1, 1], center=true);"
+    os.utime(path, (0, 0))
+
+    assert render_scad_file(Cube(1, 1, 1), path) == (path, False)
+    assert path.stat().st_mtime == 0
+
+    assert render_scad_file(Cube(2, 1, 1), path) == (path, True)
+    assert path.read_text() == "cube(size=[2, 1, 1], center=true);"
+    assert render_scad_file(Cube(1, 1, 1), path, mode="at") == (path, True)
+    assert path.read_text().count("cube(") == 2
+    assert [file.name for file in tmp_path.iterdir()] == ["cube.scad"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="file permissions are POSIX specific")
+def test_render_scad_file_permissions(tmp_path: Path) -> None:
+    """Written files get the permissions given by the umask, or keep their permissions when they are replaced."""
+    umask = os.umask(0o022)
+    try:
+        path, _ = render_scad_file(Cube(1, 1, 1), tmp_path / "cube")
+        assert path.stat().st_mode & 0o777 == 0o644
+        path.chmod(0o640)
+        render_scad_file(Cube(2, 1, 1), path)
+        assert path.stat().st_mode & 0o777 == 0o640
+    finally:
+        os.umask(umask)
+
+
+def test_star_exports() -> None:
+    """The modules star imported by the `muscad` package only export their own public names."""
+    for module in (muscad.cost, muscad.export, muscad.modules, muscad.optimizer, muscad.renders, muscad.resolution):
+        assert all(hasattr(muscad, name) for name in module.__all__)
+    for name in ("json", "time", "copy", "Counter", "hashlib", "ContextVar", "ThreadPoolExecutor"):
+        assert not hasattr(muscad, name)
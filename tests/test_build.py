@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from muscad.build import MANIFEST_NAME, build, discover_targets, load_module
+from muscad.cli import main
+
+MODULE = """\
+from muscad import Cube, Cylinder, Object, Part
+
+
+class Bracket(Part):
+    plate = Cube(20, 20, 2)
+
+    def __stl__(self) -> Object:
+        return self.up(1)
+
+
+class Spacer(Part):
+    tube = Cylinder(h=5, d=8, segments=16)
+
+    def __stl__(self) -> Object:
+        return self
+
+
+class Assembly(Part):
+    bracket = Bracket()
+
+
+bracket_left = Bracket()
+assembly = Assembly()
+"""
+
+
+@pytest.fixture
+def module_path(tmp_path: Path) -> Path:
+    path = tmp_path / "printer.py"
+    path.write_text(MODULE)
+    return path
+
+
+def test_discover_targets(module_path: Path) -> None:
+    module = load_module(module_path)
+    targets = discover_targets(module)
+    assert list(targets) == ["bracket_left", "spacer"]
+    assert targets["bracket_left"] is module.bracket_left
+
+    module.__stl__ = [module.assembly]
+    assert discover_targets(module) == {"assembly": module.assembly}
+
+
+def test_build(module_path: Path, tmp_path: Path, fake_openscad: Path) -> None:
+    out_dir = tmp_path / "out"
+    targets = discover_targets(load_module(module_path))
+    result = build(targets, out_dir, jobs=2)
+    assert result.up_to_date == []
+    assert sorted(export.name for export in result.results) == ["bracket_left", "spacer"]
+    assert not result.failures
+    manifest = json.loads((out_dir / MANIFEST_NAME).read_text())
+    assert sorted(manifest["targets"]) == ["bracket_left", "spacer"]
+
+    # only the parts that changed, or whose STL file is missing, are exported again
+    targets["spacer"] = targets["spacer"].up(1)
+    result = build(targets, out_dir)
+    assert (result.up_to_date, [export.name for export in result.results]) == (["bracket_left"], ["spacer"])
+    (out_dir / "bracket_left.stl").unlink()
+    assert [export.name for export in build(targets, out_dir).results] == ["bracket_left"]
+    assert [export.name for export in build(targets, out_dir, force=True).results] == ["bracket_left", "spacer"]
+    assert build(targets, out_dir).up_to_date == ["bracket_left", "spacer"]
+
+
+def test_build_command(
+    module_path: Path, tmp_path: Path, fake_openscad: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    out_dir = tmp_path / "out"
+    assert main(["build", str(module_path), "--out-dir", str(out_dir), "--resolution", "preview"]) == 0
+    assert capsys.readouterr().out.endswith("2 parts: 2 exported, 0 up to date, 0 failed\n")
+    assert "$fn=16" in (out_dir / "spacer.scad").read_text()
+
+    assert main(["build", str(module_path), "-o", str(out_dir), "--resolution", "preview"]) == 0
+    assert capsys.readouterr().out == "2 parts: 0 exported, 2 up to date, 0 failed\n"
+
+    empty = tmp_path / "empty.py"
+    empty.write_text("from muscad import Cube\n\ncube = Cube(1, 1, 1)\n")
+    assert main(["build", str(empty)]) == 1
+    assert "no parts to export" in capsys.readouterr().err
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from muscad import Cube, Cylinder, Import
+from muscad.base import export_stl
+from muscad.cache import StlCache, default_cache_directory, scad_dependencies
+from muscad.export import export_many
+
+
+def exports(log: Path) -> list[str]:
+    """Returns the exports logged by the fake OpenSCAD."""
+    return [line for line in log.read_text().splitlines() if line.startswith("-o ")]
+
+
+def test_stl_cache(tmp_path: Path, fake_openscad: Path) -> None:
+    cache = StlCache(tmp_path / "cache", max_size=11)
+    key = cache.key(b"cube();")
+    assert key == cache.key(b"cube();")
+    assert key != cache.key(b"sphere();")
+    assert key != cache.key(b"cube();", flags=["--backend=manifold"])
+
+    stl_path = tmp_path / "part.stl"
+    assert not cache.get(key, stl_path)
+    stl_path.write_bytes(b"12345")
+    cache.put(key, stl_path)
+    stl_path.unlink()
+    assert cache.get(key, stl_path)
+    assert stl_path.read_bytes() == b"12345"
+
+    # the least recently used files are evicted first
+    other_key = cache.key(b"sphere();")
+    os.utime(cache.path(key), (0, 0))
+    cache.put(other_key, stl_path)
+    assert cache.path(key).exists()
+    os.utime(cache.path(key), (0, 0))
+    stl_path.write_bytes(b"123456")
+    cache.put(cache.key(b"cylinder();"), stl_path)
+    assert not cache.path(key).exists()
+    assert cache.path(other_key).exists()
+    assert list(cache.directory.glob("*/*.tmp")) == []
+
+
+def test_default_cache_directory(tmp_path: Path, fake_openscad: Path) -> None:
+    assert default_cache_directory() == tmp_path / "cache"
+
+
+def test_export_with_cache(tmp_path: Path, fake_openscad: Path) -> None:
+    log = fake_openscad.with_suffix(".log")
+    export_many([Cube(1, 1, 1), Cylinder(h=1, d=1)], out_dir=tmp_path / "first")
+    assert len(exports(log)) == 2
+
+    log.unlink()
+    results = export_many([Cube(1, 1, 1), Cylinder(h=1, d=2)], out_dir=tmp_path / "second")
+    assert exports(log) == [f"-o {tmp_path / 'second' / 'cylinder.stl'} {tmp_path / 'second' / 'cylinder.scad'}"]
+    assert "cube(size=[1, 1, 1], center=true);" in results[0].path.read_text()
+    assert [result.source for result in results] == ["cache", "openscad"]
+
+    scad_path = Cube(1, 1, 1).render_to_file(tmp_path / "cube")
+    log.unlink()
+    assert export_stl(scad_path, tmp_path / "cube.stl", cache=True).exists()
+    # export_stl() only uses the cache when asked to
+    assert export_stl(scad_path, tmp_path / "uncached.stl").exists()
+    assert exports(log) == [f"-o {tmp_path / 'uncached.stl'} {scad_path}"]
+
+
+def test_scad_dependencies(tmp_path: Path) -> None:
+    (tmp_path / "library.scad").write_text('module part() { import("mesh.stl"); }')
+    (tmp_path / "mesh.stl").write_text("solid mesh")
+    scad_path = tmp_path / "part.scad"
+    scad_path.write_text("use <library.scad>\npart();")
+    assert scad_dependencies(scad_path) == [tmp_path / "library.scad", tmp_path / "mesh.stl"]
+
+    (tmp_path / "mesh.stl").unlink()
+    assert scad_dependencies(scad_path) is None
+
+
+def test_export_imported_file(tmp_path: Path, fake_openscad: Path) -> None:
+    """Changing an imported file exports the objects that import it again."""
+    log = fake_openscad.with_suffix(".log")
+    mesh = tmp_path / "mesh.stl"
+    mesh.write_text("solid first")
+    part = Import(str(mesh))
+    export_many([part], out_dir=tmp_path)
+    assert export_many([part], out_dir=tmp_path)[0].source == "cache"
+
+    mesh.write_text("solid second")
+    log.unlink()
+    assert export_many([part], out_dir=tmp_path)[0].source == "openscad"
+    assert len(exports(log)) == 1
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+import math
+
+import pytest
+
+from muscad import Cube, Cylinder, Hull, Minkowski, Part, Polyhedron, Sphere, estimate_cost
+
+
+def test_estimate_primitives() -> None:
+    assert estimate_cost(Cube(1, 2, 3)).facets == 6
+    cylinder = estimate_cost(Cylinder(h=1, d=2, segments=32))
+    assert (cylinder.facets, cylinder.segments, cylinder.score) == (34, 32, 34)
+    assert estimate_cost(Sphere(d=2, segments=8)).facets == 32
+    tetrahedron = Polyhedron([(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1)], [[0, 1, 2], [0, 3, 1], [0, 2, 3], [1, 3, 2]])
+    estimate = estimate_cost(tetrahedron.up(1))
+    assert (estimate.vertices, estimate.faces, estimate.score) == (4, 4, 4)
+    assert estimate.nodes == {"translate": 1, "polyhedron": 1}
+
+
+def test_estimate_operations() -> None:
+    difference = estimate_cost((Cube(10, 10, 10) - Cylinder(h=12, d=4, segments=32)).up(1))
+    assert difference.boolean_depth == 1
+    assert difference.facets == 40
+    assert difference.score == pytest.approx(6 + 34 + 40 * math.log2(41))
+    [inner] = difference.children
+    assert inner.name == "difference"
+    assert [child.name for child in inner.children] == ["cube", "cylinder"]
+
+    nested = estimate_cost((Cube(1, 1, 1) + Cube(2, 2, 2).up(3)) - Cube(1, 1, 1).debug().disable())
+    assert nested.nodes["cube"] == 2
+    assert nested.boolean_depth == 1
+
+    minkowski = estimate_cost(Minkowski(Cube(1, 1, 1), Sphere(d=1, segments=8)))
+    assert minkowski.minkowski == 1
+    assert minkowski.facets == 6 * 32
+    assert minkowski.score == 6 + 32 + 6 * 32
+
+    hull = estimate_cost(Hull(Sphere(d=2, segments=8), Sphere(d=2, segments=8).rightward(3)))
+    assert hull.hulls == 1
+    assert hull.segments == 16
+    assert hull.score > 64
+
+    slide = estimate_cost(Cube(1, 1, 1).slide(x=3))
+    assert slide.name == "slide"
+    assert slide.hulls == 1
+
+
+def test_estimate_part() -> None:
+    class Bracket(Part):
+        plate = Cube(20, 20, 2)
+        hole = ~Cylinder(h=3, d=3, segments=16)
+        screw = Cylinder(h=10, d=3, segments=16).misc()
+
+    estimate = estimate_cost(Bracket())
+    assert estimate.name == "Bracket"
+    assert estimate.nodes["cylinder"] == 2
+    assert estimate.boolean_depth == 2
+    report = estimate.report(max_depth=1).splitlines()
+    assert report[0].startswith("Bracket: score=")
+    assert report[1].startswith("  union: score=")
+    assert json.loads(json.dumps(estimate.to_dict(max_depth=1)))["children"][0]["name"] == "union"
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from muscad import Cube, Cylinder, Part, Polyhedron, Sphere
+from muscad.export import ExportError, export_many, render_project, report_json, report_table
+from muscad.runner import ExportResult
+
+
+def test_export_many(tmp_path: Path, fake_openscad: Path) -> None:
+    out_dir = tmp_path / "out"
+    tetrahedron = Polyhedron([(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1)], [[0, 1, 2], [0, 3, 1], [0, 2, 3], [1, 3, 2]])
+    progress = []
+    results = export_many(
+        [Cube(1, 2, 3), Cylinder(h=1, d=2), tetrahedron],
+        jobs=2,
+        out_dir=out_dir,
+        progress=lambda done, total, name, result: progress.append((done, total, name)),
+    )
+    assert [result.path for result in results] == [
+        out_dir / "cube.stl",
+        out_dir / "cylinder.stl",
+        out_dir / "polyhedron.stl",
+    ]
+    assert [result.source for result in results] == ["openscad", "openscad", "mesh"]
+    assert "cube(size=[1, 2, 3], center=true);" in results[0].path.read_text()
+    assert results[2].path.read_bytes()[80:84] == b"\x04\x00\x00\x00"
+    # meshes are written directly, before OpenSCAD exports are finished
+    assert progress[0] == (1, 3, "polyhedron")
+    assert [done for done, _, _ in progress[1:]] == [2, 3]
+    assert {name for _, _, name in progress[1:]} == {"cube", "cylinder"}
+
+    with pytest.raises(ValueError, match="multiple objects are named 'cube'"):
+        export_many([Cube(1, 1, 1), Cube(2, 2, 2)], out_dir=out_dir)
+
+
+def test_export_many_failures(tmp_path: Path, fake_openscad: Path) -> None:
+    with pytest.raises(ExportError, match="1 objects could not be exported: ball") as error:
+        export_many({"ball": Sphere(d=2), "box": Cube(1, 1, 1)}, jobs=2, out_dir=tmp_path)
+    assert "spheres are not supported" in str(error.value.failures["ball"])
+    assert [result.name for result in error.value.results] == ["box"]
+    assert (tmp_path / "box.stl").exists()
+
+
+def test_report(tmp_path: Path, fake_openscad: Path) -> None:
+    warned = Cube(1, 1, 1)
+    warned.comment = "warning"
+    results = export_many({"box": Cube(1, 1, 1), "warned": warned}, out_dir=tmp_path, cache=False)
+    results.append(ExportResult(tmp_path / "slow.stl", wall_time=100, source="cache"))
+    table = report_table(results).splitlines()
+    assert table[0].split() == ["name", "source", "wall", "(s)", "render", "(s)", "vertices", "facets", "warnings"]
+    assert table[2].split() == ["slow", "cache", "100.00", "-", "-", "-", "0"]
+    warned_row = next(line.split() for line in table if line.startswith("warned"))
+    assert warned_row[1:2] + warned_row[3:] == ["openscad", "1.25", "8", "6", "1"]
+    assert table[-1].split()[0] == "total"
+
+    report = json.loads(report_json(results))
+    assert report[0]["name"] == "slow"
+    item = next(item for item in report if item["name"] == "warned")
+    assert item["render_time"] == 1.25
+    assert item["vertices"] == 8
+    assert item["facets"] == 6
+    assert item["geometries_in_cache"] == 2
+    assert item["cgal_polyhedrons_in_cache"] == 1
+    assert item["warnings"] == ["WARNING: Object may not be a valid 2-manifold"]
+
+
+def test_render_project(tmp_path: Path) -> None:
+    class Bolt(Part):
+        thread = Cylinder(d=3, h=10)
+        head = Cylinder(d=5.5, h=3).up(5)
+
+    class Bracket(Part):
+        plate = Cube(40, 20, 4)
+        bolt = ~Bolt().leftward(10)
+
+    class Clamp(Part):
+        body = Cube(20, 20, 10)
+        bolt = ~Bolt().up(2)
+
+    written = render_project({"bracket": Bracket(), "clamp": Clamp(), "spacer": Cube(5, 5, 5)}, tmp_path)
+    library, bracket, clamp, spacer = written
+    assert list(written.values()) == [True, True, True, True]
+    assert library == tmp_path / "library.scad"
+    name = library.read_text().split("module ", 1)[1].split("()", 1)[0]
+    assert library.read_text().count("module ") == 1
+    assert library.read_text().count("cylinder(") == 2
+    assert bracket.read_text().startswith("use <library.scad>\n\ndifference() {\n")
+    assert f"{name}();" in bracket.read_text()
+    assert f"{name}();" in clamp.read_text()
+    assert spacer.read_text() == "cube(size=[5, 5, 5], center=true);"
+
+    # only the files that changed are written again
+    written = render_project({"bracket": Bracket(), "clamp": Clamp(), "spacer": Cube(6, 6, 6)}, tmp_path)
+    assert list(written.values()) == [False, False, False, True]
+
+    with pytest.raises(ValueError, match="an object is named like the library"):
+        render_project({"library": Cube(1, 1, 1)}, tmp_path)
@@ -0,0 +1,50 @@
+"""Tests for rendering repeated subtrees as OpenSCAD modules."""
+
+from muscad import Cube, Cylinder, Part, Union, render_with_modules
+from muscad.modules import SubtreeDigests
+
+
+def test_subtree_digests() -> None:
+    """Structurally identical subtrees have the same digest, different ones don't."""
+    digests = SubtreeDigests()
+    assert digests.digest(Cube(1, 2, 3).leftward(4)) == digests.digest(Cube(1, 2, 3).leftward(4))
+    assert digests.digest(Cube(1, 2, 3)) != digests.digest(Cube(1, 2, 4))
+    commented = Cube(1, 2, 3)
+    commented.comment = "cube"
+    assert digests.digest(Cube(1, 2, 3)) != digests.digest(commented)
+
+
+def test_render_with_modules() -> None:
+    """Repeated subtrees are declared once and called where they are used, unique subtrees are inlined."""
+
+    class Bolt(Part):
+        thread = Cylinder(d=3, h=10)
+        head = Cylinder(d=5.5, h=3).up(5)
+
+    class Plate(Part):
+        plate = Cube(40, 20, 4)
+        left_bolt = ~Bolt().align(center_x=-10)
+        right_bolt = ~Bolt().align(center_x=10)
+
+    plate = Plate()
+    code = render_with_modules(plate)
+    name = code.split("module ", 1)[1].split("()", 1)[0]
+    assert code.count("module ") == 1
+    assert code.count(f"{name}();") == 2
+    assert code.count("cylinder(") == 2
+    assert code.count("cube(") == 1
+    assert code.endswith(
+        f"""difference() {{
+  // plate
+  cube(size=[40, 20, 4], center=true);
+  // left_bolt
+  translate(v=[-10.0, 0, 0])
+  {name}();
+  // right_bolt
+  translate(v=[10.0, 0, 0])
+  {name}();
+}}"""
+    )
+    # without repeated subtrees, the code is the same as without modules
+    cube = Union(Cube(1, 2, 3), Cube(3, 2, 1))
+    assert render_with_modules(cube) == cube.render()
@@ -0,0 +1,80 @@
+"""Tests for the tree optimizer."""
+
+from collections import Counter
+
+from muscad import Cube, Cylinder, Difference, Part, Rotation, Scaling, Sphere, Translation, Union, optimize
+
+
+def test_optimize_booleans() -> None:
+    """Nested booleans are flattened, and single-child booleans are replaced by their child."""
+    cube, sphere, cylinder = Cube(1, 1, 1), Sphere(d=1), Cylinder(d=1, h=1)
+    obj = Difference(Difference(cube, Union(sphere, Union())), Union(cylinder, Union(Cube(2, 2, 2), Sphere(d=2))))
+    report: Counter[str] = Counter()
+    assert (
+        optimize(obj, report).render()
+        == """difference() {
+  cube(size=[1, 1, 1], center=true);
+  sphere(d=1, $fn=7);
+  cylinder(h=1, d=1, $fn=7, center=true);
+  cube(size=[2, 2, 2], center=true);
+  sphere(d=2, $fn=15);
+}"""
+    )
+    assert report == Counter(union=4, difference=1)
+    # the original object is unchanged
+    assert len(obj.children) == 2
+    assert optimize(Difference(cube)).render() == cube.render()
+
+
+def test_optimize_transformations() -> None:
+    """Identity transformations are removed, and consecutive transformations are folded."""
+    cube = Cube(1, 1, 1)
+    report: Counter[str] = Counter()
+    obj = Translation(x=1)(Scaling(x=2, y=2, z=2)(Scaling(x=0.5, y=0.5, z=0.5)(Rotation()(cube.y_translate(2)))))
+    assert optimize(obj, report).render() == "translate(v=[1, 2, 0])\ncube(size=[1, 1, 1], center=true);"
+    assert report == Counter(scale=2, rotate=1, translate=1)
+    obj = Rotation(z=90)(Rotation(x=90)(cube))
+    assert optimize(obj).render() == obj.render()
+    obj = cube.x_mirror().x_mirror()
+    assert optimize(obj).render() == cube.render()
+
+
+def test_optimize_keeps_modifiers_and_comments() -> None:
+    """Nodes with a modifier are kept, and comments are moved to the node replacing a removed one."""
+
+    class Box(Part):
+        body = Cube(4, 4, 4)
+        hole = ~Union(Sphere(d=1), Translation(x=1)(Sphere(d=2)).debug())
+
+    assert (
+        optimize(Box()).render()
+        == """difference() {
+  // body
+  cube(size=[4, 4, 4], center=true);
+  // hole
+  sphere(d=1, $fn=7);
+  #translate(v=[1, 0, 0])
+  sphere(d=2, $fn=15);
+}"""
+    )
+    obj = Translation()(Cube(1, 1, 1))
+    obj.comment = "outer"
+    obj.child.comment = "inner"
+    assert optimize(obj).render() == "// outer\n// inner\ncube(size=[1, 1, 1], center=true);"
+
+
+def test_optimize_multmatrix() -> None:
+    """Chains of affine transformations are collapsed into a single Multmatrix."""
+    cube = Cube(1, 2, 3)
+    report: Counter[str] = Counter()
+    obj = cube.z_rotate(90).up(3).x_mirror().translate(x=1, y=2)
+    assert (
+        optimize(obj, report, multmatrix=True).render()
+        == "multmatrix(m=[[0, 1, 0, 1], [1, 0, 0, 2], [0, 0, 1, 3]])\ncube(size=[1, 2, 3], center=true);"
+    )
+    assert report == Counter(translate=2, mirror=1)
+    obj = cube.z_rotate(90).z_rotate(45).z_rotate(-135).up(1).down(1)
+    assert optimize(obj, multmatrix=True).render() == cube.render()
+    # non affine transformations are kept
+    obj = cube.up(1).color("red").up(2)
+    assert optimize(obj, multmatrix=True).render() == obj.render()
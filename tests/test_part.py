@@ -1,6 +1,9 @@
 """Tests for the Part class."""
 
-from muscad import Cube, Part, SymmetricPart
+import copy
+
+from muscad import Cube, Difference, Part, Sphere, SymmetricPart, Translation, Union
+from muscad.optimizer import _copy
 from tests.utils import compare_str
 
 
@@ -53,3 +56,83 @@ def test_symmetric_part() -> None:
   cube(size=[8, 10, 12], center=true);
 }""",
     )
+
+
+def test_render_cache() -> None:
+    """Rendering an unchanged Part reuses its cached code, and any change to a nested object invalidates it."""
+    cube = Cube(1, 1, 1)
+    translated = cube.up(1)
+    part = Part(translated, Cube(2, 2, 2).down(2))
+
+    rendered = part.render()
+    assert part.render() is rendered
+
+    cube.set_modifier("#")
+    assert "#cube(size=[1, 1, 1], center=true);" in part.render()
+
+    rendered = part.render()
+    cube.comment = "small cube"
+    assert part.render() == rendered.replace("  #cube", "  // small cube\n  #cube")
+
+    translated.combine(Translation(z=1)(cube))
+    assert "translate(v=[0, 0, 2])" in part.render()
+
+    part.add_child(Cube(3, 3, 3))
+    assert part.render().endswith("  cube(size=[3, 3, 3], center=true);\n}")
+
+    part.sphere = Sphere(d=2)
+    assert part.render().endswith("  // sphere\n  sphere(d=2, $fn=15);\n}")
+
+    # children assigned at once are registered too, while other attributes only invalidate the cache
+    cube = Cube(4, 4, 4)
+    part.children = [cube]
+    assert part.render() == "cube(size=[4, 4, 4], center=true);"
+    cube.set_modifier("%")
+    assert part.render() == "%cube(size=[4, 4, 4], center=true);"
+    cube.helper = Cube(5, 5, 5)
+    assert cube.helper._parents is None
+
+
+def test_copy_render_cache() -> None:
+    """Copies of an object are invalidated by changes to their own nested objects."""
+    union = Union(Cube(2, 2, 2), Cube(2, 2, 2).rightward(30))
+    part = Part(union)
+    assert union.right == 31
+    assert part.render()
+
+    copied = copy.deepcopy(union)
+    assert copied.right == 31
+    rendered = copied.render()
+    moved = copied.children[1]
+    moved.child._width = 4
+    moved.invalidate()
+    assert copied.right == 32
+    assert copied.render() == rendered.replace(
+        "cube(size=[2, 2, 2], center=true);\n}", "cube(size=[4, 2, 2], center=true);\n}"
+    )
+    # the original object is unchanged
+    assert union.right == 31
+
+    shallow = _copy(part)
+    assert shallow.render()
+    shallow.children[0].children[0].set_modifier("#")
+    assert shallow.render().count("#cube") == 1
+
+
+def test_nested_part_render_cache() -> None:
+    """A Part nested in a larger object is rendered once, and reused at any depth."""
+
+    class Inner(Part):
+        cube = Cube(1, 1, 1)
+
+    inner = Inner()
+    outer = Union(inner.up(2), Cube(2, 2, 2))
+    assert outer.render() == """\
+union() {
+  translate(v=[0, 0, 2])
+  // cube
+  cube(size=[1, 1, 1], center=true);
+  cube(size=[2, 2, 2], center=true);
+}"""
+    assert inner.render() == "// cube\ncube(size=[1, 1, 1], center=true);"
+    assert Difference(outer, Cube(1, 1, 1)).render().count("    // cube\n    cube(size=[1, 1, 1], center=true);") == 1
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from array import array
+
+import pytest
+
+from muscad import Point2D, Point3D, Polygon, Polyhedron
+from muscad.point import FaceArray, PointArray
+
+
+def test_point_array() -> None:
+    points = PointArray.from_points([Point3D(0, 0, 0), (1.5, 2, -3)], 3)
+    assert len(points) == 2
+    assert str(points) == "[[0, 0, 0], [1.5, 2, -3]]"
+    assert list(points.column(0)) == [0, 1.5]
+    assert points[-1].kwargs == {"x": 1.5, "y": 2, "z": -3}
+    assert str(PointArray.from_points(array("d", [0.123456, 1.0]), 2)) == "[[0.1235, 1.0]]"
+
+    with pytest.raises(ValueError, match="invalid point"):
+        PointArray.from_points([(1, 2)], 3)
+    with pytest.raises(ValueError, match="not a multiple of 3"):
+        PointArray.from_points(array("d", [1, 2]), 3)
+
+
+def test_face_array() -> None:
+    faces = FaceArray.from_faces([[0, 1, 2], [0, 2, 3, 1]])
+    assert len(faces) == 2
+    assert faces[1] == [0, 2, 3, 1]
+    assert str(faces) == "[[0, 1, 2], [0, 2, 3, 1]]"
+    assert list(faces) == [[0, 1, 2], [0, 2, 3, 1]]
+
+
+def test_polyhedron_from_arrays() -> None:
+    points = [(0.0, 0.0, 0.0), (10.0, 0.0, 0.0), (0.0, 10.0, 0.0), (0.0, 0.0, 10.5)]
+    faces = [[0, 1, 2], [0, 3, 1], [0, 2, 3], [1, 3, 2]]
+    vertices = array("d", [value for point in points for value in point])
+    polyhedron = Polyhedron.from_arrays(vertices, faces)
+    assert polyhedron.render() == Polyhedron(points=points, faces=faces).render()
+    assert "points=[[0, 0, 0], [10.0, 0, 0], [0, 10.0, 0], [0, 0, 10.5]]" in polyhedron.render()
+    assert polyhedron.bbox == (0, 10, 0, 10, 0, 10.5)
+
+    # a 2 dimensions buffer of triangles, like a NumPy array of shape (4, 3)
+    triangles = memoryview(array("q", [index for face in faces for index in face])).cast("B").cast("q", (4, 3))
+    assert Polyhedron.from_arrays(vertices, triangles).render() == polyhedron.render()
+
+
+def test_polygon_from_arrays() -> None:
+    polygon = Polygon.from_arrays(array("q", [0, 0, 10, 0, 0, 5]))
+    assert polygon.render() == Polygon(Point2D(0, 0), (10, 0), (0, 5)).render()
+    assert polygon.render() == "polygon(points=[[0, 0], [10, 0], [0, 5]]);"
+    assert (polygon.left, polygon.right, polygon.back, polygon.front) == (0, 10, 0, 5)
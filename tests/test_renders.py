@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from collections import Counter
+
+from muscad import Cube, Cylinder, Hull, Part, Sphere, Union, wrap_renders
+from muscad.transformations import Render
+
+
+def plate() -> Cube:
+    return Cube(50, 50, 5) - Union(*(Cylinder(h=6, d=3, segments=16).rightward(index * 5) for index in range(8)))
+
+
+def test_wrap_expensive_subtrees() -> None:
+    report: Counter[str] = Counter()
+    wrapped = wrap_renders(Union(plate(), Cube(10, 10, 10).up(20)), report, min_score=1200)
+    # the wrapped difference is cached by OpenSCAD, so it does not count towards the cost of the union
+    assert report == {"difference": 1}
+    assert wrapped.render().startswith("union() {\n  render(convexity=9)\n  difference() {\n    cube(")
+
+    assert "render(" not in wrap_renders(plate(), min_score=100_000).render()
+
+
+def test_wrap_convexity_and_comments() -> None:
+    class Knob(Part):
+        shaft = Cylinder(h=10, d=10, segments=64)
+        hole = ~Cylinder(h=12, d=3, segments=64)
+
+    knob = Knob()
+    knob.comment = "knob"
+    wrapped = wrap_renders(knob, min_score=100)
+    assert isinstance(wrapped, Render)
+    assert wrapped.render().startswith("// knob\nrender(convexity=2)\ndifference() {\n  // shaft\n")
+
+    hull = Hull(Sphere(d=10, segments=32), Sphere(d=10, segments=32).rightward(20)) - Cube(5, 5, 5)
+    assert wrap_renders(hull, min_score=100, max_convexity=3).render().startswith("render(convexity=2)\ndifference()")
+    assert wrap_renders(hull.debug(), min_score=100).render().startswith("#difference() {\n  render(convexity=1)\n")
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import pytest
+
+import muscad.resolution
+from muscad import Circle, Cube, Cylinder, Part, Sphere, set_resolution, use_resolution
+from muscad.resolution import PREVIEW, Resolution, current_resolution
+
+
+def test_production_resolution() -> None:
+    assert current_resolution() == Resolution()
+    assert Cylinder(h=10, d=10).render() == "cylinder(h=10, d=10, $fn=78, center=true);"
+    assert Cylinder(h=10, d=10, segments=6).segments == 6
+    assert Sphere(d=10).segments == 78
+    assert Cube(2, 2, 2).rotational_extrude().segments == 45
+
+
+def test_preview_resolution() -> None:
+    cylinder = Cylinder(h=10, d=10)
+    sphere = Sphere(d=100)
+    with use_resolution("preview") as preview:
+        assert preview == PREVIEW
+        assert cylinder.segments == 20
+        assert cylinder.render() == "cylinder(h=10, d=10, $fn=20, center=true);"
+        assert sphere.segments == 30
+        assert Circle(d=1).segments == 8
+        assert Cylinder(h=10, d=10, segments=64).render() == "cylinder(h=10, d=10, $fn=64, center=true);"
+    assert cylinder.segments == 78
+
+    with use_resolution("preview", fa_fs=True):
+        assert cylinder.render() == "cylinder(h=10, d=10, $fa=12, $fs=1.5, center=true);"
+        assert cylinder.segments == 21
+        assert Circle(d=1).rotational_extrude().render().startswith("rotate_extrude(angle=360, $fa=12, $fs=1.5)")
+
+    with pytest.raises(ValueError, match="unknown resolution profile"):
+        use_resolution("draft").__enter__()
+    with pytest.raises(ValueError, match="requires a segment_angle"):
+        use_resolution(fa_fs=True).__enter__()
+
+
+def test_resolution_render_cache() -> None:
+    class Knob(Part):
+        shaft = Cylinder(h=10, d=10)
+
+    knob = Knob()
+    assert "$fn=78" in knob.render()
+    with use_resolution("preview"):
+        assert "$fn=20" in knob.render()
+    assert "$fn=78" in knob.render()
+
+
+def test_set_resolution(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("MUSCAD_RESOLUTION", "preview")
+    assert current_resolution() == PREVIEW
+    set_resolution("production", min_segments=100)
+    try:
+        assert Cylinder(h=1, d=1).segments == 100
+    finally:
+        set_resolution(None)
+    assert current_resolution() == PREVIEW
+
+
+def test_resolution_module() -> None:
+    """The `muscad.resolution` module is not shadowed by any of its functions."""
+    assert muscad.resolution.set_resolution is set_resolution
+    assert muscad.resolution.use_resolution is use_resolution
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from muscad import Cube, Polyhedron
+from muscad.runner import ExportResult, OpenSCADError, OpenSCADRunner
+
+
+def scad_file(tmp_path: Path, name: str, content: str) -> Path:
+    path = tmp_path / f"{name}.scad"
+    path.write_text(content)
+    return path
+
+
+def test_export(tmp_path: Path, fake_openscad: Path) -> None:
+    runner = OpenSCADRunner(flags=["--backend=manifold", "--export-format=binstl"], cache=False)
+    scad_path = scad_file(tmp_path, "cube", "cube();")
+    result = runner.export(scad_path, tmp_path / "cube.stl")
+    assert result.path.read_text() == "cube();"
+    assert result.source == "openscad"
+    assert result.render_time == 1.25
+    assert result.wall_time > 0
+    assert fake_openscad.with_suffix(".log").read_text().splitlines() == [
+        f"--backend=manifold --export-format=binstl -o {tmp_path / 'cube.stl'} {scad_path}"
+    ]
+
+    with pytest.raises(OpenSCADError, match="exited with code 1: ERROR: spheres are not supported") as error:
+        runner.export(scad_file(tmp_path, "sphere", "sphere();"), tmp_path / "sphere.stl")
+    assert error.value.returncode == 1
+    assert error.value.stderr.strip() == "ERROR: spheres are not supported"
+
+    with pytest.raises(OpenSCADError, match=r"did not finish within 0\.5 seconds"):
+        OpenSCADRunner(timeout=0.5, cache=False).export(scad_file(tmp_path, "sleep", "sleep();"), tmp_path / "x.stl")
+
+
+def test_export_async(tmp_path: Path, fake_openscad: Path) -> None:
+    runner = OpenSCADRunner(jobs=2, timeout=5)
+    scad_paths = [scad_file(tmp_path, f"cube{index}", f"cube({index});") for index in range(4)]
+
+    async def main() -> list[ExportResult | BaseException]:
+        return await asyncio.gather(
+            *(runner.export_async(scad_path, scad_path.with_suffix(".stl")) for scad_path in scad_paths),
+            runner.export_async(scad_file(tmp_path, "sphere", "sphere();"), tmp_path / "sphere.stl"),
+            runner.export_async(scad_file(tmp_path, "sleep", "sleep();"), tmp_path / "sleep.stl", timeout=0.5),
+            return_exceptions=True,
+        )
+
+    *results, sphere_error, sleep_error = asyncio.run(main())
+    assert [result.path for result in results] == [scad_path.with_suffix(".stl") for scad_path in scad_paths]  # type: ignore[union-attr]
+    assert results[3].path.read_text() == "cube(3);"  # type: ignore[union-attr]
+    assert isinstance(sphere_error, OpenSCADError)
+    assert "spheres are not supported" in sphere_error.stderr
+    assert isinstance(sleep_error, OpenSCADError)
+    assert "did not finish within 0.5 seconds" in str(sleep_error)
+
+
+def test_export_async_cancel(tmp_path: Path, fake_openscad: Path) -> None:
+    runner = OpenSCADRunner(cache=False)
+
+    async def main() -> None:
+        task = asyncio.ensure_future(
+            runner.export_async(scad_file(tmp_path, "sleep", "sleep();"), tmp_path / "sleep.stl")
+        )
+        await asyncio.sleep(0.2)
+        task.cancel()
+        await task
+
+    start = time.monotonic()
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(main())
+    assert time.monotonic() - start < 5
+    assert not (tmp_path / "sleep.stl").exists()
+
+
+def test_export_stl_async(tmp_path: Path, fake_openscad: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    runner = OpenSCADRunner(cache=False)
+    tetrahedron = Polyhedron([(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1)], [[0, 1, 2], [0, 3, 1], [0, 2, 3], [1, 3, 2]])
+
+    async def main() -> list[Path]:
+        return await asyncio.gather(
+            Cube(1, 2, 3).export_stl_async("box", runner=runner), tetrahedron.export_stl_async(runner=runner)
+        )
+
+    box, mesh = asyncio.run(main())
+    assert box == Path("box.stl")
+    assert "cube(size=[1, 2, 3], center=true);" in box.read_text()
+    assert mesh == Path("polyhedron.stl")
+    assert mesh.read_bytes()[80:84] == b"\x04\x00\x00\x00"
+
+
+def test_export_result_from_output() -> None:
+    # OpenSCAD 2019 output, with the old rendering time format
+    output = """Rendering Polygon Mesh using CGAL...
+Geometries in cache: 5
+CGAL Polyhedrons in cache: 3
+Total rendering time: 0 hours, 2 minutes, 3 seconds
+   Top level object is a 3D object:
+   Simple:        yes
+   Vertices:      120
+   Facets:         62
+DEPRECATED: The assign() module will be removed in future releases.
+Rendering finished.
+"""
+    result = ExportResult.from_output("part.stl", output, 123.5)
+    assert result.name == "part"
+    assert result.render_time == 123
+    assert (result.vertices, result.facets) == (120, 62)
+    assert (result.geometries_in_cache, result.cgal_polyhedrons_in_cache) == (5, 3)
+    assert result.warnings == ("DEPRECATED: The assign() module will be removed in future releases.",)
+
+    assert ExportResult.from_output("part.stl", "", 1).render_time is None
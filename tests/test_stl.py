@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+
+import pytest
+
+from muscad import Cube, Part, Polyhedron, Union
+from muscad.stl import export_mesh_stl, mesh_parts, mesh_triangles, write_binary_stl
+
+# a tetrahedron, with faces clockwise seen from outside, as OpenSCAD expects
+TETRAHEDRON_POINTS = [(0, 0, 0), (10, 0, 0), (0, 10, 0), (0, 0, 10)]
+TETRAHEDRON_FACES = [[0, 1, 2], [0, 3, 1], [0, 2, 3], [1, 3, 2]]
+
+
+def tetrahedron() -> Polyhedron:
+    return Polyhedron(TETRAHEDRON_POINTS, TETRAHEDRON_FACES)
+
+
+def read_binary_stl(path: Path) -> list[tuple[float, ...]]:
+    data = path.read_bytes()
+    (count,) = struct.unpack_from("<I", data, 80)
+    assert len(data) == 84 + 50 * count
+    return [struct.unpack_from("<12f", data, 84 + 50 * index) for index in range(count)]
+
+
+def signed_volume(triangles: list[tuple[float, ...]]) -> float:
+    volume = 0.0
+    for ax, ay, az, bx, by, bz, cx, cy, cz in triangles:
+        volume += ax * (by * cz - bz * cy) - ay * (bx * cz - bz * cx) + az * (bx * cy - by * cx)
+    return volume / 6
+
+
+def test_mesh_triangles_orientation() -> None:
+    # STL triangles are counterclockwise seen from outside, so the signed volume is positive
+    for obj in (tetrahedron(), tetrahedron().x_mirror(), tetrahedron().y_rotate(30).scale(x=2, z=-1)):
+        parts = mesh_parts(obj)
+        assert parts is not None
+        triangles = list(mesh_triangles(parts))
+        assert len(triangles) == 4
+        assert signed_volume(triangles) > 0
+
+    triangles = list(mesh_triangles(mesh_parts(tetrahedron().scale(x=2, y=2, z=2)) or []))
+    assert signed_volume(triangles) == pytest.approx(8000 / 6)
+
+
+def test_mesh_triangles_fan() -> None:
+    pyramid = Polyhedron(
+        [(0, 0, 0), (10, 0, 0), (10, 10, 0), (0, 10, 0), (5, 5, 5)],
+        [[0, 1, 2, 3], [0, 4, 1], [1, 4, 2], [2, 4, 3], [3, 4, 0]],
+    )
+    triangles = list(mesh_triangles(mesh_parts(pyramid) or []))
+    assert len(triangles) == 6
+    assert signed_volume(triangles) == pytest.approx(500 / 3)
+
+
+def test_mesh_parts() -> None:
+    moved = tetrahedron().translate(x=5, z=-1).color("red")
+    parts = mesh_parts(moved)
+    assert parts is not None
+    [(polyhedron, matrix)] = parts
+    assert polyhedron.points is moved.child.child.points
+    assert [row[3] for row in matrix[:3]] == [5, 0, -1]
+
+    class Tetrahedrons(Part):
+        first = tetrahedron()
+        second = tetrahedron().leftward(-20)
+
+    parts = mesh_parts(Tetrahedrons())
+    assert parts is not None
+    assert len(parts) == 2
+
+    # unsupported trees: CSG operations, overlapping unions, primitives that are not meshes, and modifiers
+    assert mesh_parts(tetrahedron() - Cube(1, 1, 1)) is None
+    assert mesh_parts(Union(tetrahedron(), tetrahedron().leftward(-5))) is None
+    assert mesh_parts(Cube(1, 1, 1)) is None
+    assert mesh_parts(tetrahedron().debug()) is None
+    assert mesh_parts(tetrahedron().z_linear_extrude(1)) is None
+
+
+def test_export_mesh_stl(tmp_path: Path) -> None:
+    stl_path = export_mesh_stl(tetrahedron().up(5), tmp_path / "tetrahedron.stl")
+    assert stl_path == tmp_path / "tetrahedron.stl"
+    triangles = read_binary_stl(stl_path)
+    assert len(triangles) == 4
+    normal = triangles[0][:3]
+    assert normal == pytest.approx((0, 0, -1))
+    assert {triangle[5] for triangle in triangles} | {triangle[8] for triangle in triangles} == {5, 15}
+
+    assert export_mesh_stl(tetrahedron() - Cube(1, 1, 1), tmp_path / "csg.stl") is None
+    assert not (tmp_path / "csg.stl").exists()
+
+
+def test_write_binary_stl(tmp_path: Path) -> None:
+    assert write_binary_stl(tmp_path / "empty.stl", []) == 0
+    assert read_binary_stl(tmp_path / "empty.stl") == []
+    with pytest.raises(ValueError, match="header"):
+        write_binary_stl(tmp_path / "invalid.stl", [], header=b"solid")
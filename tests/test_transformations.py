@@ -1,3 +1,6 @@
+import math
+from itertools import product
+
 from muscad import (
     Color,
     Cube,
@@ -5,12 +8,16 @@ from muscad import (
     Hull,
     LinearExtrusion,
     Minkowski,
+    Mirroring,
+    Multmatrix,
     Offset,
+    Polyhedron,
     Projection,
     Rotation,
     RotationalExtrusion,
     Scaling,
     Slide,
+    Sphere,
     Square,
     Translation,
 )
@@ -183,3 +190,63 @@ def test_slide() -> None:
     assert s.bottom == -1.5
     assert s.top == 1.5
     assert s.center_z == 0
+
+
+def test_affine_matrix() -> None:
+    """Matrices of right angle rotations are exact, and consistent with the bounds of rotated objects."""
+    cube = Cube(2, 5, 7).translate(x=1, y=2, z=3)
+    corners = list(product((cube.left, cube.right), (cube.back, cube.front), (cube.bottom, cube.top)))
+    for x, y, z in product((0, 90, 180, 270), repeat=3):
+        rotation = Rotation(x=x, y=y, z=z)(cube)
+        matrix = rotation.affine_matrix()
+        assert all(value in (-1, 0, 1) for row in matrix for value in row)
+        points = [[sum(a * b for a, b in zip(row, (*corner, 1))) for row in matrix[:3]] for corner in corners]
+        xs, ys, zs = zip(*points)
+        assert (rotation.left, rotation.right) == (min(xs), max(xs))
+        assert (rotation.back, rotation.front) == (min(ys), max(ys))
+        assert (rotation.bottom, rotation.top) == (min(zs), max(zs))
+
+    assert Translation(x=1, y=2, z=3).affine_matrix() == ((1, 0, 0, 1), (0, 1, 0, 2), (0, 0, 1, 3), (0, 0, 0, 1))
+    assert Scaling(x=2, y=3, z=4).affine_matrix() == ((2, 0, 0, 0), (0, 3, 0, 0), (0, 0, 4, 0), (0, 0, 0, 1))
+    assert Mirroring(y=2).affine_matrix() == ((1, 0, 0, 0), (0, -1, 0, 0), (0, 0, 1, 0), (0, 0, 0, 1))
+    assert Color("red").affine_matrix() is None
+
+
+def test_multmatrix() -> None:
+    m = Multmatrix(((1, 0, 0, 1.5), (0, 1, 0, 0), (0, 0, 1, 0)))(Cube(2, 2, 2))
+    assert (
+        m.render() == "multmatrix(m=[[1, 0, 0, 1.5], [0, 1, 0, 0], [0, 0, 1, 0]])\ncube(size=[2, 2, 2], center=true);"
+    )
+    assert m.affine_matrix() == ((1, 0, 0, 1.5), (0, 1, 0, 0), (0, 0, 1, 0), (0, 0, 0, 1))
+
+
+def test_arbitrary_rotation_bounds() -> None:
+    """Bounds of objects rotated by any angle are calculated by transforming their geometry."""
+    r = Cube(2, 4, 6).translate(x=1).z_rotate(45)
+    assert math.isclose(r.left, -math.sqrt(2))
+    assert math.isclose(r.right, 2 * math.sqrt(2))
+    assert math.isclose(r.back, -math.sqrt(2))
+    assert math.isclose(r.front, 2 * math.sqrt(2))
+    assert (r.bottom, r.top) == (-3, 3)
+
+    s = Sphere(d=10).rotate(x=33, y=12).up(2)
+    assert (s.left, s.right, s.back, s.front, s.bottom, s.top) == (-5, 5, -5, 5, -3, 7)
+
+    c = Cylinder(d=10, h=2).x_rotate(30)
+    assert (c.left, c.right) == (-5, 5)
+    assert math.isclose(c.back, -5 * math.cos(math.radians(30)) - math.sin(math.radians(30)))
+    assert math.isclose(c.top, 5 * math.sin(math.radians(30)) + math.cos(math.radians(30)))
+
+    p = Polyhedron(
+        points=[(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1)], faces=[[0, 1, 2], [0, 3, 1], [0, 2, 3], [1, 3, 2]]
+    ).z_rotate(45)
+    assert math.isclose(p.left, -math.sqrt(2) / 2)
+    assert math.isclose(p.right, math.sqrt(2) / 2)
+    assert (p.bottom, p.top) == (0, 1)
+
+
+def test_multmatrix_bounds() -> None:
+    m = Multmatrix(((0, -1, 0, 5), (1, 0, 0, 0), (0, 0, 1, 0)))(Cube(2, 4, 6).translate(x=1))
+    assert (m.left, m.right, m.back, m.front, m.bottom, m.top) == (3, 7, 0, 2, -3, 3)
+    m = Mirroring(x=1, y=1)(Cube(2, 4, 6).translate(x=1))
+    assert (m.left, m.right, m.back, m.front, m.bottom, m.top) == (-2, 2, -2, 0, -3, 3)
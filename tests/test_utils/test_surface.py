@@ -312,3 +312,28 @@ def test_regular_polygon() -> None:
         pentagon,
         "polygon(points=[[10.0, 0], [3.0902, 9.5106], [-8.0902, 5.8779], [-8.0902, -5.8779], [3.0902, -9.5106]]);",
     )
+
+
+def test_tooth_strip() -> None:
+    """Test for Surface.tooth_strip()."""
+    strip = Surface.tooth_strip([(-1.5, 0), (-0.5, 0), (0, 1), (0.5, 0), (1.5, 0)], 3, pitch=2, bottom=-1)
+    assert compare_str(
+        strip,
+        "polygon(points=[[-1.5, 0], [-0.5, 0], [0, 1.0], [0.5, 0], [1.0, 0], [1.5, 0], [2.0, 1.0], [2.5, 0], [3.0, 0], "
+        "[3.5, 0], [4.0, 1.0], [4.5, 0], [5.5, 0], [5.5, -1.0], [-1.5, -1.0]]);",
+    )
+
+    # without any tooth, the strip is flat
+    strip = Surface.tooth_strip([(-1.5, 0), (-0.5, 0), (0, 1), (0.5, 0), (1.5, 0)], 0, pitch=2, bottom=-1, start=1)
+    assert compare_str(strip, "polygon(points=[[-0.5, 0], [2.5, 0], [2.5, -1.0], [-0.5, -1.0]]);")
+
+
+def test_tooth_ring() -> None:
+    """Test for Surface.tooth_ring()."""
+    ring = Surface.tooth_ring([(-2, 0), (0, -1), (2, 0)], 4, radius=2)
+    # each tooth is cut at a quarter of the circle, and shares its last point with the next tooth
+    assert compare_str(
+        ring,
+        "polygon(points=[[1.2625, -1.2625], [1.0, 0], [1.2625, 1.2625], [0.0, 1.0], [-1.2625, 1.2625], [-1.0, 0.0], "
+        "[-1.2625, -1.2625], [-0.0, -1.0]]);",
+    )
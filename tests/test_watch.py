@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from muscad.watch import Watcher, render_module
+
+MODULE = """\
+from muscad import Cube, Cylinder, Object, Part
+
+from watched_sizes import WIDTH
+
+
+class Plate(Part):
+    plate = Cube(WIDTH, 20, 2)
+
+    def __stl__(self) -> Object:
+        return self
+
+
+class Spacer(Part):
+    tube = Cylinder(h=5, d=8)
+
+    def __stl__(self) -> Object:
+        return self
+"""
+
+
+def write_module(directory: Path, width: int = 20) -> Path:
+    (directory / "watched_sizes.py").write_text(f"WIDTH = {width}\n")
+    path = directory / "watched_parts.py"
+    path.write_text(MODULE)
+    return path
+
+
+def modify(path: Path, content: str) -> None:
+    path.write_text(content)
+    # make sure that the modification time changes, even on coarse filesystems
+    mtime = path.stat().st_mtime_ns + 10**9
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_render_module(tmp_path: Path) -> None:
+    path = write_module(tmp_path)
+    out_dir = tmp_path / "out"
+    result = render_module(str(path), out_dir, "preview")
+    assert result.error is None
+    assert sorted(file.name for file in result.written) == ["plate.scad", "spacer.scad"]
+    assert result.sources == [tmp_path / "watched_parts.py", tmp_path / "watched_sizes.py"]
+    assert "$fn=16" in (out_dir / "spacer.scad").read_text()
+
+    result = render_module(str(path), out_dir, "preview")
+    assert (result.written, result.unchanged) == ([], 2)
+
+    path.write_text("raise ValueError('broken part')\n")
+    result = render_module(str(path), out_dir)
+    assert result.error is not None
+    assert "ValueError: broken part" in result.error
+
+
+def test_watcher(tmp_path: Path) -> None:
+    path = write_module(tmp_path)
+    watcher = Watcher(str(path), tmp_path)
+    try:
+        result = watcher.render()
+        assert result.error is None
+        assert len(result.written) == 2
+        assert not watcher.changed()
+
+        modify(tmp_path / "watched_sizes.py", "WIDTH = 30\n")
+        assert watcher.changed()
+
+        # the module is imported again, and only the modified part is written
+        result = watcher.render()
+        assert result.written == [tmp_path / "plate.scad"]
+        assert result.unchanged == 1
+        assert "cube(size=[30, 20, 2]" in (tmp_path / "plate.scad").read_text()
+    finally:
+        watcher.close()
+
+
+def test_watcher_broken_import(tmp_path: Path) -> None:
+    path = write_module(tmp_path)
+    sizes = tmp_path / "watched_sizes.py"
+    watcher = Watcher(str(path), tmp_path)
+    try:
+        assert watcher.render().error is None
+
+        modify(sizes, "WIDTH = (\n")
+        assert watcher.changed()
+        result = watcher.render()
+        assert result.error is not None
+        assert "SyntaxError" in result.error
+        # the module that failed to import is still watched
+        assert watcher.sources == [path, sizes]
+        assert not watcher.changed()
+
+        modify(sizes, "WIDTH = 40\n")
+        assert watcher.changed()
+        result = watcher.render()
+        assert result.error is None
+        assert result.written == [tmp_path / "plate.scad"]
+    finally:
+        watcher.close()
+
+
+def test_render_module_name(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    package = tmp_path / "watched_package"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    parts = package / "parts.py"
+    parts.write_text("WIDTH = (\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    # the module is watched, even if it never imported successfully
+    result = render_module("watched_package.parts", tmp_path)
+    assert result.error is not None
+    assert result.sources == [package / "__init__.py", parts]
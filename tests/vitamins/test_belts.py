@@ -1,67 +1,38 @@
-from muscad.vitamins.belts import Belt
+import pytest
 
-from ..utils import compare_str
+from muscad import Polygon
+from muscad.vitamins.belts import Belt, GT2_2mm_profile
 
 
 def test_gt2() -> None:
-    assert compare_str(
-        Belt.GT2(50),
-        """union() {
+    belt = Belt.GT2(50)
+    lines = belt.render().split("\n")
+    expected = """union() {
   // tooth
   translate(v=[0, 0, -3.0])
   linear_extrude(height=6, center=false, convexity=10, twist=0, scale=1.0)
-  {
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-2.032, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-4.064, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-6.096, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-8.128, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-10.16, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-12.192, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-14.224, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-16.256, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-18.288, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-20.32, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-22.352, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-24.384, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-26.416, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-28.448, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-30.48, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-32.512, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-34.544, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-36.576, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-38.608, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-40.64, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-42.672, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-44.704, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-    translate(v=[-46.736, 0, 0])
-    polygon(points=[[0.7472, -0.5], [1.017, -0.5], [1.017, 0], [0.7472, 0], [0.6479, 0.0372], [0.5983, 0.1305], [0.5786, 0.2384], [0.5472, 0.3431], [0.5046, 0.4438], [0.4516, 0.5397], [0.3582, 0.6369], [0.2484, 0.7073], [0.1273, 0.75], [0, 0.7645], [-0.1273, 0.75], [-0.2484, 0.7073], [-0.3582, 0.6369], [-0.4516, 0.5397], [-0.5048, 0.4438], [-0.5473, 0.3431], [-0.5786, 0.2384], [-0.5983, 0.1305], [-0.648, 0.0372], [-0.7472, 0], [-1.017, 0], [-1.017, -0.5], [-0.7472, -0.5]]);
-  }
   // tolerance
   // volume
   translate(v=[-23.368, -0.58, 0])
   cube(size=[48.77, 0.2, 6.0], center=true);
-}""",
-    )
+}"""
+    assert "\n".join(line for line in lines if "polygon(" not in line) == expected
+    # the teeth are a single polygon: 24 teeth of 22 points, plus the first point and the 2 points of the back
+    polygon = belt.tooth.child.child
+    assert isinstance(polygon, Polygon)
+    assert len(polygon.points) == 24 * 22 + 1 + 2
+    assert (polygon.left, polygon.right, polygon.back, polygon.front) == pytest.approx((-47.753, 1.017, -0.5, 0.76447))
+    assert lines[4].startswith("  polygon(points=[[-47.753, 0], [-47.4832, 0], [-47.384, 0.0372], [-47.3343, 0.1305], ")
+
+
+def test_belt_from_polygon() -> None:
+    belt = Belt(GT2_2mm_profile, length=5, pitch=2.032)
+    assert belt.render().count("polygon(") == 2
+    assert belt.tooth.left == Belt.GT2(5).tooth.left
+
+
+def test_short_belt() -> None:
+    """A belt shorter than one pitch has no tooth."""
+    belt = Belt.GT2(1.5)
+    assert "polygon(points=[[-1.017, 0], [1.017, 0], [1.017, -0.5], [-1.017, -0.5]]);" in belt.render()
+    assert (belt.left, belt.right) == (-1.017, 1.017)
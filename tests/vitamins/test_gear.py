@@ -1,5 +1,16 @@
 """Tests for `muscad.vitamins.gears`."""
 
+from __future__ import annotations
+
+import random
+from collections import Counter
+from functools import lru_cache
+from math import atan2, cos, degrees, floor, hypot, pi, radians
+
+import pytest
+
+from muscad import Cube, Cylinder, Intersection, Object, Polyhedron, Union
+from muscad.base import Transformation
 from muscad.vitamins.gears import BevelGear, Gear
 from tests.utils import compare_file
 
@@ -20,3 +31,109 @@ def test_bevel_gear() -> None:
     """Creates a Bevel Gear Pair."""
     gear1, gear2 = BevelGear.pair()
     compare_file(gear1 + gear2, "bevel_gears_pair.scad")
+
+
+def test_gear_single_polygon() -> None:
+    """Creates a gear, with its outline as a single polygon."""
+    gear = Gear(nb_teeth=15, circular_pitch=700, single_polygon=True)
+    render = gear.render()
+    assert render.count("polygon(") == 1
+    outline = Gear.gear_outline(
+        15,
+        pitch_radius=29.1667,
+        root_radius=25.0778,
+        base_radius=25.7526,
+        outer_radius=33.0556,
+        half_thick_angle=6,
+        involute_facets=5,
+    )
+    # 15 teeth, with 6 points on each flank and 3 points between 2 teeth
+    assert len(outline.points) == 15 * (2 * 6 + 3)
+    # the tip of the first tooth is on the X axis
+    assert outline.right == pytest.approx(33.0486, abs=1e-4)
+    assert -33.06 < outline.left < -25
+
+
+@lru_cache(maxsize=None)
+def triangles(polyhedron: Polyhedron) -> list[tuple[tuple[float, float, float], ...]]:
+    """Splits the faces of a polyhedron into triangles."""
+    points = [(point.x, point.y, point.z) for point in polyhedron.points]
+    return [
+        (points[face[0]], points[face[k]], points[face[k + 1]])
+        for face in polyhedron.faces
+        for k in range(1, len(face) - 1)
+    ]
+
+
+def contains(obj: Object, point: tuple[float, float, float]) -> bool:
+    """Tells if a point is inside the teeth of a bevel gear, built with or without boolean operations."""
+    x, y, z = point
+    if isinstance(obj, Intersection):
+        return all(contains(child, point) for child in obj.children)
+    if isinstance(obj, Union):
+        return any(contains(child, point) for child in obj.children)
+    if isinstance(obj, Transformation):
+        # only rotations and translations are used, so the inverse matrix is the transposed one
+        (a, b, c, dx), (d, e, f, dy), (g, h, i, dz), _ = obj.affine_matrix()
+        x, y, z = x - dx, y - dy, z - dz
+        return contains(obj.child, (a * x + d * y + g * z, b * x + e * y + h * z, c * x + f * y + i * z))
+    if isinstance(obj, Cylinder):
+        if abs(z) > obj.height / 2:
+            return False
+        top_diameter = obj.diameter if obj.top_diameter is None else obj.top_diameter
+        radius = (obj.diameter + (top_diameter - obj.diameter) * (z / obj.height + 0.5)) / 2
+        # distance to the center of the nearest side of the polygon approximating the cylinder
+        angle = degrees(atan2(y, x))
+        side = (floor(angle * obj.segments / 360) + 0.5) * 360 / obj.segments
+        return hypot(x, y) * cos(radians(angle - side)) <= radius * cos(pi / obj.segments)
+    if isinstance(obj, Cube):
+        return abs(x) <= obj.width / 2 and abs(y) <= obj.depth / 2 and abs(z) <= obj.height / 2
+    assert isinstance(obj, Polyhedron)
+    # count the faces crossed by a vertical ray going up from the point
+    crossings = 0
+    for (x1, y1, z1), (x2, y2, z2), (x3, y3, z3) in triangles(obj):
+        determinant = (y2 - y3) * (x1 - x3) + (x3 - x2) * (y1 - y3)
+        if determinant == 0 or max(z1, z2, z3) < z:
+            continue
+        u = ((y2 - y3) * (x - x3) + (x3 - x2) * (y - y3)) / determinant
+        v = ((y3 - y1) * (x - x3) + (x1 - x3) * (y - y3)) / determinant
+        if u >= 0 and v >= 0 and u + v <= 1 and u * z1 + v * z2 + (1 - u - v) * z3 > z:
+            crossings += 1
+    return crossings % 2 == 1
+
+
+def test_bevel_gear_single_polyhedron() -> None:
+    """Creates a Bevel Gear Pair, with the teeth of each gear as a single polyhedron."""
+    gear1, gear2 = BevelGear.pair(single_polyhedron=True)
+    render = (gear1 + gear2).render()
+    assert render.count("polyhedron(") == 2
+    assert "intersection()" not in render
+
+    # 7 and 11 teeth gears are shallow: the teeth go below the root cone
+    for finish, nb_teeth in (("bevel_gear_flat", 11), ("bevel_gear_back_cone", 7), ("bevel_gear_back_cone", 11)):
+        gear = BevelGear(nb_teeth=nb_teeth, finish=finish, single_polyhedron=True)
+        (polyhedron,) = (child for child in gear.children if isinstance(child, Polyhedron))
+        edges = Counter((face[i], face[i - 1]) for face in polyhedron.faces for i in range(len(face)))
+        # the mesh is closed: each edge is used once in each direction
+        assert all(count == 1 and edges[(end, start)] == 1 for (start, end), count in edges.items())
+
+        # the polyhedron contains the same points as the intersection of the teeth with the finish, except a few
+        # points close to their surfaces, which are not made of the same facets
+        (reference,) = BevelGear(nb_teeth=nb_teeth, finish=finish).children
+        # the bounds of the intersection are much larger than the gear, so the points are taken around the polyhedron
+        bounds = [
+            (start - (end - start) / 10, end + (end - start) / 10)
+            for start, end in (
+                (polyhedron.left, polyhedron.right),
+                (polyhedron.back, polyhedron.front),
+                (polyhedron.bottom, polyhedron.top),
+            )
+        ]
+        generator = random.Random(nb_teeth)
+        inside = mismatches = 0
+        for _ in range(2000):
+            point = tuple(generator.uniform(start, end) for start, end in bounds)
+            expected = contains(reference, point)
+            inside += expected
+            mismatches += contains(polyhedron, point) != expected
+        assert mismatches <= inside / 25
@@ -13,3 +13,12 @@ def test_pulley() -> None:
   cylinder(h=20, d=3.4, $fn=26, center=true);
 }""",
     )
+
+
+def test_pulley_tooth_path() -> None:
+    """Teeth given as a path are built as a single polygon around the body."""
+    pulley = Pulley(outer_dia=10, height=6).tooth([(-1, 0), (0, -0.5), (1, 0)], 8)
+    render = pulley.render()
+    assert render.count("polygon(") == 1
+    assert "cylinder(" not in render
+    assert (pulley.bottom, pulley.top) == (-3, 3)
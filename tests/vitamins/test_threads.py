@@ -0,0 +1,55 @@
+"""Tests for muscad.vitamins.threads."""
+
+from __future__ import annotations
+
+from collections import Counter
+
+import pytest
+
+from muscad.vitamins.threads import HexNut, HexScrew, ScrewThread, thread_polyhedron
+
+
+@pytest.mark.parametrize("countersinks", [{}, {"top_countersink": True, "bottom_countersink": True}])
+def test_thread_polyhedron(countersinks: dict[str, bool]) -> None:
+    thread = thread_polyhedron(
+        diameter=8,
+        inner_diameter=6,
+        length=10,
+        step=2,
+        segments=40,
+        **countersinks,
+    )
+    assert thread.bbox[4:] == (0, 10)
+    points = list(zip(*(thread.points.column(axis) for axis in range(3))))
+    edges = Counter((face[i], face[i - 1]) for face in thread.faces for i in range(3))
+    # the mesh is closed: each edge is used once in each direction
+    assert all(count == 1 and edges[(end, start)] == 1 for (start, end), count in edges.items())
+    volume = 0.0
+    for face in thread.faces:
+        (ax, ay, az), (bx, by, bz), (cx, cy, cz) = (points[index] for index in face)
+        volume += (ax * (by * cz - bz * cy) - ay * (bx * cz - bz * cx) + az * (bx * cy - by * cx)) / 6
+    # faces are clockwise when seen from outside, as expected by OpenSCAD, so this volume is negative
+    assert -3.5 * 3.5 * 3.1416 * 10 * 1.02 < volume < -3 * 3 * 3.1416 * 10
+
+
+def test_screw_thread() -> None:
+    thread = ScrewThread(diameter=8, length=20, step=1.25)
+    assert thread.render().count("polyhedron(") == 1
+    assert thread.bottom == 0
+    assert thread.top == 20
+
+
+def test_hex_screw_and_nut() -> None:
+    screw = HexScrew(
+        thread_outer_diameter=8,
+        thread_step=1.25,
+        step_shape_degrees=45,
+        thread_length=30,
+        resolution=1,
+        head_diameter=13,
+        head_height=5.3,
+        non_thread_length=10,
+    )
+    assert screw.top == pytest.approx(45.3)
+    nut = HexNut(diameter=13, height=6.5, thread_outer_diameter=8, thread_step=1.25)
+    assert nut.render().count("polyhedron(") == 1